@@ -0,0 +1,153 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+
+# 크롤러들이 공통으로 쓰는 Chromium 실행 옵션
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--no-first-run',
+    '--disable-extensions',
+    '--disable-default-apps',
+    '--disable-gpu'
+]
+
+DEFAULT_CONTEXT_OPTIONS = {
+    'is_mobile': False,
+    'has_touch': False,
+    'viewport': {'width': 1920, 'height': 1080},
+}
+
+
+class BrowserPool:
+    """오래 유지되는 브라우저 N개 × 컨텍스트 M개 풀
+
+    URL마다 page()로 페이지를 빌려 쓰고, 컨텍스트는 max_uses번 쓰거나 오류가 나면 새로 만든다.
+    연결이 끊긴 브라우저는 다시 띄운다. stats()로 재활용/크래시/닫히지 않은 페이지 수를 볼 수 있다.
+
+    사용 예:
+        async with BrowserPool(playwright, browsers=2, contexts_per_browser=4) as pool:
+            async with pool.page() as page:
+                await page.goto(url)
+    """
+
+    def __init__(self, playwright, browsers=2, contexts_per_browser=4, max_uses=50,
+                 headless=True, context_options=None, on_context=None):
+        self.playwright = playwright
+        self.browser_count = browsers
+        self.contexts_per_browser = contexts_per_browser
+        self.max_uses = max_uses
+        self.headless = headless
+        # dict 또는 dict를 돌려주는 함수 (컨텍스트마다 다른 User-Agent를 쓸 때)
+        self.context_options = context_options or {}
+        # 새 컨텍스트를 만들 때마다 호출할 비동기 함수 (라우팅 규칙 등록 등)
+        self.on_context = on_context
+
+        self._browsers = []
+        self._slots = asyncio.Queue()
+        self._stats = {
+            'leases': 0,
+            'pages_opened': 0,
+            'pages_closed': 0,
+            'contexts_created': 0,
+            'contexts_recycled': 0,
+            'crashes': 0,
+            'browser_restarts': 0,
+        }
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _launch(self):
+        return await self.playwright.chromium.launch(headless=self.headless, args=LAUNCH_ARGS)
+
+    async def _new_context(self, browser_index):
+        browser = self._browsers[browser_index]
+        if not browser.is_connected():
+            self._browsers[browser_index] = browser = await self._launch()
+            self._stats['browser_restarts'] += 1
+
+        options = self.context_options() if callable(self.context_options) else self.context_options
+        context = await browser.new_context(**{**DEFAULT_CONTEXT_OPTIONS, **options})
+        if self.on_context is not None:
+            await self.on_context(context)
+        self._stats['contexts_created'] += 1
+        return context
+
+    async def start(self):
+        for _ in range(self.browser_count):
+            self._browsers.append(await self._launch())
+        for browser_index in range(self.browser_count):
+            for _ in range(self.contexts_per_browser):
+                context = await self._new_context(browser_index)
+                self._slots.put_nowait({'browser': browser_index, 'context': context, 'uses': 0, 'broken': False})
+
+    async def _recycle(self, slot):
+        try:
+            await slot['context'].close()
+        except Exception:
+            pass
+        slot['context'] = await self._new_context(slot['browser'])
+        slot['uses'] = 0
+        slot['broken'] = False
+        self._stats['contexts_recycled'] += 1
+
+    @asynccontextmanager
+    async def page(self):
+        """컨텍스트 하나를 빌려 새 페이지를 열고, 끝나면 페이지를 닫고 반납"""
+        slot = await self._slots.get()
+        try:
+            if slot['broken'] or slot['uses'] >= self.max_uses:
+                await self._recycle(slot)
+
+            page = await slot['context'].new_page()
+            self._stats['leases'] += 1
+            self._stats['pages_opened'] += 1
+            try:
+                yield page
+            except Exception:
+                slot['broken'] = True
+                self._stats['crashes'] += 1
+                raise
+            finally:
+                slot['uses'] += 1
+                try:
+                    await page.close()
+                    self._stats['pages_closed'] += 1
+                except Exception:
+                    slot['broken'] = True
+        except Exception:
+            slot['broken'] = True
+            raise
+        finally:
+            self._slots.put_nowait(slot)
+
+    def stats(self):
+        """풀 상태. open_pages가 계속 늘면 페이지가 새고 있는 것"""
+        return {
+            **self._stats,
+            'browsers_alive': sum(browser.is_connected() for browser in self._browsers),
+            'idle_contexts': self._slots.qsize(),
+            'open_pages': self._stats['pages_opened'] - self._stats['pages_closed'],
+        }
+
+    async def close(self):
+        while not self._slots.empty():
+            slot = self._slots.get_nowait()
+            try:
+                await slot['context'].close()
+            except Exception:
+                pass
+        for browser in self._browsers:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+        self._browsers.clear()
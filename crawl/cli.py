@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import importlib
+import sys
+import time
+import traceback
+
+from rate_limiter import DEFAULT_RATE_CONFIG, PLATFORM_RATE_CONFIG, apply_rate_overrides
+from session_broker import set_interactive
+
+
+# 플랫폼 이름 → (모듈, 플러그인 클래스). 실행할 플랫폼 모듈만 불러온다
+PLUGINS = {
+    'naver': ('naver_novel_crawl', 'NaverPlugin'),
+    'novelpia': ('novelpia_novel_crawl', 'NovelpiaPlugin'),
+    'kakao': ('kakao_novel_crawl', 'KakaoPlugin'),
+    'munpia': ('munpia_novel_crawl', 'MunpiaPlugin'),
+}
+
+# 실행 모드 → 플러그인 메서드
+MODES = {
+    'crawl': 'run',
+    'refresh': 'refresh',
+    'from-cache': 'from_cache',
+    'login': 'auth',
+}
+
+
+def load_plugin(name, **options):
+    module_name, class_name = PLUGINS[name]
+    return getattr(importlib.import_module(module_name), class_name)(**options)
+
+
+# --rate naver=2.5 → ('naver', 2.5)
+def parse_rate(value):
+    platform, _, rate = value.partition('=')
+    if platform not in PLUGINS or not rate:
+        raise argparse.ArgumentTypeError(f"'플랫폼=초당요청수' 형식이어야 합니다: {value}")
+    return platform, float(rate)
+
+
+def rate_overrides(rates):
+    """플랫폼별 최고 속도 지정. 시작 속도가 최고 속도보다 높으면 같이 낮춘다"""
+    overrides = {}
+    for platform, rate in rates:
+        initial_rate = PLATFORM_RATE_CONFIG[platform].get('initial_rate', DEFAULT_RATE_CONFIG['initial_rate'])
+        overrides[platform] = {'max_rate': rate, 'initial_rate': min(initial_rate, rate)}
+    return overrides
+
+
+async def run_platforms(plugins, mode):
+    """플랫폼들을 한 이벤트 루프에서 동시에 실행. 한 플랫폼이 실패해도 나머지는 끝까지 돈다"""
+    async def run_one(plugin):
+        started = time.monotonic()
+        try:
+            await getattr(plugin, MODES[mode])()
+            return plugin.name, None, time.monotonic() - started
+        except Exception as e:
+            traceback.print_exc()
+            return plugin.name, e, time.monotonic() - started
+
+    results = await asyncio.gather(*(run_one(plugin) for plugin in plugins))
+
+    print("\n=== 실행 결과 ===")
+    for name, error, elapsed in results:
+        status = '완료' if error is None else f'실패 ({type(error).__name__}: {error})'
+        print(f"[{name}] {status} - {elapsed / 60:.1f}분")
+    return [name for name, error, _ in results if error is not None]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description='소설 플랫폼 통합 크롤러',
+        epilog='예: python crawl/cli.py all --non-interactive --rate naver=3 --concurrency 8'
+    )
+    parser.add_argument('platforms', nargs='+', choices=[*PLUGINS, 'all'], help="수집할 플랫폼 ('all'이면 전체 동시 실행)")
+    parser.add_argument('--mode', choices=list(MODES), default='crawl',
+                        help='crawl: 목록+상세 수집, refresh: 재확인, from-cache: 캐시 재추출, login: 로그인 쿠키만 갱신')
+    parser.add_argument('--non-interactive', action='store_true',
+                        help='사용자 입력을 기다리지 않음 (수동 로그인이 필요하면 그 플랫폼만 실패). 터미널이 아니면 자동으로 켜짐')
+    parser.add_argument('--concurrency', type=int, default=5, help='플랫폼별 상세 페이지 동시 요청 수')
+    parser.add_argument('--listing-concurrency', type=int, default=4, help='플랫폼별 동시에 받을 목록 페이지 수')
+    parser.add_argument('--rate', type=parse_rate, action='append', default=[], metavar='PLATFORM=RPS',
+                        help='플랫폼 최고 요청 속도 (초당 요청 수, 여러 번 지정 가능)')
+    parser.add_argument('--batch-size', type=int, default=None, help='작업 목록에서 한 번에 빌려 올 URL 수')
+    parser.add_argument('--worker', action='store_true', help='작업 목록의 URL만 수집 (추가 작업자 프로세스용)')
+    parser.add_argument('--stream', action='store_true', help='[naver] 필요한 필드를 다 읽으면 본문 수신을 중단')
+    parser.add_argument('--budget', type=int, default=None, help='--mode refresh에서 다시 확인할 최대 작품 수')
+    parser.add_argument('--parse-processes', type=int, default=0, help='파싱을 N개 프로세스로 나눈 파이프라인 사용')
+    parser.add_argument('--processes', type=int, default=0, help='[novelpia] 상세 페이지 파싱을 N개 상주 프로세스에서')
+    parser.add_argument('--browser-listing', action='store_true', help='[novelpia] 목록 페이지를 브라우저로 수집')
+    parser.add_argument('--kakao-method', choices=['requests', 'playwright'], default='requests',
+                        help='[kakao] 목록 수집 방법')
+    parser.add_argument('--kakao-sections', default=None,
+                        help="[kakao] 목록을 훑을 섹션 (예: '0:update,86:update:complete', 기본값은 전체 장르 업데이트순)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    names = list(PLUGINS) if 'all' in args.platforms else list(dict.fromkeys(args.platforms))
+    set_interactive(not args.non_interactive and sys.stdin.isatty())
+    apply_rate_overrides(rate_overrides(args.rate))
+
+    options = {
+        'concurrency': args.concurrency,
+        'listing_concurrency': args.listing_concurrency,
+        'batch_size': args.batch_size,
+        'worker': args.worker,
+        'stream': args.stream,
+        'budget': args.budget,
+        'parse_processes': args.parse_processes,
+        'processes': args.processes,
+        'browser_listing': args.browser_listing,
+        'method': args.kakao_method,
+        'sections': args.kakao_sections,
+    }
+    plugins = [load_plugin(name, **options) for name in names]
+
+    print(f"🚀 {', '.join(names)} {args.mode} 시작")
+    try:
+        failed = asyncio.run(run_platforms(plugins, args.mode))
+    except KeyboardInterrupt:
+        print("\n⏹️ 사용자에 의해 중단되었습니다.")
+        return 130
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+from collections import Counter
+
+from lxml import etree, html
+
+
+class Field:
+    """추출할 필드 하나에 대한 선언
+
+    selectors: 순서대로 시도할 XPath 목록 ('xpath=' 접두어 허용)
+    attr: 텍스트 대신 가져올 속성 이름 (예: 'src')
+    index: 매칭된 요소 중 사용할 위치 (0 = 첫 번째, -1 = 마지막)
+    skip_empty: 값이 비어 있으면 다음 선택자로 넘어갈지 여부
+    reject: 값에 포함되면 다음 선택자로 넘어갈 문자열 목록
+    strip: 앞뒤 공백 제거 여부
+    post: 값을 가공할 함수
+    default: 어떤 선택자도 맞지 않았을 때의 값
+    """
+
+    def __init__(self, selectors, attr=None, index=0, skip_empty=True, reject=(),
+                 strip=True, post=None, default=''):
+        self.selectors = [s[6:] if s.startswith('xpath=') else s for s in selectors]
+        self.attr = attr
+        self.index = index
+        self.skip_empty = skip_empty
+        self.reject = reject
+        self.strip = strip
+        self.post = post
+        self.default = default
+        self.compiled = [etree.XPath(s) for s in self.selectors]
+
+
+# 요소 뒤에 다른 요소가 이미 들어왔으면 그 요소는 닫힌 것(텍스트가 완성된 것)으로 본다
+_has_following = etree.XPath('boolean(following::*)')
+
+
+class Extractor:
+    """플랫폼별 Field 명세를 한 번만 컴파일해 두고 문서마다 한 번에 추출
+
+    어떤 선택자(fallback)가 매칭됐는지 세어 두므로, stats()로 한 번도 쓰이지 않은 선택자를 찾을 수 있다.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.hits = Counter()
+        self.misses = Counter()
+
+    # 필드 하나 추출 후 (값, 매칭된 선택자 위치, 요소) 반환
+    def _extract_field(self, tree, field):
+        for i, xpath in enumerate(field.compiled):
+            try:
+                elements = xpath(tree)
+            except Exception:
+                continue
+            if not elements:
+                continue
+            try:
+                element = elements[field.index]
+            except IndexError:
+                continue
+
+            if field.attr:
+                value = element.get(field.attr)
+            else:
+                value = element.text_content()
+            if value is None:
+                continue
+            if field.strip:
+                value = value.strip()
+            if field.skip_empty and not value.strip():
+                continue
+            if any(word in value for word in field.reject):
+                continue
+            return value, i, element
+        return None, None, None
+
+    def extract(self, tree):
+        """모든 필드를 추출해서 dict로 반환"""
+        result = {}
+        for name, field in self.fields.items():
+            value, i, _ = self._extract_field(tree, field)
+            if i is None:
+                self.misses[name] += 1
+                result[name] = field.default
+                continue
+            self.hits[(name, i)] += 1
+            result[name] = field.post(value) if field.post else value
+        return result
+
+    def _is_complete(self, root, required):
+        for name in required:
+            field = self.fields[name]
+            # 뒤에서 센 위치(index < 0)는 뒤에 매칭이 더 올 수 있으므로 문서를 끝까지 읽어야 확정된다
+            if field.index < 0:
+                return False
+            _, i, element = self._extract_field(root, field)
+            # 앞 선택자가 나중에 매칭될 수 있으므로 첫 번째 선택자로 찾은 값만 확정으로 본다
+            if i != 0 or not _has_following(element):
+                return False
+        return True
+
+    def extract_stream(self, chunks, required=None, encoding=None):
+        """HTML 조각을 점진적으로 파싱하다가 required 필드가 모두 채워지면 읽기를 멈춘다
+
+        required 기본값은 모든 필드. 끝까지 다 채워지지 않으면 문서 전체를 읽는다.
+        index가 음수인 필드가 required에 있으면 항상 끝까지 읽는다.
+        (추출 결과, 실제로 읽은 본문, 중간에 멈췄는지 여부) 를 반환한다.
+        """
+        required = list(self.fields) if required is None else required
+        # 끝까지 읽어야 하는 필드가 있으면 매 조각마다 검사할 필요가 없다
+        can_stop = all(self.fields[name].index >= 0 for name in required)
+        parser = etree.HTMLPullParser(events=('start',), encoding=encoding)
+        parser.set_element_class_lookup(html.HtmlElementClassLookup())
+        root = None
+        body = []
+        truncated = False
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            body.append(chunk)
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                if root is None:
+                    root = element.getroottree().getroot()
+            if can_stop and root is not None and self._is_complete(root, required):
+                truncated = True
+                break
+        else:
+            closed_root = parser.close()
+            if closed_root is not None:
+                root = closed_root
+
+        if root is None:
+            raise ValueError('빈 문서입니다')
+        return self.extract(root), b''.join(body), truncated
+
+    def stream_consumer(self, required=None, chunk_size=16 * 1024):
+        """AsyncFetcher.get(url, consume=...)에 넘길 스트리밍 추출 함수"""
+        def consume(response):
+            if response.status_code != 200:
+                return None, response.content, False
+            content_type = response.headers.get('Content-Type', '').lower()
+            encoding = response.encoding if 'charset' in content_type else None
+            return self.extract_stream(response.iter_content(chunk_size), required, encoding)
+        return consume
+
+    def stats(self):
+        """필드별 선택자 매칭 횟수. 0인 선택자는 정리 대상"""
+        return {
+            name: {
+                'selectors': [(selector, self.hits[(name, i)]) for i, selector in enumerate(field.selectors)],
+                'misses': self.misses[name],
+            }
+            for name, field in self.fields.items()
+        }
+
+    def print_stats(self):
+        for name, stat in self.stats().items():
+            print(f"[{name}] 실패 {stat['misses']}회")
+            for selector, count in stat['selectors']:
+                print(f"    {count:>7}  {selector}")
@@ -0,0 +1,94 @@
+import asyncio
+import multiprocessing
+from collections import deque
+
+from tqdm import tqdm
+
+
+# 작업자 프로세스 안에서만 쓰는 상태 (세션, 속도 제한기 등)
+_worker_state = None
+_worker_func = None
+
+
+def _init_worker(init, func, init_args):
+    global _worker_state, _worker_func
+    _worker_state = init(*init_args)
+    _worker_func = func
+
+
+def _run(item):
+    return _worker_func(_worker_state, item)
+
+
+def _resolve(future, result, exc):
+    # 기다리던 쪽이 취소됐으면 결과는 버린다
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class ExtractionPool:
+    """한 번 띄운 작업자 프로세스를 계속 재사용하는 추출 풀
+
+    각 작업자는 시작할 때 init(*init_args)로 세션 등을 만들어 두고, 이후 모든 작업에서
+    func(state, item)으로 그 상태를 재사용한다 (모듈 import와 선택자 컴파일도 프로세스당 한 번).
+    imap()은 입력을 스트리밍으로 받아 최대 max_in_flight개만 미리 넘기고(배압), 결과는 입력 순서대로 돌려준다.
+    비동기 코드에서는 run(item)으로 1건씩 넘기고 이벤트 루프를 막지 않고 결과를 기다린다.
+    init과 func는 pickle 가능한 최상위 함수여야 한다.
+
+    사용 예:
+        with ExtractionPool(init_worker, parse_in_worker, processes=5) as pool:
+            for result in pool.imap(payloads):
+                ...
+    """
+
+    def __init__(self, init, func, processes=5, init_args=(), max_in_flight=None, start_method='spawn'):
+        self.processes = processes
+        self.max_in_flight = max_in_flight or processes * 4
+        context = multiprocessing.get_context(start_method)
+        self._pool = context.Pool(processes, initializer=_init_worker, initargs=(init, func, init_args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def imap(self, items, total=None, desc=None):
+        """items를 작업자에게 흘려 보내고 결과를 입력 순서대로 yield"""
+        in_flight = deque()
+        items = iter(items)
+        with tqdm(total=total, desc=desc, disable=desc is None) as pbar:
+            while True:
+                while len(in_flight) < self.max_in_flight:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        break
+                    in_flight.append(self._pool.apply_async(_run, (item,)))
+                if not in_flight:
+                    return
+                result = in_flight.popleft().get()
+                pbar.update(1)
+                yield result
+
+    async def run(self, item):
+        """item 1건을 작업자에게 넘기고 결과를 기다린다. 작업자에서 난 예외는 그대로 올린다"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def done(result):
+            loop.call_soon_threadsafe(_resolve, future, result, None)
+
+        def error(exc):
+            loop.call_soon_threadsafe(_resolve, future, None, exc)
+
+        self._pool.apply_async(_run, (item,), callback=done, error_callback=error)
+        return await future
+
+    def close(self):
+        self._pool.close()
+        self._pool.join()
@@ -0,0 +1,200 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from fake_useragent import UserAgent
+from tqdm import tqdm
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# 세션 설정 (재사용 및 재시도 설정)
+def create_session(pool_size=10):
+    session = requests.Session()
+
+    # 재시도 설정 (429/503은 재시도하지 않고 그대로 돌려줘서 RateLimiter가 속도를 줄이게 한다)
+    retry_strategy = Retry(
+        total=3,
+        status_forcelist=[500, 502, 504],
+        allowed_methods=["HEAD", "GET", "OPTIONS"],
+        backoff_factor=1
+    )
+    adapter = HTTPAdapter(
+        max_retries=retry_strategy,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    return session
+
+# 헤더 생성
+_ua = None
+
+def get_headers():
+    global _ua
+    if _ua is None:
+        _ua = UserAgent(platforms='desktop')
+    return {
+        'User-Agent': _ua.random,
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+    }
+
+
+class AsyncFetcher:
+    """호스트별로 세션(커넥션 풀)을 유지하는 비동기 HTTP 수집기
+
+    requests 세션은 스레드 풀에서 실행하고, 동시 요청 수는 세마포어로 제한한다.
+    같은 호스트로 가는 요청은 하나의 세션을 공유하므로 keep-alive 커넥션이 재사용된다.
+    limiter(RateLimiter)를 넘기면 요청 전에 호스트별 속도 제한을 받고, 응답 결과를 되돌려준다.
+    cache(ResponseCache)를 넘기면 GET 응답 본문을 모두 캐시에 기록한다.
+    validators(ValidatorStore)를 넘기면 get_if_changed()가 조건부 GET으로 바뀌지 않은 페이지를 걸러낸다.
+    cookies(RequestsCookieJar)를 넘기면 모든 세션이 그 쿠키 저장소를 함께 쓴다 (로그인 세션 공유).
+
+    사용 예:
+        async with AsyncFetcher(concurrency=8) as fetcher:
+            response = await fetcher.get(url)
+    """
+
+    def __init__(self, concurrency=8, timeout=30, limiter=None, cache=None, validators=None, cookies=None):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.limiter = limiter
+        self.cache = cache
+        self.validators = validators
+        self.cookies = cookies
+        self._sessions = {}
+        self._semaphore = None
+        self._executor = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    # 호스트별 세션 가져오기
+    def session_for(self, url):
+        host = urlsplit(url).netloc
+        session = self._sessions.get(host)
+        if session is None:
+            session = create_session(pool_size=self.concurrency)
+            if self.cookies is not None:
+                session.cookies = self.cookies
+            self._sessions[host] = session
+        return session
+
+    def set_cookies(self, cookies):
+        """이미 열린 세션까지 포함해서 쿠키 저장소 교체 (재로그인 후)"""
+        self.cookies = cookies
+        for session in self._sessions.values():
+            session.cookies = cookies
+
+    def _request(self, method, url, headers, kwargs, consume=None):
+        session = self.session_for(url)
+        kwargs.setdefault('timeout', self.timeout)
+
+        if consume is None:
+            response = session.request(method, url, headers=headers, **kwargs)
+            response.truncated = False
+        else:
+            # 본문을 조각 단위로 넘기고, consume이 끝나면 나머지는 받지 않고 연결을 닫는다
+            response = session.request(method, url, headers=headers, stream=True, **kwargs)
+            try:
+                response.extracted, body, response.truncated = consume(response)
+            finally:
+                response.close()
+            response._content = body
+            response._content_consumed = True
+
+        # 중간에 끊은 본문은 페이지 전체가 아니므로 캐시에 넣지 않는다
+        if self.cache is not None and method == 'GET' and not response.truncated:
+            self.cache.put(url, response.content, response.status_code)
+        return response
+
+    async def request(self, method, url, headers=None, consume=None, **kwargs):
+        """요청 1건 실행. 네트워크 오류는 예외로 그대로 올린다.
+
+        consume(response) -> (결과, 읽은 본문, 중간에 멈췄는지)를 넘기면 스트리밍으로 받으면서 스레드 안에서 처리하고,
+        결과는 response.extracted, 읽은 만큼의 본문은 response.content에 담긴다.
+        중간에 멈춘 응답은 response.truncated가 True이고 캐시/본문 해시 검증에 쓰지 않는다.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        if headers is None:
+            headers = get_headers()
+
+        async with self._semaphore:
+            if self.limiter is not None:
+                await self.limiter.acquire(url)
+
+            loop = asyncio.get_running_loop()
+            started = time.monotonic()
+            status = None
+            try:
+                response = await loop.run_in_executor(
+                    self._executor, self._request, method, url, headers, kwargs, consume
+                )
+                status = response.status_code
+                return response
+            finally:
+                if self.limiter is not None:
+                    self.limiter.feedback(url, status, time.monotonic() - started)
+
+    async def get(self, url, headers=None, **kwargs):
+        return await self.request('GET', url, headers=headers, **kwargs)
+
+    async def get_if_changed(self, url, **kwargs):
+        """조건부 GET. 304이거나 본문이 지난번과 같으면 None 반환"""
+        if self.validators is None:
+            return await self.get(url, **kwargs)
+
+        headers = get_headers()
+        headers.update(self.validators.conditional_headers(url))
+        response = await self.get(url, headers=headers, **kwargs)
+        if self.validators.is_unchanged(url, response):
+            return None
+        return response
+
+    def remember(self, url, response):
+        """추출이 끝난 응답의 검증 정보 기록 (validators가 없으면 무시)"""
+        if self.validators is not None:
+            self.validators.remember(url, response)
+
+    async def post(self, url, headers=None, **kwargs):
+        return await self.request('POST', url, headers=headers, **kwargs)
+
+    async def map(self, func, items, desc=None):
+        """items 각각에 대해 func(fetcher, item)을 동시에 실행하고 순서대로 결과 반환
+
+        func가 예외를 올리면 아직 끝나지 않은 작업을 모두 취소한 뒤 그 예외를 다시 올린다.
+        """
+        tasks = [asyncio.ensure_future(func(self, item)) for item in items]
+        try:
+            if desc:
+                with tqdm(total=len(tasks), desc=desc) as pbar:
+                    for future in asyncio.as_completed(tasks):
+                        await future
+                        pbar.update(1)
+                        if self.limiter is not None:
+                            pbar.set_postfix_str(self.limiter.format_stats())
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            # 하나가 예외를 올리면 나머지는 취소하고 끝날 때까지 기다린다 (닫힌 fetcher로 계속 요청하지 않도록)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def close(self):
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        self._executor.shutdown(wait=False)
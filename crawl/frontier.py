@@ -0,0 +1,205 @@
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class Frontier:
+    """SQLite 파일에 저장하는 URL 작업 목록 (pending → leased → done/failed)
+
+    여러 프로세스가 같은 파일을 열고 claim()으로 URL 묶음을 원자적으로 빌려 간다.
+    빌린 URL은 lease_seconds 안에 complete()/fail()하지 않으면 다시 pending이 되므로,
+    작업자가 죽어도 다른 작업자가 이어서 처리한다. 실패는 max_attempts번까지 다시 시도한다.
+    complete()/fail()/release()는 지금도 자기가 빌리고 있는 URL에만 적용되므로, 임대가 만료된 뒤 늦게 끝난 작업자가
+    다른 작업자가 다시 가져간 URL의 결과를 덮어쓰지 않는다. 바뀐 URL 수를 반환한다.
+    (여러 머신에서 쓸 때는 파일 잠금이 제대로 동작하는 공유 디스크에 둘 것)
+
+    queue: 같은 파일 안에서 작업을 나누는 이름 (예: 'naver', 'naver_19', 'novelpia')
+
+    사용 예:
+        frontier = Frontier()
+        frontier.add('novelpia', urls)
+        while batch := frontier.claim('novelpia', 100):
+            ...
+            frontier.complete(done_urls)
+            frontier.fail(failed_urls)
+    """
+
+    def __init__(self, path='data/frontier.sqlite', lease_seconds=600, max_attempts=3, worker_id=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}'
+
+        # 트랜잭션은 직접 관리 (claim은 BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡는다)
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA busy_timeout=60000')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS urls (
+                url TEXT PRIMARY KEY,
+                queue TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                priority INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                meta TEXT,
+                error TEXT,
+                updated_at REAL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS urls_claim ON urls (queue, state, priority DESC, attempts)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS urls_lease ON urls (state, lease_expires)')
+
+    def add(self, queue, urls, priority=0, meta=None):
+        """URL 추가. 이미 있는 URL은 건너뛴다. 새로 추가된 개수 반환
+
+        urls: URL 목록 또는 (url, meta) 목록
+        """
+        now = time.time()
+        rows = []
+        for item in urls:
+            url, item_meta = item if isinstance(item, tuple) else (item, meta)
+            rows.append((url, queue, priority, json.dumps(item_meta, ensure_ascii=False), now))
+
+        self._db.execute('BEGIN IMMEDIATE')
+        before = self._db.total_changes
+        self._db.executemany(
+            'INSERT OR IGNORE INTO urls (url, queue, priority, meta, updated_at) VALUES (?, ?, ?, ?, ?)', rows
+        )
+        added = self._db.total_changes - before
+        self._db.execute('COMMIT')
+        return added
+
+    def known(self, urls):
+        """urls 중 이미 작업 목록에 있는 URL 집합 (상태와 무관)"""
+        urls = list(urls)
+        found = set()
+        for i in range(0, len(urls), 500):
+            chunk = urls[i: i + 500]
+            placeholders = ', '.join('?' * len(chunk))
+            rows = self._db.execute(f'SELECT url FROM urls WHERE url IN ({placeholders})', chunk)
+            found.update(url for url, in rows)
+        return found
+
+    def _expire_leases(self, now):
+        self._db.execute(
+            'UPDATE urls SET state = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? '
+            'WHERE state = ? AND lease_expires < ?',
+            (PENDING, now, LEASED, now)
+        )
+
+    def claim(self, queue, limit=100):
+        """pending URL을 우선순위 순으로 limit개 빌려 온다. [(url, meta)] 반환"""
+        now = time.time()
+        self._db.execute('BEGIN IMMEDIATE')
+        try:
+            self._expire_leases(now)
+            rows = self._db.execute(
+                'SELECT url, meta FROM urls WHERE queue = ? AND state = ? '
+                'ORDER BY priority DESC, attempts ASC LIMIT ?',
+                (queue, PENDING, limit)
+            ).fetchall()
+            self._db.executemany(
+                'UPDATE urls SET state = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, '
+                'updated_at = ? WHERE url = ?',
+                [(LEASED, self.worker_id, now + self.lease_seconds, now, url) for url, _ in rows]
+            )
+            self._db.execute('COMMIT')
+        except Exception:
+            self._db.execute('ROLLBACK')
+            raise
+        return [(url, json.loads(meta) if meta else None) for url, meta in rows]
+
+    def extend_lease(self, urls):
+        """오래 걸리는 작업의 임대 기간 연장"""
+        expires = time.time() + self.lease_seconds
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.executemany(
+            'UPDATE urls SET lease_expires = ? WHERE url = ? AND state = ? AND lease_owner = ?',
+            [(expires, url, LEASED, self.worker_id) for url in urls]
+        )
+        self._db.execute('COMMIT')
+
+    def _update_leased(self, sql, params):
+        """sql의 WHERE url = ? 뒤에 이 작업자의 임대 조건을 붙여 실행하고 바뀐 행 수 반환"""
+        self._db.execute('BEGIN IMMEDIATE')
+        before = self._db.total_changes
+        self._db.executemany(
+            sql + ' AND state = ? AND lease_owner = ?',
+            [(*row, LEASED, self.worker_id) for row in params]
+        )
+        changed = self._db.total_changes - before
+        self._db.execute('COMMIT')
+        return changed
+
+    def complete(self, urls):
+        now = time.time()
+        return self._update_leased(
+            'UPDATE urls SET state = ?, lease_owner = NULL, lease_expires = NULL, error = NULL, updated_at = ? '
+            'WHERE url = ?',
+            [(DONE, now, url) for url in urls]
+        )
+
+    def fail(self, urls, error=None):
+        """실패 처리. 시도 횟수가 max_attempts 미만이면 다시 pending으로 돌린다"""
+        now = time.time()
+        return self._update_leased(
+            'UPDATE urls SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, '
+            'lease_owner = NULL, lease_expires = NULL, error = ?, updated_at = ? WHERE url = ?',
+            [(self.max_attempts, FAILED, PENDING, error, now, url) for url in urls]
+        )
+
+    def release(self, urls):
+        """처리하지 않고 돌려주기 (시도 횟수도 되돌린다)"""
+        now = time.time()
+        return self._update_leased(
+            'UPDATE urls SET state = ?, lease_owner = NULL, lease_expires = NULL, '
+            'attempts = MAX(attempts - 1, 0), updated_at = ? WHERE url = ?',
+            [(PENDING, now, url) for url in urls]
+        )
+
+    def retry_failed(self, queue):
+        """failed 상태 URL을 시도 횟수를 초기화해서 다시 pending으로"""
+        self._db.execute('BEGIN IMMEDIATE')
+        cursor = self._db.execute(
+            'UPDATE urls SET state = ?, attempts = 0, updated_at = ? WHERE queue = ? AND state = ?',
+            (PENDING, time.time(), queue, FAILED)
+        )
+        self._db.execute('COMMIT')
+        return cursor.rowcount
+
+    def _has_leases(self, queue):
+        self._db.execute('BEGIN IMMEDIATE')
+        self._expire_leases(time.time())
+        self._db.execute('COMMIT')
+        return bool(self.counts(queue)[LEASED])
+
+    def wait_idle(self, queue, poll_seconds=10):
+        """다른 작업자가 빌려 간 URL이 모두 끝나거나 임대가 만료될 때까지 대기"""
+        while self._has_leases(queue):
+            time.sleep(poll_seconds)
+
+    async def wait_idle_async(self, queue, poll_seconds=10):
+        """wait_idle의 비동기 버전 (같은 이벤트 루프의 다른 플랫폼 수집을 막지 않음)"""
+        while self._has_leases(queue):
+            await asyncio.sleep(poll_seconds)
+
+    def counts(self, queue):
+        """상태별 URL 수"""
+        rows = self._db.execute('SELECT state, COUNT(*) FROM urls WHERE queue = ? GROUP BY state', (queue,))
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows.fetchall()))
+        return counts
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,218 @@
+import json
+import os
+import pickle
+import socket
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class Journal:
+    """레코드 단위로 추가만 하는 크롤링 저널 (JSONL 세그먼트)
+
+    결과를 모아 두었다가 pickle 전체를 다시 쓰는 대신, 레코드가 나올 때마다 한 줄씩 덧붙인다.
+    저장 비용은 데이터가 늘어도 일정하고, 프로세스가 죽어도 잃는 건 마지막 한 줄뿐이다.
+
+    여러 워커(프로세스)가 같은 저널에 쓸 수 있도록 쓰는 쪽마다 자기 세그먼트({번호}-{호스트}-{pid}.jsonl)를 만들고,
+    열려 있는 동안 그 파일에 잠금(flock)을 잡는다. 잠금이 풀린(닫혔거나 쓰던 프로세스가 죽은) 세그먼트만 봉인된 것으로 보고
+    compact()는 봉인된 세그먼트만 합친다. 이미 있는 세그먼트에 다시 이어 쓰지 않는다.
+
+    fsync: 'always' - 레코드마다, 'batch' - fsync_every개마다, 'never' - OS에 맡김
+    segment_bytes: 세그먼트 파일이 이 크기를 넘으면 다음 파일로 넘어간다
+
+    사용 예:
+        journal = Journal('data/journal/naver')
+        journal.append(novel_data)
+        ...
+        journal.compact()
+        dataset = journal.load()
+    """
+
+    def __init__(self, root, fsync='batch', fsync_every=100, segment_bytes=64 * 1024 * 1024, writer_id=None):
+        if fsync not in ('always', 'batch', 'never'):
+            raise ValueError(f'지원하지 않는 fsync 정책입니다: {fsync}')
+        self.root = root
+        self.fsync = fsync
+        self.fsync_every = fsync_every
+        self.segment_bytes = segment_bytes
+        self.writer_id = writer_id or f'{socket.gethostname()}-{os.getpid()}'
+        os.makedirs(root, exist_ok=True)
+
+        self._file = None
+        self._path = None
+        self._unsynced = 0
+        # 이 인스턴스가 쓰고 닫은 세그먼트 (잠금을 쓸 수 없는 환경에서 봉인 여부 판단용)
+        self._sealed = set()
+
+    def segments(self):
+        """세그먼트 파일 경로 (오래된 순)"""
+        names = sorted(name for name in os.listdir(self.root) if name.endswith('.jsonl'))
+        return [os.path.join(self.root, name) for name in names]
+
+    @staticmethod
+    def _number(path):
+        return int(os.path.basename(path).split('.')[0].split('-')[0])
+
+    def _last_number(self):
+        segments = self.segments()
+        if not segments:
+            return 0
+        return max(self._number(path) for path in segments)
+
+    def _open(self):
+        """이 writer 전용 새 세그먼트를 열고 잠근다"""
+        path = os.path.join(self.root, f'{self._last_number() + 1:08d}-{self.writer_id}.jsonl')
+        # 잠금을 잡기 전에 compact()가 빈 세그먼트를 봉인된 것으로 보지 않도록 다른 이름으로 만들어 잠근 뒤 옮긴다
+        new_path = path + '.new'
+        self._file = open(new_path, 'ab')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        os.replace(new_path, path)
+        self._path = path
+
+    def append(self, record):
+        if self._file is None:
+            self._open()
+        elif self._file.tell() >= self.segment_bytes:
+            self._rotate()
+
+        line = json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b'\n'
+        self._file.write(line)
+        self._file.flush()
+
+        self._unsynced += 1
+        if self.fsync == 'always' or (self.fsync == 'batch' and self._unsynced >= self.fsync_every):
+            self.sync()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _rotate(self):
+        self.close()
+        self._open()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            # 파일을 닫으면 잠금도 풀리므로 이 세그먼트는 봉인된다
+            self._file.close()
+            self._file = None
+            self._sealed.add(self._path)
+            self._path = None
+
+    def _is_sealed(self, path):
+        """더 이상 아무도 쓰지 않는 세그먼트인지"""
+        if path == self._path:
+            return False
+        if fcntl is None:
+            # 잠금을 확인할 수 없으면 이 인스턴스가 직접 닫은 세그먼트만 봉인된 것으로 본다
+            return path in self._sealed
+        try:
+            with open(path, 'rb') as f:
+                fcntl.flock(f.fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        except FileNotFoundError:
+            return False
+        return True
+
+    def replay(self):
+        """모든 세그먼트의 레코드를 기록된 순서대로 반환. 잘린 줄(쓰다가 죽은 줄)은 건너뛴다"""
+        if self._file is not None:
+            self._file.flush()
+        yield from self._read_segments(self.segments())
+
+    def load(self, key='url'):
+        """replay 결과를 key 기준으로 합친 데이터셋 (같은 key는 나중 레코드가 이김)"""
+        records = {}
+        for record in self.replay():
+            if record:
+                records[record.get(key)] = record
+        return list(records.values())
+
+    def keys(self, key='url'):
+        return {record.get(key) for record in self.replay() if record}
+
+    def _read_segments(self, segments):
+        for path in segments:
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def compact(self, key='url'):
+        """봉인된 세그먼트들을 하나로 합치고 중복 레코드 제거. 합친 레코드 수 반환
+
+        다른 writer가 아직 쓰고 있는 세그먼트는 건드리지 않는다. 그보다 뒤에 있는 봉인된 세그먼트까지 합치면
+        쓰는 중인 세그먼트의 새 레코드가 오래된 레코드에 덮이므로, 앞에서부터 봉인된 구간까지만 합친다.
+        합친 파일을 그 구간의 마지막 세그먼트 자리에 원자적으로 바꿔 넣은 뒤 이전 세그먼트를 지운다.
+        중간에 죽어도 남은 이전 세그먼트는 합친 파일보다 앞에 있으므로 load() 결과는 같다.
+        """
+        self.close()
+        sealed = []
+        for path in self.segments():
+            if not self._is_sealed(path):
+                break
+            sealed.append(path)
+        if not sealed:
+            return 0
+
+        records = {}
+        for record in self._read_segments(sealed):
+            if record:
+                records[record.get(key)] = record
+        tmp_path = os.path.join(self.root, f'compact-{self.writer_id}.tmp')
+        with open(tmp_path, 'wb') as f:
+            for record in records.values():
+                f.write(json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, sealed[-1])
+        for path in sealed[:-1]:
+            os.remove(path)
+        self._sealed.difference_update(sealed[:-1])
+        return len(records)
+
+    def export(self, path, key='url'):
+        """합친 데이터셋을 기존 pickle 형식(list[dict])으로 내보내기 (전처리 입력용)"""
+        dataset = self.load(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(dataset, f)
+        os.replace(tmp_path, path)
+        return dataset
+
+
+def open_journal(name, seed_path=None, **kwargs):
+    """data/journal/{name} 저널을 연다. 비어 있으면 기존 pickle 데이터로 한 번 채운다"""
+    journal = Journal(os.path.join('data', 'journal', name), **kwargs)
+    if seed_path and not journal.segments() and os.path.exists(seed_path):
+        with open(seed_path, 'rb') as f:
+            journal.extend(record for record in pickle.load(f) if record)
+        journal.sync()
+    return journal
+
+
+def journaled(func, journal):
+    """fetcher.map에 넘길 func(fetcher, item)을 감싸서 결과가 나오는 즉시 저널에 기록"""
+    if journal is None:
+        return func
+
+    async def wrapper(fetcher, item):
+        result = await func(fetcher, item)
+        if result:
+            journal.append(result)
+        return result
+    return wrapper
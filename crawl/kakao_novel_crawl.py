@@ -1,17 +1,31 @@
 from playwright.sync_api import sync_playwright
 import json
-import requests
-import time
 import os
 import json
 from fake_useragent import UserAgent
-from tqdm import tqdm
 from tqdm.asyncio import tqdm_asyncio
 from playwright.async_api import async_playwright
-import random
 import asyncio
 import pandas as pd
-from itertools import chain
+import re
+import math
+import argparse
+from fetcher import AsyncFetcher
+from rate_limiter import shared_limiter
+from browser_pool import BrowserPool
+from resource_policy import RoutingPolicy, wait_for_fields
+from plugin import PlatformPlugin
+
+GRAPHQL_URL = 'https://bff-page.kakao.com/graphql'
+
+class SessionExpired(Exception):
+    """GraphQL이 401/403을 돌려줌 (쿠키를 새로 받아야 한다)
+
+    crawl_details_graphql에서 올라올 때는 results(이미 받아서 저널에 기록한 {url: novel_data})와
+    remaining(끝나지 않은 배치의 [(series_id, url)])이 붙어 있다.
+    """
+    results = None
+    remaining = None
 
 def get_session_info():
     """페이지 방문해서 세션 정보 가져오기"""
@@ -29,18 +43,9 @@ def get_session_info():
     
     return cookies, user_agent
 
-def crawl_novels_with_requests():
-    """requests를 사용해서 직접 GraphQL API 호출"""
-    print("세션 정보 가져오는 중...")
-    cookies, user_agent = get_session_info()
-    
-    session = requests.Session()
-    
-    # 쿠키 설정
-    for cookie in cookies:
-        session.cookies.set(cookie['name'], cookie['value'])
-    
-    headers = {
+def get_graphql_headers(user_agent):
+    """bff-page GraphQL 요청 헤더"""
+    return {
         'User-Agent': user_agent,
         'Content-Type': 'application/json',
         'Accept': 'application/json',
@@ -50,284 +55,278 @@ def crawl_novels_with_requests():
         'sec-ch-ua-mobile': '?0',
         'sec-ch-ua-platform': '"Linux"'
     }
-    
-    # GraphQL 쿼리 (원본에서 추출)
-    query = """
-    query staticLandingGenreSection($sectionId: ID!, $param: StaticLandingGenreParamInput!) {
-      staticLandingGenreSection(sectionId: $sectionId, param: $param) {
-        ...Section
-      }
-    }
-    
-    fragment Section on Section {
-      id
-      uid
-      type
-      title
-      ... on StaticLandingGenreSection {
-        isEnd
-        totalCount
-        param {
-          categoryUid
-          subcategory {
-            name
-            param
-          }
-          sortType {
-            name
-            param
-          }
-          page
-          isComplete
-          screenUid
-        }
-      }
-      groups {
-        ...Group
+
+# 장르 목록 GraphQL 쿼리 (원본에서 추출)
+LISTING_QUERY = """
+query staticLandingGenreSection($sectionId: ID!, $param: StaticLandingGenreParamInput!) {
+  staticLandingGenreSection(sectionId: $sectionId, param: $param) {
+    ...Section
+  }
+}
+
+fragment Section on Section {
+  id
+  uid
+  type
+  title
+  ... on StaticLandingGenreSection {
+    isEnd
+    totalCount
+    param {
+      categoryUid
+      subcategory {
+        name
+        param
       }
-    }
-    
-    fragment Group on Group {
-      id
-      type
-      dataKey
-      items {
-        ...Item
+      sortType {
+        name
+        param
       }
+      page
+      isComplete
+      screenUid
     }
-    
-    fragment Item on Item {
-      id
-      type
-      ...PosterViewItem
-      ...CardViewItem
-    }
-    
-    fragment PosterViewItem on PosterViewItem {
-      id
-      type
-      scheme
-      title
-      altText
-      thumbnail
-      badgeList
-      ageGradeBadge
-      statusBadge
-      subtitleList
-      rank
-      rankVariation
-      ageGrade
-      selfCensorship
-      seriesId
-      showDimmedThumbnail
-      discountRate
-      discountRateText
-    }
-    
-    fragment CardViewItem on CardViewItem {
-      title
-      altText
-      thumbnail
-      scheme
-      badgeList
-      ageGradeBadge
-      statusBadge
-      ageGrade
-      selfCensorship
-      subtitleList
-      caption
-      rank
-      rankVariation
-      isEventBanner
-      categoryType
-      discountRate
-      discountRateText
-      backgroundColor
-      isBook
-      isLegacy
+  }
+  groups {
+    ...Group
+  }
+}
+
+fragment Group on Group {
+  id
+  type
+  dataKey
+  items {
+    ...Item
+  }
+}
+
+fragment Item on Item {
+  id
+  type
+  ...PosterViewItem
+  ...CardViewItem
+}
+
+fragment PosterViewItem on PosterViewItem {
+  id
+  type
+  scheme
+  title
+  altText
+  thumbnail
+  badgeList
+  ageGradeBadge
+  statusBadge
+  subtitleList
+  rank
+  rankVariation
+  ageGrade
+  selfCensorship
+  seriesId
+  showDimmedThumbnail
+  discountRate
+  discountRateText
+}
+
+fragment CardViewItem on CardViewItem {
+  title
+  altText
+  thumbnail
+  scheme
+  badgeList
+  ageGradeBadge
+  statusBadge
+  ageGrade
+  selfCensorship
+  subtitleList
+  caption
+  rank
+  rankVariation
+  isEventBanner
+  categoryType
+  discountRate
+  discountRateText
+  backgroundColor
+  isBook
+  isLegacy
+}
+"""
+
+ITEMS_PER_PAGE = 24  # 관찰된 페이지당 아이템 수
+
+def listing_variables(page, subcategory_uid='0', sort_type='update', is_complete=False,
+                      category_uid=11, screen_uid=84):
+    """장르 섹션 한 페이지 요청 변수"""
+    section_id = (f"static-landing-Genre-section-Layout-{category_uid}-{subcategory_uid}-"
+                  f"{sort_type}-{str(is_complete).lower()}-{screen_uid}")
+    return {
+        "sectionId": section_id,
+        "param": {
+            "categoryUid": category_uid,
+            "subcategoryUid": subcategory_uid,
+            "sortType": sort_type,
+            "isComplete": is_complete,
+            "screenUid": screen_uid,
+            "page": page
+        }
     }
+
+def extract_listing_items(section):
+    """섹션 응답에서 작품 목록 추출 (제목이 있는 아이템만)"""
+    novels = []
+    for group in section.get('groups') or []:
+        for item in group.get('items') or []:
+            if item.get('type') and 'title' in item:
+                novels.append({
+                    'id': item.get('id'),
+                    'title': item.get('title'),
+                    'thumbnail': item.get('thumbnail'),
+                    'scheme': item.get('scheme'),
+                    'subtitleList': item.get('subtitleList', []),
+                    'badgeList': item.get('badgeList', []),
+                    'ageGrade': item.get('ageGrade'),
+                    'rank': item.get('rank'),
+                    'type': item.get('type')
+                })
+    return novels
+
+
+class KakaoListingPager:
+    """장르 섹션 하나를 병렬로 훑는 페이저
+
+    1페이지의 totalCount로 전체 페이지 수를 정한 뒤 나머지 페이지를 동시에 요청한다.
+    페이지가 끝날 때마다 {"page": n, "items": [...]} 한 줄을 JSONL 파일에 append + fsync 하므로,
+    중간에 죽어도 다시 실행하면 이미 받은 페이지는 건너뛴다.
     """
-    
-    all_novels = []
-    page_num = 1
-    
-    # ===============================================
-    # 🔧 여기서 최대 페이지 수정하세요!
-    # ===============================================
-    max_pages = None     # None = 자동 계산 (전체)
-    # max_pages = 50     # 50페이지만 수집
-    # max_pages = 100    # 100페이지만 수집  
-    # max_pages = 500    # 500페이지만 수집
-    
-    # 사용자 확인 받을 임계값 (이 페이지 수 이상이면 확인 요청)
-    confirmation_threshold = 100
-    
-    failed_requests = 0
-    max_failures = 3  # 연속 실패 허용 횟수
-    
-    print("소설 데이터 수집 시작...")
-    print("⚠️  안전한 크롤링을 위해 각 요청 사이에 2-5초씩 대기합니다.")
-    
-    while (max_pages is None or page_num <= max_pages) and failed_requests < max_failures:
-    
-    # while page_num <= max_pages:
-        variables = {
-            "sectionId": "static-landing-Genre-section-Layout-11-0-update-false-84",
-            "param": {
-                "categoryUid": 11,
-                "subcategoryUid": "0",
-                "sortType": "update",
-                "isComplete": False,
-                "screenUid": 84,
-                "page": page_num
-            }
-        }
-        
-        payload = {
-            "query": query,
-            "variables": variables
+
+    def __init__(self, fetcher, headers, subcategory_uid='0', sort_type='update', is_complete=False,
+                 out_dir='data/kakao_listing'):
+        self.fetcher = fetcher
+        self.headers = headers
+        self.params = {
+            'subcategory_uid': subcategory_uid,
+            'sort_type': sort_type,
+            'is_complete': is_complete,
         }
-        
-        try:
-            response = session.post(
-                'https://bff-page.kakao.com/graphql',
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            
-            # 상태 코드 확인
-            if response.status_code == 429:
-                print(f"⚠️  Rate limit 감지. 30초 대기 후 재시도...")
-                time.sleep(30)
-                continue
-            elif response.status_code == 403:
-                print(f"❌ 접근 거부 (403). IP 차단 가능성.")
-                break
-            elif response.status_code != 200:
-                print(f"❌ HTTP {response.status_code} 오류")
-                failed_requests += 1
-                continue
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                # 디버깅: 응답 구조 확인
-                print(f"응답 키들: {list(data.keys()) if isinstance(data, dict) else 'Not dict'}")
-                if 'data' in data:
-                    print(f"data 키들: {list(data['data'].keys()) if data['data'] else 'data is None'}")
-                
-                # 전체 응답을 파일로 저장 (첫 번째 페이지만)
-                if page_num == 1:
-                    with open(f'debug_response_page_{page_num}.json', 'w', encoding='utf-8') as f:
-                        json.dump(data, f, ensure_ascii=False, indent=2)
-                    print(f"디버깅용 응답이 debug_response_page_{page_num}.json 파일로 저장됨")
-                
-                if 'data' in data and data['data'] and 'staticLandingGenreSection' in data['data']:
-                    section = data['data']['staticLandingGenreSection']
-                    
-                    # 총 개수 확인 및 최대 페이지 계산
-                    total_count = section.get('totalCount', 0)
-                    is_end = section.get('isEnd', False)
-                    
-                    # 첫 번째 페이지에서 최대 페이지 계산
-                    if page_num == 1 and total_count and max_pages is None:
-                        items_per_page = 24  # 관찰된 페이지당 아이템 수
-                        import math
-                        calculated_max_pages = math.ceil(total_count / items_per_page)
-                        print(f"📊 총 소설 개수: {total_count:,}개")
-                        print(f"📊 예상 총 페이지: {calculated_max_pages:,}페이지")
-                        print(f"📊 예상 소요시간: {calculated_max_pages * 3.5 / 60:.1f}분")
-                        
-                        # 사용자 확인
-                        if calculated_max_pages > confirmation_threshold:
-                            user_input = input(f"\n⚠️  총 {calculated_max_pages}페이지를 수집하시겠습니까? (y/n/숫자): ")
-                            if user_input.lower() == 'n':
-                                print("수집을 중단합니다.")
-                                break
-                            elif user_input.isdigit():
-                                max_pages = min(int(user_input), calculated_max_pages)
-                                print(f"최대 {max_pages}페이지까지 수집합니다.")
-                            else:
-                                max_pages = calculated_max_pages
-                        else:
-                            max_pages = calculated_max_pages
-                    
-                    print(f"페이지 {page_num}/{max_pages or '?'}: 총 {total_count}개 중 수집 중...")
-                    print(f"섹션 키들: {list(section.keys())}")
-                    
-                    # 아이템들 추출
-                    if 'groups' in section:
-                        print(f"그룹 개수: {len(section['groups'])}")
-                        for group_idx, group in enumerate(section['groups']):
-                            print(f"그룹 {group_idx} 키들: {list(group.keys())}")
-                            if 'items' in group:
-                                print(f"그룹 {group_idx} 아이템 개수: {len(group['items'])}")
-                                
-                                # 아이템 타입들 확인
-                                item_types = [item.get('type') for item in group['items']]
-                                print(f"아이템 타입들: {set(item_types)}")
-                                
-                                # 첫 번째 페이지에서 샘플 아이템 구조 확인
-                                if page_num == 1 and group['items']:
-                                    print(f"첫 번째 아이템 키들: {list(group['items'][0].keys())}")
-                                    print(f"첫 번째 아이템 샘플: {group['items'][0]}")
-                                
-                                for item in group['items']:
-                                    item_type = item.get('type')
-                                    print(f"처리 중인 아이템 타입: {item_type}")
-                                    
-                                    # 모든 타입의 아이템을 일단 수집해보자
-                                    if item_type and 'title' in item:  # 제목이 있는 모든 아이템
-                                        novel_info = {
-                                            'id': item.get('id'),
-                                            'title': item.get('title'),
-                                            'thumbnail': item.get('thumbnail'),
-                                            'scheme': item.get('scheme'),
-                                            'subtitleList': item.get('subtitleList', []),
-                                            'badgeList': item.get('badgeList', []),
-                                            'ageGrade': item.get('ageGrade'),
-                                            'rank': item.get('rank'),
-                                            'type': item.get('type')
-                                        }
-                                        all_novels.append(novel_info)
-                                        print(f"아이템 추가됨: {item.get('title', 'No title')}")
-                                    else:
-                                        print(f"아이템 스킵됨 - 타입: {item_type}, 키들: {list(item.keys())}")
-                    else:
-                        print("groups 키가 없음")
-                    
-                    print(f"페이지 {page_num} 완료. 현재까지 {len(all_novels)}개 수집됨")
-                    
-                    # 마지막 페이지인지 확인
-                    if is_end:
-                        print(f"마지막 페이지 도달 (페이지 {page_num})")
-                        break
-                    
-                    page_num += 1
-                    
-                    # 안전한 요청 간격 (랜덤하게 2-5초)
-                    import random
-                    wait_time = random.uniform(1,3)
-                    print(f"다음 요청까지 {wait_time:.1f}초 대기 중...")
-                    time.sleep(wait_time)
-                    
-                else:
-                    print(f"페이지 {page_num}: 데이터 구조가 예상과 다름")
-                    if 'errors' in data:
-                        print(f"GraphQL 오류: {data['errors']}")
-                    break
-                    
-            else:
-                print(f"요청 실패: {response.status_code}")
-                print(f"응답: {response.text[:500]}")
-                break
-                
-        except Exception as e:
-            print(f"오류 발생 (페이지 {page_num}): {e}")
-            break
-    
-    return all_novels
+        os.makedirs(out_dir, exist_ok=True)
+        name = f"{subcategory_uid}-{sort_type}-{'complete' if is_complete else 'all'}"
+        self.path = os.path.join(out_dir, f'{name}.jsonl')
+        self.failed_pages = []
+
+    def completed_pages(self):
+        if not os.path.exists(self.path):
+            return set()
+        pages = set()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    pages.add(json.loads(line)['page'])
+                except (ValueError, KeyError):
+                    continue  # 쓰다 만 마지막 줄
+        return pages
+
+    def read_items(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield from json.loads(line)['items']
+                except (ValueError, KeyError):
+                    continue
+
+    async def fetch_section(self, page):
+        payload = {'query': LISTING_QUERY, 'variables': listing_variables(page, **self.params)}
+        response = await self.fetcher.post(GRAPHQL_URL, headers=self.headers, json=payload)
+        response.raise_for_status()
+        data = response.json()
+        section = (data.get('data') or {}).get('staticLandingGenreSection')
+        if section is None:
+            raise Exception(f"GraphQL 오류: {data.get('errors')}")
+        return section
+
+    def _append(self, out, page, items):
+        out.write(json.dumps({'page': page, 'items': items}, ensure_ascii=False) + '\n')
+        out.flush()
+        os.fsync(out.fileno())
+
+    async def run(self, max_pages=None):
+        """남은 페이지를 모두 받아 파일에 기록. 받은 페이지 수 반환"""
+        done = self.completed_pages()
+        with open(self.path, 'a', encoding='utf-8') as out:
+            section = await self.fetch_section(1)
+            if 1 not in done:
+                self._append(out, 1, extract_listing_items(section))
+                done.add(1)
+
+            last_page = math.ceil((section.get('totalCount') or 0) / ITEMS_PER_PAGE) or 1
+            if max_pages is not None:
+                last_page = min(last_page, max_pages)
+            remaining = [page for page in range(2, last_page + 1) if page not in done]
+            print(f"[{self.path}] 총 {section.get('totalCount', 0):,}개, {last_page}페이지 중 {len(remaining)}페이지 남음")
+
+            async def fetch_page(page):
+                try:
+                    self._append(out, page, extract_listing_items(await self.fetch_section(page)))
+                except Exception as e:
+                    self.failed_pages.append(page)
+                    print(f"페이지 {page} 실패: {e}")
+
+            await tqdm_asyncio.gather(*(fetch_page(page) for page in remaining), desc=os.path.basename(self.path))
+
+        if self.failed_pages:
+            print(f"실패한 페이지 {len(self.failed_pages)}개는 다시 실행하면 이어서 받습니다.")
+        return len(remaining) - len(self.failed_pages)
+
+
+# 기본으로 훑을 섹션 (전체 장르, 업데이트순)
+DEFAULT_SECTIONS = [
+    {'subcategory_uid': '0', 'sort_type': 'update', 'is_complete': False},
+]
+
+def parse_sections(value):
+    """'0:update,86:update:complete' → KakaoListingPager 인자 목록
+
+    섹션마다 '장르uid[:정렬[:complete|all]]' (정렬 기본값 update, 완결 여부 기본값 all)
+    """
+    sections = []
+    for part in value.split(','):
+        fields = part.strip().split(':')
+        if not fields[0] or len(fields) > 3:
+            raise ValueError(f"'장르uid[:정렬[:complete|all]]' 형식이어야 합니다: {part}")
+        subcategory_uid, sort_type, complete = (fields + ['update', 'all'][len(fields) - 1:])[:3]
+        if complete not in ('complete', 'all'):
+            raise ValueError(f"완결 여부는 complete 또는 all이어야 합니다: {part}")
+        sections.append({'subcategory_uid': subcategory_uid, 'sort_type': sort_type or 'update',
+                         'is_complete': complete == 'complete'})
+    return sections
+
+async def crawl_novels_with_requests(sections=None, concurrency=4, max_pages=None, session_info=None):
+    """requests 기반 GraphQL 페이저로 여러 섹션을 동시에 훑고 작품 목록 반환 (id 기준 중복 제거)
+
+    session_info: get_session_info() 결과. 없으면 새로 받는다
+    """
+    if session_info is None:
+        print("세션 정보 가져오는 중...")
+        session_info = await asyncio.to_thread(get_session_info)
+    cookies, user_agent = session_info
+    headers = get_graphql_headers(user_agent)
+
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter()) as fetcher:
+        session = fetcher.session_for(GRAPHQL_URL)
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'])
+
+        pagers = [KakaoListingPager(fetcher, headers, **section) for section in (sections or DEFAULT_SECTIONS)]
+        await asyncio.gather(*(pager.run(max_pages=max_pages) for pager in pagers))
+        print(f"요청 속도: {fetcher.limiter.format_stats()}")
+
+    novels = {}
+    for pager in pagers:
+        for item in pager.read_items():
+            novels.setdefault(item['id'], item)
+    return list(novels.values())
 
 def crawl_novels_with_playwright():
     """playwright 브라우저 컨텍스트에서 직접 호출"""
@@ -496,222 +495,412 @@ def split_data(data, split_num):
         raise TypeError(f"지원하지 않는 타입입니다: {type(data)}")
 
 # 소설 데이터 가져오기
-async def crawl_data(playwright, url, user_agent, age='All'):
+async def crawl_data(pool, url, limiter, age='All'):
     if age == '19':
         # 19금 인 경우에 로그인하기
         pass
     try:
-        # print(url)
-        browser = await playwright.chromium.launch(
-            headless=True,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--no-first-run',
-                '--disable-extensions',
-                '--disable-default-apps',
-                '--disable-gpu'
-            ]
-        )
-        context = await browser.new_context(
-            user_agent=user_agent,
-            is_mobile=False,
-            has_touch=False,
-            viewport={'width': 1920, 'height': 1080}
-        )
-        page = await context.new_page()
+        async with pool.page() as page:
+            await limiter.goto(page, url, wait_until='domcontentloaded')
+            # networkidle 대신 제목/작가 영역이 렌더링될 때까지만 대기
+            await wait_for_fields(page, [
+                ['//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[1]'],
+                ['//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div[1]/div[1]/div[1]/span'],
+            ])
         
-        await page.goto(url)
-        await page.wait_for_load_state('networkidle')
-        # time.sleep(100)
+            # print("브라우저 컨텍스트에서 GraphQL 호출 시작...")
         
-        # print("브라우저 컨텍스트에서 GraphQL 호출 시작...")
-        
-        img_xpaths = [
-            'xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div/img',
-            # 'xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div[2]/img',
-        ]
-        # for xpath in img_xpaths:
-        # 개선된 방법
-        img_locator = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div/img')
-        if await img_locator.count() > 1:
-            img = await img_locator.last.get_attribute('src')
-        else:
-            img = await img_locator.first.get_attribute('src')  # 또는 그냥 img_locator.get_attribute('src')
+            img_xpaths = [
+                'xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div/img',
+                # 'xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div[2]/img',
+            ]
+            # for xpath in img_xpaths:
+            # 개선된 방법
+            img_locator = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[1]/div[2]/div/div/div/img')
+            if await img_locator.count() > 1:
+                img = await img_locator.last.get_attribute('src')
+            else:
+                img = await img_locator.first.get_attribute('src')  # 또는 그냥 img_locator.get_attribute('src')
         
-        title = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[1]').inner_text()
-        author = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
-        if await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[3]/span').count() > 0:
-            rating = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[3]/span').inner_text()
-        else:
-            rating = None
-        genre = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[1]/div').inner_text()
-        serial = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[2]/span').inner_text()
-        publisher = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
-
-        page_count = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div[1]/div[1]/div[1]/span').inner_text()
-
-        if '단행본' in title:
-            page_unit = '권'
-        else:
-            page_unit = '화'
+            title = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[1]').inner_text()
+            author = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
+            if await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[3]/span').count() > 0:
+                rating = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[3]/span').inner_text()
+            else:
+                rating = None
+            genre = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[1]/div').inner_text()
+            serial = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[2]/span').inner_text()
+            publisher = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
+
+            page_count = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div[1]/div[1]/div[1]/span').inner_text()
+
+            if '단행본' in title:
+                page_unit = '권'
+            else:
+                page_unit = '화'
         
-        if '19세 완전판' in title:
-            age = '19'
-        else:
-            age = '전체'
-        # age = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
-
-        viewers = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[2]/span').inner_text()
-
-        # 정보 보기
-        await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[1]/div/div/div[2]/a').click()
-        await page.wait_for_selector('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[1]/span')
-        await asyncio.sleep(.5)
-        summary = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[1]/span').inner_text()
+            if '19세 완전판' in title:
+                age = '19'
+            else:
+                age = '전체'
+            # age = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/span[2]').inner_text()
+
+            viewers = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[1]/div[1]/div/div[2]/a/div/div[1]/div[2]/span').inner_text()
+
+            # 정보 보기
+            await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[1]/div/div/div[2]/a').click()
+            await page.wait_for_selector('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[1]/span')
+            await asyncio.sleep(.5)
+            summary = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[1]/div/div[2]/div/div[1]/span').inner_text()
         
-        if await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').count() == 1:
-            keywords = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').inner_text()
-        elif await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').count() > 1:
-            keywords = page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').last.inner_text()
-        else:
-             keywords = ''
+            if await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').count() == 1:
+                keywords = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').inner_text()
+            elif await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').count() > 1:
+                keywords = await page.locator('xpath=//*[@id="__next"]/div/div[2]/div[1]/div/div[2]/div[2]/div/div/div[2]/div[2]/div').last.inner_text()
+            else:
+                 keywords = ''
 
         
-        novel_data = {
-            'url': url,
-            'img': img,
-            'title': title,
-            'author': author,
-            'rating': rating,
-            'genre': genre,
-            'serial': serial,
-            'publisher': publisher,
-            'summary': summary,
-            'page_count': page_count,
-            'page_unit': page_unit,
-            'age': age,
-            'platform': 'kakao',
-            'keywords': keywords,
-            'viewers': viewers
-        }
-        await asyncio.sleep(random.uniform(1, 2))
-        # time.sleep(100)
-        return novel_data
+            novel_data = {
+                'url': url,
+                'img': img,
+                'title': title,
+                'author': author,
+                'rating': rating,
+                'genre': genre,
+                'serial': serial,
+                'publisher': publisher,
+                'summary': summary,
+                'page_count': page_count,
+                'page_unit': page_unit,
+                'age': age,
+                'platform': 'kakao',
+                'keywords': keywords,
+                'viewers': viewers
+            }
+            return novel_data
         
     except Exception as e:
         print(f"[ERROR] {url}")
         print(e)
-    finally:
-        if browser:
-            try:
-                await browser.close()
-            except:
-                pass
+
+# GraphQL 상세 정보에서 가져올 필드
+SERIES_DETAIL_FIELDS = """
+    content {
+      seriesId
+      title
+      thumbnail
+      category
+      subcategory
+      ageGrade
+      onIssue
+      authors
+      description
+      serviceProperty {
+        viewCount
+        ratingCount
+        ratingSum
+      }
+    }
+"""
+
+def get_series_id(scheme):
+    """kakaopage://open/content?series_id=123 → '123'"""
+    match = re.search(r'series_id=(\d+)', scheme or '')
+    return match.group(1) if match else None
+
+def build_detail_query(series_ids):
+    """시리즈 여러 개를 별칭(alias)으로 묶은 GraphQL 쿼리와 변수"""
+    params = ', '.join(f'$s{i}: Long!' for i in range(len(series_ids)))
+    parts = []
+    for i in range(len(series_ids)):
+        parts.append(f'o{i}: contentHomeOverview(seriesId: $s{i}) {{ {SERIES_DETAIL_FIELDS} }}')
+        parts.append(f'p{i}: contentHomeProductList(seriesId: $s{i}) {{ totalCount }}')
+    query = f'query seriesDetails({params}) {{ {" ".join(parts)} }}'
+    variables = {f's{i}': int(series_id) for i, series_id in enumerate(series_ids)}
+    return query, variables
+
+def parse_series_detail(url, overview, product_list):
+    """GraphQL 응답을 crawl_data와 같은 형태로 변환. 필수 값이 없으면 None"""
+    content = (overview or {}).get('content')
+    if not content or not product_list:
+        return None
+
+    service = content.get('serviceProperty') or {}
+    rating_count = service.get('ratingCount') or 0
+    rating = f"{service.get('ratingSum', 0) / rating_count:.1f}" if rating_count else None
+    title = content.get('title')
+    author = content.get('authors')
+
+    novel_data = {
+        'url': url,
+        'img': content.get('thumbnail'),
+        'title': title,
+        'author': author,
+        'rating': rating,
+        'genre': content.get('subcategory'),
+        'serial': '완결' if content.get('onIssue') == 'End' else '연재중',
+        'publisher': author,
+        'summary': content.get('description'),
+        'page_count': str(product_list.get('totalCount', '')),
+        'page_unit': '권' if title and '단행본' in title else '화',
+        'age': '19' if content.get('ageGrade') == 'Nineteen' else '전체',
+        'platform': 'kakao',
+        'keywords': '',
+        'viewers': str(service.get('viewCount', ''))
+    }
+    if not all([title, author, novel_data['summary'], novel_data['page_count']]):
+        return None
+    return novel_data
+
+async def get_details_batch(fetcher, batch, headers):
+    """(series_id, url) 묶음을 GraphQL 한 번으로 가져와 {url: novel_data} 반환"""
+    query, variables = build_detail_query([series_id for series_id, _ in batch])
+    try:
+        response = await fetcher.post(GRAPHQL_URL, headers=headers, json={'query': query, 'variables': variables})
+        if response.status_code in (401, 403):
+            raise SessionExpired(f'GraphQL 응답 {response.status_code}')
+        response.raise_for_status()
+        data = response.json().get('data') or {}
+    except SessionExpired:
+        raise
+    except Exception as e:
+        print(f"GraphQL 상세 요청 실패 ({len(batch)}개): {e}")
+        return {}
+
+    results = {}
+    for i, (_, url) in enumerate(batch):
+        novel_data = parse_series_detail(url, data.get(f'o{i}'), data.get(f'p{i}'))
+        if novel_data:
+            results[url] = novel_data
+    return results
+
+async def crawl_details_graphql(series, session_info, batch_size=10, concurrency=4, journal=None):
+    """series: [(series_id, url)]. GraphQL로 가져온 {url: novel_data} 반환 (실패한 작품은 빠짐)
+
+    session_info: get_session_info() 결과 (쿠키가 만료됐으면 SessionExpired).
+    journal을 넘기면 배치가 끝날 때마다 결과를 저널에 기록한다.
+    SessionExpired가 나면 남은 배치를 취소하고, 끝난 배치의 결과와 끝나지 않은 작품을 예외에 담아 올린다.
+    """
+    cookies, user_agent = session_info
+    headers = get_graphql_headers(user_agent)
+
+    results = {}
+    finished = set()
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter()) as fetcher:
+        session = fetcher.session_for(GRAPHQL_URL)
+        for cookie in cookies:
+            session.cookies.set(cookie['name'], cookie['value'])
+
+        async def fetch_batch(fetcher, batch):
+            batch_results = await get_details_batch(fetcher, batch, headers)
+            results.update(batch_results)
+            if journal is not None:
+                journal.extend(batch_results.values())
+            finished.update(url for _, url in batch)
+            return batch_results
+
+        try:
+            await fetcher.map(fetch_batch, split_data(series, batch_size), desc="GraphQL 상세")
+        except SessionExpired as e:
+            e.results = results
+            e.remaining = [item for item in series if item[1] not in finished]
+            raise
+    return results
 
 async def save_data(data):
     df = pd.DataFrame(data)
     df.to_csv('data/kakao_novel_data.csv', encoding='utf-8', index=False)
     print('데이터 저장')
 
-async def main():
-    if os.path.exists('data/kakao_novels.json'):
-        with open('data/kakao_novels.json', 'r') as f:
-            datas = json.load(f)
+KAKAO_NOVELS_PATH = 'data/kakao_novels.json'
+
+async def collect_listing(method='requests', session_info=None, sections=None):
+    """작품 목록 수집 (method: 'requests' 또는 'playwright'). 이미 받아 둔 목록이 있으면 그대로 사용
+
+    sections: requests 방식에서 훑을 섹션 목록 (None이면 DEFAULT_SECTIONS)
+    """
+    if os.path.exists(KAKAO_NOVELS_PATH):
+        with open(KAKAO_NOVELS_PATH, 'r') as f:
+            return json.load(f)
+
+    print("=== 카카오페이지 소설 크롤링 (스크롤 없이) ===")
+    print(f"크롤링 방법: {method}")
+
+    if method == 'requests':
+        novels = await crawl_novels_with_requests(sections=sections, session_info=session_info)
     else:
-        print("=== 카카오페이지 소설 크롤링 (스크롤 없이) ===")
-        print()
-        
-        method = input("크롤링 방법을 선택하세요 (1: requests, 2: playwright): ")
-        
-        if method == "1":
-            novels = crawl_novels_with_requests()
-        else:
-            novels = crawl_novels_with_playwright()
-        
-        print(f"\n=== 수집 완료 ===")
-        print(f"총 {len(novels)}개의 소설 정보를 수집했습니다.")
-        
-        if novels:
-            # 결과 샘플 출력
-            print("\n=== 수집된 데이터 샘플 ===")
-            for i, novel in enumerate(novels[:5]):
-                print(f"{i+1}. {novel.get('title', 'N/A')}")
-                if novel.get('subtitleList'):
-                    print(f"   작가: {', '.join(novel['subtitleList'])}")
-                print(f"   ID: {novel.get('id', 'N/A')}")
-                print()
-            
-            # 파일로 저장
-            save_novels_to_file(novels)
-            
-            # 통계 출력
-            print("=== 통계 ===")
-            print(f"PosterViewItem: {len([n for n in novels if n.get('type') == 'PosterViewItem'])}개")
-            print(f"CardViewItem: {len([n for n in novels if n.get('type') == 'CardViewItem'])}개")
-            
-            # 랭킹이 있는 작품들
-            ranked_novels = [n for n in novels if n.get('rank')]
-            if ranked_novels:
-                print(f"랭킹 정보가 있는 작품: {len(ranked_novels)}개")
-        datas = novels.copy()
-
-
-    ua = UserAgent(platforms='desktop')
-    not_nineteen_links = []
-    nineteen_links = []
+        novels = await asyncio.to_thread(crawl_novels_with_playwright)
+
+    print(f"\n=== 수집 완료 ===")
+    print(f"총 {len(novels)}개의 소설 정보를 수집했습니다.")
+
+    if novels:
+        # 결과 샘플 출력
+        print("\n=== 수집된 데이터 샘플 ===")
+        for i, novel in enumerate(novels[:5]):
+            print(f"{i+1}. {novel.get('title', 'N/A')}")
+            if novel.get('subtitleList'):
+                print(f"   작가: {', '.join(novel['subtitleList'])}")
+            print(f"   ID: {novel.get('id', 'N/A')}")
+            print()
+
+        # 파일로 저장
+        save_novels_to_file(novels)
+
+        # 통계 출력
+        print("=== 통계 ===")
+        print(f"PosterViewItem: {len([n for n in novels if n.get('type') == 'PosterViewItem'])}개")
+        print(f"CardViewItem: {len([n for n in novels if n.get('type') == 'CardViewItem'])}개")
+
+        # 랭킹이 있는 작품들
+        ranked_novels = [n for n in novels if n.get('rank')]
+        if ranked_novels:
+            print(f"랭킹 정보가 있는 작품: {len(ranked_novels)}개")
+    return novels
+
+def series_links(datas):
+    """목록 항목을 작업 목록에 넣을 [(상세 페이지 URL, {'series_id', 'age'})]로 변환"""
+    items = []
     for data in datas:
-        # 19금 분리
-        if data['ageGrade'] != 'Nineteen':
-            link = data['scheme'].replace('kakaopage://open/', 'https://page.kakao.com/')
-            link = link.replace('?series_id=', '/')
-            link += '?tab_type=overview'
-            not_nineteen_links.append(link)
-        else:
-            nineteen_links.append(link)
+        link = data['scheme'].replace('kakaopage://open/', 'https://page.kakao.com/')
+        link = link.replace('?series_id=', '/')
+        link += '?tab_type=overview'
+        items.append((link, {
+            'series_id': get_series_id(data['scheme']),
+            'age': '19' if data.get('ageGrade') == 'Nineteen' else 'all',
+        }))
+    return items
+
+async def crawl_details_browser(pool, url_ages, journal=None):
+    """[(url, age)]를 브라우저 풀로 수집해서 결과 목록 반환 (GraphQL로 못 가져온 작품용)
+
+    pool은 호출하는 쪽(KakaoPlugin.run)이 실행 동안 한 번만 띄워서 배치마다 넘긴다.
+    """
+    limiter = shared_limiter()
+
+    async def crawl_and_record(url, age):
+        novel_data = await crawl_data(pool, url, limiter, age=age)
+        if novel_data and journal is not None:
+            journal.append(novel_data)
+        return novel_data
 
     # 전체 이용가 크롤링
-    not_nineteen_links = split_data(not_nineteen_links, 5)
-    all_results = []
-    async with async_playwright() as playwright:
-        # 링크 수집 진행상황 표시
-        for url_list in tqdm(not_nineteen_links, desc="📄 페이지별 링크 수집", unit="배치"):
-            tasks = [crawl_data(playwright, url, ua.random, age='all') for url in url_list]
-            
-            # tqdm_asyncio로 각 배치 내 태스크 진행상황 표시
-            batch_results = await tqdm_asyncio.gather(
-                *tasks, 
-                desc=f"URL 처리 ({len(url_list)}개)", 
-                unit="페이지",
-                # return_exceptions=True
-            )
-            all_results.append(batch_results)
+    tasks = [crawl_and_record(url, age='all') for url, age in url_ages if age == 'all']
+    results = await tqdm_asyncio.gather(*tasks, desc="전체 이용가 작품", unit="페이지")
 
     # 19금 작품 크롤링
-    nineteen_links = split_data(nineteen_links, 5)
-    async with async_playwright() as playwright:
-        # 링크 수집 진행상황 표시
-        for url_list in tqdm(nineteen_links, desc="📄 페이지별 링크 수집", unit="배치"):
-            tasks = [crawl_data(playwright, url, ua.random, age='19') for url in url_list]
-            
-            # tqdm_asyncio로 각 배치 내 태스크 진행상황 표시
-            batch_results = await tqdm_asyncio.gather(
-                *tasks, 
-                desc=f"URL 처리 ({len(url_list)}개)", 
-                unit="페이지",
-                # return_exceptions=True
+    tasks = [crawl_and_record(url, age='19') for url, age in url_ages if age == '19']
+    results += await tqdm_asyncio.gather(*tasks, desc="19금 작품", unit="페이지")
+    return [result for result in results if result]
+
+class KakaoPlugin(PlatformPlugin):
+    """카카오페이지: GraphQL로 목록과 상세 정보를 일괄 수집하고, 못 가져온 작품만 브라우저로
+
+    method: 목록 수집 방법 ('requests' 또는 'playwright')
+    sections: requests 방식에서 훑을 섹션 ('0:update,86:update:complete' 형식, None이면 DEFAULT_SECTIONS)
+    """
+
+    name = 'kakao'
+    queues = ('kakao',)
+    csv_path = 'data/kakao_novel_data.csv'
+
+    def __init__(self, sections=None, **kwargs):
+        super().__init__(**kwargs)
+        self.sections = parse_sections(sections) if sections else None
+        self._session_info = None
+        self._playwright = None
+        self._pool = None
+        self._policy = None
+
+    async def session_info(self, refresh=False):
+        """GraphQL용 쿠키와 User-Agent. 실행 동안 한 번만 브라우저로 받고, 만료됐을 때만 다시 받는다"""
+        if self._session_info is None or refresh:
+            print("세션 정보 가져오는 중...")
+            self._session_info = await asyncio.to_thread(get_session_info)
+        return self._session_info
+
+    async def browser_pool(self):
+        """브라우저 풀은 처음 필요할 때 띄워서 실행이 끝날 때까지 모든 배치가 같이 쓴다"""
+        if self._pool is None:
+            ua = UserAgent(platforms='desktop')
+            self._policy = RoutingPolicy('kakao')
+            self._playwright = await async_playwright().start()
+            # 브라우저 2개 × 컨텍스트 4개를 전체 실행 동안 재사용
+            self._pool = BrowserPool(
+                self._playwright,
+                browsers=2,
+                contexts_per_browser=4,
+                max_uses=50,
+                context_options=lambda: {'user_agent': ua.random},
+                on_context=self._policy.apply
             )
-            all_results.append(batch_results)
+            await self._pool.start()
+        return self._pool
 
-    all_results = list(chain.from_iterable(all_results))
+    async def close_browser_pool(self):
+        if self._pool is None:
+            return
+        print(f"브라우저 풀 상태: {self._pool.stats()}")
+        print(f"차단된 요청: {self._policy.stats()}")
+        try:
+            await self._pool.close()
+        finally:
+            await self._playwright.stop()
+            self._pool = self._playwright = None
 
-    await save_data(all_results)
+    async def run(self):
+        try:
+            await super().run()
+        finally:
+            await self.close_browser_pool()
 
+    async def listing(self, frontier, seen):
+        method = self.options.get('method', 'requests')
+        session_info = await self.session_info() if method == 'requests' else None
+        datas = await collect_listing(method, session_info, self.sections)
+        # 이미 저널에 있는 작품은 건너뛴다 (중단 후 재실행)
+        items = seen.filter_new(series_links(datas), key=lambda item: item[0])
+        print(f"이미 수집한 작품: {len(seen)}개 / 남은 작품: {len(items)}개")
+        frontier.add('kakao', items)
+        return items
 
+    async def detail(self, queue, batch, journal):
+        # 1. GraphQL로 상세 정보 일괄 수집 (쿠키가 만료됐으면 한 번만 새로 받아서 다시 시도)
+        series = [(meta['series_id'], url) for url, meta in batch if meta['series_id']]
+        try:
+            graphql_results = await crawl_details_graphql(
+                series, await self.session_info(), concurrency=self.concurrency, journal=journal
+            )
+        except SessionExpired as e:
+            # 이미 끝난 배치는 저널에 있으므로 끝나지 않은 작품만 다시 요청
+            print(f"세션 만료 ({e}), 세션 정보를 다시 받아 남은 {len(e.remaining)}개만 다시 시도합니다")
+            graphql_results = e.results
+            graphql_results.update(await crawl_details_graphql(
+                e.remaining, await self.session_info(refresh=True), concurrency=self.concurrency, journal=journal
+            ))
+        print(f"GraphQL 수집: {len(graphql_results)}개 / 전체 {len(batch)}개")
+
+        # 2. GraphQL로 못 가져온 작품만 브라우저로 수집
+        remaining = [(url, meta['age']) for url, meta in batch if url not in graphql_results]
+        browser_results = await crawl_details_browser(await self.browser_pool(), remaining, journal) if remaining else []
+        recovered = {result['url'] for result in browser_results}
+        failed = [url for url, _ in remaining if url not in recovered]
+        return list(graphql_results.values()) + browser_results, failed
+
+    def export(self, journal):
+        dataset = super().export(journal)
+        pd.DataFrame(dataset).to_csv(self.csv_path, encoding='utf-8', index=False)
+        print('데이터 저장')
+        return dataset
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='카카오페이지 소설 크롤러')
+    parser.add_argument('--method', choices=['requests', 'playwright'], default='requests', help='목록 수집 방법')
+    parser.add_argument('--worker', action='store_true', help='작업 목록의 URL만 수집 (추가 작업자 프로세스용)')
+    parser.add_argument('--sections', default=None,
+                        help="목록을 훑을 섹션 (예: '0:update,86:update:complete', 기본값은 전체 장르 업데이트순)")
+    args = parser.parse_args()
+
+    asyncio.run(KakaoPlugin(method=args.method, worker=args.worker, sections=args.sections).run())
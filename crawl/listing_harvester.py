@@ -0,0 +1,118 @@
+import asyncio
+
+from tqdm import tqdm
+
+
+def http_source(fetcher, url_template, parse):
+    """JS가 필요 없는 목록 페이지: fetcher로 받아서 parse(content)로 링크 추출"""
+    async def fetch_links(number):
+        url = url_template.format(page=number)
+        try:
+            response = await fetcher.get(url)
+            response.raise_for_status()
+            return parse(response.content)
+        except Exception as e:
+            print(f"링크 수집 에러 {url}: {e}")
+            return None
+    return fetch_links
+
+
+def browser_source(pool, url_template, get_links, limiter):
+    """JS가 필요한 목록 페이지: BrowserPool에서 페이지를 빌려 get_links(page, url, limiter) 실행"""
+    async def fetch_links(number):
+        url = url_template.format(page=number)
+        try:
+            async with pool.page() as page:
+                return await get_links(page, url, limiter)
+        except Exception as e:
+            print(f"링크 수집 에러 {url}: {e}")
+            return None
+    return fetch_links
+
+
+class ListingHarvester:
+    """목록 페이지를 concurrency개씩 동시에 돌면서 작품 링크를 작업 목록(Frontier)에 넣는 수집기
+
+    목록은 최신순이라고 가정하고, 새 링크가 하나도 없는 페이지가 stop_after_known번 연달아 나오면
+    (이미 수집했거나 이미 작업 목록에 있는 링크뿐이면) 거기서 멈춘다. 링크가 없는 페이지가 나오거나
+    max_pages에 닿아도 멈춘다. 처음 실행할 때는 아는 링크가 없으므로 끝까지 돈다.
+    받지 못한 페이지(차단, 서버 오류, 만료된 쿠키, 바뀐 페이지 구조 등)가 max_failed_pages번 연달아 나오면
+    끝을 알 수 없으므로 이유를 출력하고 멈춘다.
+
+    사용 예:
+        harvester = ListingHarvester(http_source(fetcher, url_template, parse), frontier, 'novelpia', seen)
+        new_links = await harvester.run()
+    """
+
+    def __init__(self, fetch_links, frontier, queue, seen=None, concurrency=4, stop_after_known=2,
+                 max_pages=None, max_failed_pages=3):
+        # fetch_links(page_number) -> 링크 목록 (실패하면 None)
+        self.fetch_links = fetch_links
+        self.frontier = frontier
+        self.queue = queue
+        self.seen = seen
+        self.concurrency = concurrency
+        self.stop_after_known = stop_after_known
+        self.max_pages = max_pages
+        self.max_failed_pages = max_failed_pages
+
+        self.failed_pages = []
+        self.pages_visited = 0
+
+    def _record(self, links):
+        """새 링크만 작업 목록에 추가하고 새로 추가된 링크 반환"""
+        if self.seen is not None:
+            links = self.seen.filter_new(links)
+        known = self.frontier.known(links)
+        links = [link for link in dict.fromkeys(links) if link not in known]
+        if links:
+            self.frontier.add(self.queue, links)
+        return links
+
+    async def run(self, start=1):
+        new_links = []
+        number = start
+        known_streak = 0
+        failed_streak = 0
+
+        with tqdm(total=self.max_pages, desc=f"[{self.queue}] 목록 페이지", initial=start - 1) as pbar:
+            while self.max_pages is None or number <= self.max_pages:
+                last = number + self.concurrency - 1
+                if self.max_pages is not None:
+                    last = min(last, self.max_pages)
+                numbers = list(range(number, last + 1))
+                results = await asyncio.gather(*(self.fetch_links(n) for n in numbers))
+                number = last + 1
+                self.pages_visited += len(numbers)
+                pbar.update(len(numbers))
+
+                # 페이지 순서대로 판단해야 '연달아' 조건이 맞다
+                stop = False
+                for n, links in zip(numbers, results):
+                    if links is None:
+                        self.failed_pages.append(n)
+                        failed_streak += 1
+                        if failed_streak >= self.max_failed_pages:
+                            print(f"\n[{self.queue}] 목록 페이지를 {failed_streak}번 연달아 받지 못해 중단 "
+                                  f"(마지막 실패 페이지 {n})")
+                            stop = True
+                            break
+                        continue
+                    failed_streak = 0
+                    if not links:
+                        stop = True
+                        break
+                    added = self._record(links)
+                    new_links.extend(added)
+                    known_streak = 0 if added else known_streak + 1
+                    if known_streak >= self.stop_after_known:
+                        stop = True
+                        break
+
+                pbar.set_postfix_str(f"새 링크 {len(new_links)}개")
+                if stop:
+                    break
+
+        if self.failed_pages:
+            print(f"[{self.queue}] 실패한 목록 페이지: {self.failed_pages}")
+        return new_links
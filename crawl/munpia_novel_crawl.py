@@ -1,13 +1,18 @@
 import asyncio
 from playwright.async_api import async_playwright
 import pandas as pd
-import random
 import os
 from fake_useragent import UserAgent
 from tqdm import tqdm
 import pickle
 from tqdm.asyncio import tqdm_asyncio
-from fake_useragent import UserAgent
+from rate_limiter import shared_limiter
+from resource_policy import RoutingPolicy, wait_for_fields
+import re
+from lxml import html
+from fetcher import AsyncFetcher
+from listing_harvester import ListingHarvester, http_source
+from plugin import PlatformPlugin
 
 # 데이터 나누기
 def split_data(data, split_num):
@@ -66,11 +71,11 @@ async def get_last_page(page, url):
         return 1
 
 # 링크 가져오기
-async def get_links(page, url):
+async def get_links(page, url, limiter):
     """단일 페이지에서 링크 수집"""
     try:
-        await page.goto(url)
-        # await page.wait_for_load_state('networkidle')
+        await limiter.goto(page, url, wait_until='domcontentloaded')
+        await wait_for_fields(page, [['/html/body/div[8]/div[3]/div[6]/div/table/tbody/tr[1]/td[1]']])
 
         links = []
         elements = await page.locator('xpath=/html/body/div[8]/div[3]/div[6]/div/table/tbody/tr[1]/td[1]').all()
@@ -89,13 +94,34 @@ async def get_links(page, url):
                     title = await element.inner_text()
                     # print(f"제목: {title}, URL: {full_url}")
         
-        await asyncio.sleep(random.uniform(4, 15))
         return links
         
     except Exception as e:
         print(f"링크 수집 에러 {url}: {e}")
         return []
 
+LISTING_URL = 'https://novel.munpia.com/page/hd.platinum/group/pl.serial/view/serial/page/{page}'
+NOVEL_LINK = re.compile(r'^(?:https?:)?//novel\.munpia\.com/(\d+)/?$')
+
+# 목록 페이지 HTML에서 작품 링크 추출
+def parse_listing_links(content):
+    tree = html.fromstring(content)
+    links = []
+    for href in tree.xpath('//*[@id="NOVELOUS-CONTENTS"]//a/@href'):
+        match = NOVEL_LINK.match(href.strip())
+        if match:
+            links.append(f'https://novel.munpia.com/{match.group(1)}')
+    return list(dict.fromkeys(links))
+
+async def harvest_links(frontier, max_pages=None, concurrency=4):
+    """목록 페이지를 HTTP로 동시에 받아 새 작품 링크를 작업 목록에 추가. 새로 찾은 링크 반환"""
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter()) as fetcher:
+        harvester = ListingHarvester(
+            http_source(fetcher, LISTING_URL, parse_listing_links),
+            frontier, 'munpia', concurrency=concurrency, max_pages=max_pages
+        )
+        return await harvester.run()
+
 async def save_data(results):
     """결과 저장 함수"""
     if not results:
@@ -123,17 +149,9 @@ async def extract_element(page, xpaths, type='text'):
             return data
 
 
-async def main():
-    print("🚀 노벨피아 소설 크롤링 시작!")
-    
-    # User Agent 설정
-    ua = UserAgent()
-    user_agent = ua.random
-    # 데이터 디렉토리 생성
-    os.makedirs('data', exist_ok=True)
-    
+async def find_last_page():
+    """브라우저로 목록의 마지막 페이지 번호 확인 (처음 실행할 때만 필요)"""
     async with async_playwright() as playwright:
-        # 단일 브라우저 및 페이지 생성
         browser = await playwright.chromium.launch(
             headless=True,
             args=[
@@ -148,64 +166,57 @@ async def main():
                 '--disable-gpu'
             ]
         )
-        
-        context = await browser.new_context(
-            user_agent=user_agent,
-            is_mobile=False,
-            has_touch=False,
-            viewport={'width': 1920, 'height': 1080}
-        )
-        
-        page = await context.new_page()
-
         try:
-
-            # 링크 데이터 확인 또는 수집
-            if os.path.exists('data/munpia_novel_page_link_data.data'):
-                print("📂 기존 링크 데이터 로드 중...")
-                with open('data/munpia_novel_page_link_data.data', 'rb') as f:
-                    all_links = pickle.load(f)
-            else:
-                print("🔍 새로운 링크 데이터 수집 중...")
-                
-                # 최대 페이지 수 가져오기
-                last_page_num = await get_last_page(page, 'https://novel.munpia.com/page/hd.platinum/group/pl.serial/view/serial')
-                print(f"총 페이지 수: {last_page_num}")
-                
-                # # URL 생성 (테스트용으로 처음 2페이지만)
-                # urls = [f"https://novelpia.com/plus/all/date/{i}/?main_genre=&is_please_write=" for i in range(1, last_page_num)]  # 테스트용
-                
-                # # 각 페이지에서 순차적으로 링크 수집
-                # all_links = []
-                # for url in tqdm(urls, desc="📄 페이지별 링크 수집"):
-                #     links = await get_links(page, url)
-                #     all_links.extend(links)
-                #     print(f"수집된 링크 수: {len(links)}")
-                
-                # # 링크 데이터 저장
-                # with open('data/novelpia_novel_page_link_data.data', 'wb') as f:
-                #     pickle.dump(all_links, f)
-                # print(f"📁 총 {len(all_links)}개 링크 저장 완료")
-
-        except Exception as e:
-            print(f"❌ 메인 실행 중 에러: {e}")
-            import traceback
-            traceback.print_exc()
-        
+            context = await browser.new_context(
+                user_agent=UserAgent().random,
+                is_mobile=False,
+                has_touch=False,
+                viewport={'width': 1920, 'height': 1080}
+            )
+            await RoutingPolicy('munpia').apply(context)
+            page = await context.new_page()
+            return await get_last_page(page, 'https://novel.munpia.com/page/hd.platinum/group/pl.serial/view/serial')
         finally:
             await browser.close()
 
-            # 데이터 저장
-            # if all_results:
-            #     print(f"\n💾 데이터 저장 중... ({len(all_results)}개)")
-            #     await save_data(all_results)
-            # else:
-            #     print("❌ 저장할 데이터가 없습니다.")
+class MunpiaPlugin(PlatformPlugin):
+    """문피아: 목록 페이지를 HTTP로 받아 작품 링크를 작업 목록('munpia')에 모은다 (상세 수집은 아직 없음)"""
+
+    name = 'munpia'
+    link_path = 'data/munpia_novel_page_link_data.data'
+
+    async def listing(self, frontier, seen):
+        # 링크 데이터 확인 또는 수집
+        if os.path.exists(self.link_path):
+            print("📂 기존 링크 데이터 로드 중...")
+            with open(self.link_path, 'rb') as f:
+                all_links = pickle.load(f)
+            frontier.add('munpia', all_links)
+            # 아는 링크만 나오는 페이지에 닿으면 멈추므로 최대 페이지는 몰라도 됨
+            last_page_num = None
+        else:
+            all_links = []
+
+            # 최대 페이지 수 가져오기
+            last_page_num = await find_last_page()
+            print(f"총 페이지 수: {last_page_num}")
+
+        print("🔍 새로운 링크 데이터 수집 중...")
+        new_links = await harvest_links(frontier, max_pages=last_page_num, concurrency=self.listing_concurrency)
+        all_links.extend(new_links)
+        print(f"작업 상태: {frontier.counts('munpia')}")
+
+        # 링크 데이터 저장
+        with open(self.link_path, 'wb') as f:
+            pickle.dump(all_links, f)
+        print(f"📁 새 링크 {len(new_links)}개 포함 총 {len(all_links)}개 링크 저장 완료")
+        return new_links
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        print("🚀 문피아 소설 크롤링 시작!")
+        asyncio.run(MunpiaPlugin().run())
         print("\n🎊 모든 작업이 완료되었습니다!")
     except KeyboardInterrupt:
         print("\n⏹️ 사용자에 의해 중단되었습니다.")
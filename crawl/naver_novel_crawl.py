@@ -1,49 +1,30 @@
-import requests
 from lxml import html
 import pandas as pd
-import random
 from itertools import chain
 import os
 from fake_useragent import UserAgent
 from tqdm import tqdm
 import pickle
-import time
-import parmap
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 import asyncio
 from playwright.async_api import async_playwright
-import math
 import json
-
-# 세션 설정 (재사용 및 재시도 설정)
-def create_session():
-    session = requests.Session()
-    
-    # 재시도 설정
-    retry_strategy = Retry(
-        total=3,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"],  # method_whitelist -> allowed_methods
-        backoff_factor=1
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    return session
-
-# 헤더 생성
-def get_headers():
-    ua = UserAgent(platforms='desktop')
-    return {
-        'User-Agent': ua.random,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
+import argparse
+from functools import partial
+from fetcher import AsyncFetcher, create_session, get_headers
+from rate_limiter import shared_limiter
+from response_cache import ResponseCache
+from revalidation import ValidatorStore
+from extraction import Extractor, Field
+from resource_policy import RoutingPolicy, wait_for_fields
+from work_queue import WorkQueue
+from session_broker import SessionBroker, wait_for_login, is_interactive
+from journal import open_journal, journaled
+from recrawl import RecrawlScheduler
+from pipeline import CrawlPipeline
+from plugin import PlatformPlugin
+
+# 로그인하면 생기는 쿠키 (로그인 완료 판단과 쿠키 만료 확인에 사용)
+LOGIN_COOKIES = ['NID_AUT', 'NID_SES']
 
 # Playwright 관련 함수들
 async def create_page(playwright, user_agent, headless=True):
@@ -94,8 +75,8 @@ async def login_playwright(page):
     await page.fill('xpath=//*[@id="pw"]', pw)
 
     await page.locator('xpath=//*[@id="log.login"]').click()
-    print("브라우저에서 로그인을 완료한 후 Enter를 눌러주세요...")
-    input()  # 사용자가 수동으로 로그인 완료할 때까지 대기
+    # 로그인 쿠키가 생길 때까지 대기 (캡차 등은 그동안 브라우저에서 직접 처리, 먼저 로그인한 브라우저는 크롤링을 계속함)
+    await wait_for_login(page, required=LOGIN_COOKIES)
 
 async def extract_xpath_playwright(page, xpaths, attr_type='text'):
     """Playwright에서 XPath 추출"""
@@ -118,71 +99,35 @@ async def extract_xpath_playwright(page, xpaths, attr_type='text'):
             continue
     return ''
 
-async def get_data_playwright(page, url, age=19):
+async def get_data_playwright(page, url, limiter, age=19, cache=None):
     """Playwright로 19금 소설 데이터 추출"""
     try:
         max_retries = 3
         retry_count = 0
         
         while retry_count < max_retries:
-            response = await page.goto(url, timeout=30000)
+            response = await limiter.goto(page, url, timeout=30000)
             
             if response.status != 200:
                 retry_count += 1
                 if retry_count < max_retries:
                     print(f"HTTP {response.status} 오류. 재시도 {retry_count}/{max_retries}")
-                    await asyncio.sleep(random.uniform(1, 3))
                     continue
                 else:
                     raise Exception(f'HTTP {response.status} 오류가 {max_retries}번 반복됨')
             break
 
-        # 페이지 로딩 대기
-        await asyncio.sleep(1)
-
-        # 데이터 추출 (Playwright 방식)
-        img_xpaths = [
-            '/html/body/div[1]/div[2]/div[1]/span/img',
-            '//*[@id="container"]/div[1]/a/img',
-            '//*[@id="container"]/div[1]/span/img',
-            '//*[@id="ct"]/div[1]/div[1]/div[1]/div[1]/a/img'
-        ]
-        img = await extract_xpath_playwright(page, img_xpaths, 'src')
-
-        title_xpaths = [
-            '//*[@id="content"]/div[1]/h2',
-            '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/strong',
-            '//*[@id="content"]/div[2]',
-            '//*[@id="content"]/div[2]/h2'
-        ]
-        title = await extract_xpath_playwright(page, title_xpaths)
-
-        rating_xpaths = [
-            '//*[@id="content"]/div[1]/div[1]/em',
-            '//*[@id="content"]/div[2]/div[1]',
-            '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[1]/ul/li/span/span'
-        ]
-        rating = await extract_xpath_playwright(page, rating_xpaths)
-
-        genre_xpaths = [
-            '//*[@id="content"]/ul[1]/li/ul/li[2]/span/a',
-            '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[2]/ul/li[1]/dl/dd[2]'
-        ]
-        genre = await extract_xpath_playwright(page, genre_xpaths)
-
-        serial_xpaths = [
-            '//*[@id="content"]/ul[1]/li/ul/li[1]/span',
-            '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[2]/ul/li[1]/dl/dd[1]'
-        ]
-        serial = await extract_xpath_playwright(page, serial_xpaths)
-
-        publisher_xpaths = ['//*[@id="content"]/ul[1]/li/ul/li[3]']
-        author_xpaths = [
-            '//*[@id="content"]/ul[1]/li/ul/li[4]/a',
-            '//*[@id="content"]/ul[1]/li/ul/li[3]/a'
-        ]
-        publisher = await extract_xpath_playwright(page, publisher_xpaths)
-        author = await extract_xpath_playwright(page, author_xpaths)
+        # 페이지 로딩 대기 (추출할 필드가 나타날 때까지만)
+        await wait_for_fields(page, [NAVER_FIELDS['title'].selectors, NAVER_FIELDS['summary'].selectors])
+
+        # 데이터 추출 (Playwright 방식, 선택자는 NAVER_FIELDS 공유)
+        img = await extract_xpath_playwright(page, NAVER_FIELDS['img'].selectors, 'src')
+        title = await extract_xpath_playwright(page, NAVER_FIELDS['title'].selectors)
+        rating = await extract_xpath_playwright(page, NAVER_FIELDS['rating'].selectors)
+        genre = await extract_xpath_playwright(page, NAVER_FIELDS['genre'].selectors)
+        serial = await extract_xpath_playwright(page, NAVER_FIELDS['serial'].selectors)
+        publisher = await extract_xpath_playwright(page, NAVER_FIELDS['publisher'].selectors)
+        author = await extract_xpath_playwright(page, NAVER_FIELDS['author'].selectors)
 
         # 설명 - "더보기" 버튼 클릭 처리
         more_button = page.locator('xpath=//*[@id="content"]/div[2]/div[1]/span/a')
@@ -190,17 +135,13 @@ async def get_data_playwright(page, url, age=19):
             await more_button.click()
             await asyncio.sleep(0.5)
 
-        summary_xpaths = [
-            '//*[@id="content"]/div[2]/div[2]',
-            '//*[@id="content"]/div[2]/div'
-        ]
-        summary = await extract_xpath_playwright(page, summary_xpaths)
-
-        page_count_xpaths = ['//*[@id="content"]/h5/strong']
-        page_count = await extract_xpath_playwright(page, page_count_xpaths)
+        # 렌더링된 HTML을 캐시에 저장 (오프라인 재추출용)
+        if cache is not None:
+            cache.put(url, (await page.content()).encode('utf-8'))
 
-        page_unit_xpaths = ['//*[contains(@class, "end_total_episode")]']
-        page_unit = await extract_xpath_playwright(page, page_unit_xpaths)
+        summary = await extract_xpath_playwright(page, NAVER_FIELDS['summary'].selectors)
+        page_count = await extract_xpath_playwright(page, NAVER_FIELDS['page_count'].selectors)
+        page_unit = await extract_xpath_playwright(page, NAVER_FIELDS['page_unit'].selectors)
         
         try:
             if page_unit:
@@ -230,7 +171,6 @@ async def get_data_playwright(page, url, age=19):
             print(novel_data)
             raise Exception('데이터 누락 발생')
 
-        await asyncio.sleep(random.uniform(1, 2))
         return novel_data
 
     except Exception as e:
@@ -239,123 +179,69 @@ async def get_data_playwright(page, url, age=19):
     
 
 
-# async def get_19(nineteen_links):
-#     """19금 소설 크롤링 (Playwright 사용)"""
-#     ua = UserAgent(platforms='desktop')
-#     all_results = []
+async def get_19(nineteen_links, num_browsers=5, max_retries=2, journal=None):
+    """19금 소설 크롤링 (Playwright 사용)
 
-#     async with async_playwright() as playwright:
-#         page, browser = await create_page(playwright, ua.random, headless=False)
-#         if not page:
-#             print("Playwright 페이지 생성 실패")
-#             return []
-            
-#         await login_playwright(page)
-#         await asyncio.sleep(1)
-        
-#         with tqdm(nineteen_links, desc=f"현재 수집된 링크 수: {len(all_results)}", total=len(nineteen_links)) as pbar:
-#             for url in pbar:
-#                 novel_data = await get_data_playwright(page, url, age=19)
-#                 if novel_data:
-#                     all_results.append(novel_data)
-
-#                 # tqdm 설명 동적 업데이트
-#                 pbar.set_description(f"현재 수집된 링크 수: {len(all_results)}")
-#                 await asyncio.sleep(random.uniform(1, 2))
-                
-#         if browser:
-#             await browser.close()
-    
-#     return all_results
-
-async def get_19(nineteen_links):
-    """19금 소설 크롤링 (Playwright 사용)"""
+    로그인된 페이지들이 하나의 작업 큐에서 URL을 가져간다. 실패한 URL은 max_retries번까지
+    큐에 다시 들어가고, 브라우저는 로그인이 끝나는 대로 바로 크롤링에 합류한다.
+    """
     ua = UserAgent(platforms='desktop')
     browsers = []
-    pages = []
-    all_results = []
-    
+    limiter = shared_limiter()
+    cache = ResponseCache()
+    policy = RoutingPolicy('naver')
+
+    async def handle(page, url):
+        return await get_data_playwright(page, url, limiter, age=19, cache=cache)
+
     async with async_playwright() as playwright:
-        # 1단계: 5개 브라우저 생성 및 로그인
-        print("5개 브라우저 생성 및 로그인 중...")
-        for i in range(5):
-            print(f"브라우저 {i+1} 생성 중...")
-            
-            # 브라우저 생성
-            browser = await playwright.chromium.launch(headless=False)
-            
-            # 페이지 생성
-            page = await browser.new_page()
-            await page.set_extra_http_headers({
-                'User-Agent': ua.random
-            })
-            
-            # 로그인
-            await login_playwright(page)
-            print(f"브라우저 {i+1} 로그인 완료")
-            
-            browsers.append(browser)
-            pages.append(page)
-            
-            await asyncio.sleep(1)
-        
-        print("모든 브라우저 준비 완료! 크롤링 시작...")
-        
-        # 2단계: URL을 5개 그룹으로 나누기
-        def split_urls(urls, num_parts):
-            chunk_size = math.ceil(len(urls) / num_parts)
-            chunks = []
-            for i in range(num_parts):
-                start = i * chunk_size
-                end = min((i + 1) * chunk_size, len(urls))
-                chunks.append(urls[start:end])
-            return chunks
-        
-        url_chunks = split_urls(nineteen_links, 5)
-        
-        # 3단계: 각 브라우저가 처리할 함수
-        async def process_chunk(page, urls, browser_id, pbar):
-            results = []
-            for url in urls:
-                try:
-                    novel_data = await get_data_playwright(page, url, age=19)
-                    if novel_data:
-                        results.append(novel_data)
-                    
-                    # tqdm 업데이트
-                    pbar.update(1)
-                    pbar.set_description(f"현재 수집된 링크 수: {len(all_results) + sum(len(r) for r in [results])}")
-                    
-                    await asyncio.sleep(random.uniform(1, 2))
-                except Exception as e:
-                    print(f"\n브라우저 {browser_id} 오류: {e}")
-                    pbar.update(1)
-            return results
-        
-        # 4단계: 5개 브라우저로 병렬 실행 (tqdm 적용)
-        tasks = []
-        
-        # tqdm 초기화
         with tqdm(total=len(nineteen_links), desc="현재 수집된 링크 수: 0") as pbar:
-            for i in range(5):
-                if i < len(url_chunks) and url_chunks[i]:  # 빈 청크가 아닌 경우
-                    task = process_chunk(pages[i], url_chunks[i], i+1, pbar)
-                    tasks.append(task)
-            
-            # 모든 작업을 병렬로 실행
-            results_lists = await asyncio.gather(*tasks)
-        
-        # 결과 합치기
-        for results in results_lists:
-            all_results.extend(results)
-        
-        print(f"크롤링 완료! 총 {len(all_results)}개 수집")
-        
-        # 5단계: 브라우저 닫기
+            def on_result(worker, url, novel_data, final):
+                if novel_data and journal is not None:
+                    journal.append(novel_data)
+                # 재시도로 다시 큐에 들어간 URL은 진행률에 넣지 않음
+                if final:
+                    pbar.update(1)
+                pbar.set_description(f"현재 수집된 링크 수: {len(queue.results)}")
+                pbar.set_postfix_str(f"대기 {queue.pending()} | {limiter.format_stats()}")
+
+            queue = WorkQueue(handle, max_retries=max_retries, on_result=on_result)
+            queue.put_many(nineteen_links)
+
+            # 브라우저 생성 및 로그인 - 로그인이 끝난 브라우저부터 워커로 추가
+            for i in range(num_browsers):
+                print(f"브라우저 {i+1} 생성 중...")
+                # 무인 실행이면 화면 없이 띄운다 (자동 입력으로 끝나는 로그인만 가능)
+                browser = await playwright.chromium.launch(headless=not is_interactive())
+                page = await browser.new_page()
+                await page.set_extra_http_headers({
+                    'User-Agent': ua.random
+                })
+
+                await login_playwright(page)
+                print(f"브라우저 {i+1} 로그인 완료")
+
+                # 로그인 이후에는 이미지/폰트/트래커 요청 차단
+                await policy.apply(page)
+
+                browsers.append(browser)
+                queue.add_worker(page, name=f'브라우저 {i+1}')
+
+                if queue.pending() == 0:
+                    break
+
+            all_results = await queue.join()
+
+        print(f"크롤링 완료! 총 {len(all_results)}개 수집, 실패 {len(queue.failed)}개")
+        for name, stat in queue.stats().items():
+            print(f"  {name}: 성공 {stat['done']} / 재시도 {stat['retried']} / 실패 {stat['failed']} ({stat['per_minute']}건/분)")
+        print(f"차단된 요청: {policy.stats()}")
+
         for i, browser in enumerate(browsers):
             await browser.close()
             print(f"브라우저 {i+1} 닫음")
-    
+
+    cache.close()
     return all_results
 
 
@@ -418,262 +304,210 @@ def split_data(data, split_num):
     else:
         raise TypeError(f"지원하지 않는 타입입니다: {type(data)}")
 
+# 목록 페이지에서 링크 파싱
+def parse_links(content):
+    tree = html.fromstring(content)
+    links = []
+
+    # h3 태그들 찾기
+    h3_elements = tree.xpath('//*[@id="content"]/div/ul/li/div/h3')
+
+    for h3_element in h3_elements:
+        # 제목 가져오기
+        page_title = h3_element.text_content().strip()
+
+        # a 태그 찾기 (h3 내부에서)
+        a_elements = h3_element.xpath('.//a[contains(@href, "/novel/detail")]')
+
+        if a_elements:
+            href = a_elements[0].get('href')
+            link = 'https://series.naver.com' + href
+
+            # 나이 제한 체크
+            age = 19 if '19금' in page_title else 0
+
+            links.append({
+                'url': link,
+                'age': age,
+            })
+
+    return links
+
 # 링크 가져오기
-def get_links(url):
-    session = create_session()
-    headers = get_headers()
-    
+async def get_links(fetcher, url):
     try:
-        response = session.get(url, headers=headers, timeout=30)
+        response = await fetcher.get(url)
         response.raise_for_status()
-        
-        tree = html.fromstring(response.content)
-        links = []
-        
-        # h3 태그들 찾기
-        h3_elements = tree.xpath('//*[@id="content"]/div/ul/li/div/h3')
-        
-        for h3_element in h3_elements:
-            # 제목 가져오기
-            page_title = h3_element.text_content().strip()
-            
-            # a 태그 찾기 (h3 내부에서)
-            a_elements = h3_element.xpath('.//a[contains(@href, "/novel/detail")]')
-            
-            if a_elements:
-                href = a_elements[0].get('href')
-                link = 'https://series.naver.com' + href
-                
-                # 나이 제한 체크
-                age = 19 if '19금' in page_title else 0
-                
-                links.append({
-                    'url': link,
-                    'age': age,
-                })
-        
-        time.sleep(random.randint(1, 2))
-        return links
-        
+
+        return parse_links(response.content)
+
     except Exception as e:
         print(f"링크 수집 에러 {url}: {e}")
         return []
-    finally:
-        session.close()
 
-def get_last_page():
-    session = create_session()
-    headers = get_headers()
-    
+async def get_last_page(fetcher):
     try:
         url = 'https://series.naver.com/novel/categoryProductList.series?categoryTypeCode=all&page=100000'
-        response = session.get(url, headers=headers, timeout=30)
+        response = await fetcher.get(url)
         response.raise_for_status()
-        
+
         tree = html.fromstring(response.content)
         page_elements = tree.xpath('//*[@id="content"]/p/a/text()')
-        
+
         if page_elements:
             max_page_num = max(page_elements)
             return max_page_num
         return "1"
-        
+
     except Exception as e:
         print(f"최대 페이지 수집 에러: {e}")
         return "1"
-    finally:
-        session.close()
-
-# XPath 추출 함수
-def extract_xpath(tree, xpaths, attr=None):
-    for xpath in xpaths:
-        try:
-            elements = tree.xpath(xpath)
-            if elements:
-                if attr:
-                    data = elements[0].get(attr)
-                else:
-                    data = elements[0].text_content()
-                
-                if data and data.strip():
-                    if '_님로그아웃' in data:
-                        continue
-                    return data.strip()
-        except Exception as e:
-            continue
-    return ''
 
-# 이미지 추출
-def get_img(tree):
-    img_xpaths = [
+# 상세 페이지 추출 명세 (필드 → 순서대로 시도할 XPath)
+NAVER_FIELDS = {
+    'img': Field([
         '/html/body/div[1]/div[2]/div[1]/span/img',
         '//*[@id="container"]/div[1]/a/img',
         '//*[@id="container"]/div[1]/span/img',
         '//*[@id="ct"]/div[1]/div[1]/div[1]/div[1]/a/img'
-    ]
-    return extract_xpath(tree, img_xpaths, attr='src')
-
-# 제목 추출
-def get_title(tree):
-    title_xpaths = [
+    ], attr='src', reject=('_님로그아웃',)),
+    'title': Field([
         '//*[@id="content"]/div[1]/h2',
         '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/strong',
         '//*[@id="content"]/div[2]',
         '//*[@id="content"]/div[2]/h2'
-    ]
-    return extract_xpath(tree, title_xpaths)
-
-# 평점 추출
-def get_rating(tree):
-    rating_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'rating': Field([
         '//*[@id="content"]/div[1]/div[1]/em',
         '//*[@id="content"]/div[2]/div[1]',
         '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[1]/ul/li/span/span',
-    ]
-    return extract_xpath(tree, rating_xpaths)
-
-# 장르 추출
-def get_genre(tree):
-    genre_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'genre': Field([
         '//*[@id="content"]/ul[1]/li/ul/li[2]/span/a',
         '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[2]/ul/li[1]/dl/dd[2]'
-    ]
-    return extract_xpath(tree, genre_xpaths)
-
-# 연재 상태 추출
-def get_serial(tree):
-    serial_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'serial': Field([
         '//*[@id="content"]/ul[1]/li/ul/li[1]/span',
         '//*[@id="ct"]/div[1]/div[1]/div[1]/div[2]/div[2]/ul/li[1]/dl/dd[1]'
-    ]
-    return extract_xpath(tree, serial_xpaths)
-
-# 출판사 및 작가 추출
-def get_publisher_author(tree):
-    publisher_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'publisher': Field([
         '//*[@id="content"]/ul[1]/li/ul/li[3]'
-    ]
-    author_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'author': Field([
         '//*[@id="content"]/ul[1]/li/ul/li[4]/a',
         '//*[@id="content"]/ul[1]/li/ul/li[3]/a'
-    ]
-    publisher = extract_xpath(tree, publisher_xpaths)
-    author = extract_xpath(tree, author_xpaths)
-    return publisher, author
-
-# 설명 추출
-def get_summary(tree):
-    summary_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'summary': Field([
         '//*[@id="content"]/div[2]/div[2]',
         '//*[@id="content"]/div[2]/div'
-    ]
-    return extract_xpath(tree, summary_xpaths)
-
-# 화수 추출
-def get_page_count(tree):
-    page_count_xpaths = [
+    ], reject=('_님로그아웃',)),
+    'page_count': Field([
         '//*[@id="content"]/h5/strong'
-    ]
-    return extract_xpath(tree, page_count_xpaths)
-
-# 단위 추출
-def get_page_unit(tree):
-    page_unit_xpaths = [
+    ], reject=('_님로그아웃',)),
+    # "총 120화" → "화"
+    'page_unit': Field([
         '//*[contains(@class, "end_total_episode")]'
-    ]
-    page_unit = extract_xpath(tree, page_unit_xpaths)
-    try:
-        if page_unit:
-            page_unit = page_unit.strip()[-1]
-    except:
-        print(f"페이지 단위 추출 실패: {page_unit}")
-    return page_unit
-
-# 연령 추출
-def get_age(tree):
-    age_xpaths = [
-        '//*[@id="content"]/ul[1]/li/ul/li[5]'
-    ]
-    return extract_xpath(tree, age_xpaths)
+    ], reject=('_님로그아웃',), post=lambda text: text[-1]),
+}
+
+naver_extractor = Extractor(NAVER_FIELDS)
+naver_stream = naver_extractor.stream_consumer()
+
+def parse_novel_data(content, url, age):
+    """상세 페이지 HTML에서 소설 데이터 추출. 필수 데이터가 없으면 예외 발생"""
+    return build_novel_data(naver_extractor.extract(html.fromstring(content)), url, age)
+
+def build_novel_data(fields, url, age):
+    """추출된 필드로 소설 데이터 구성. 필수 데이터가 없으면 예외 발생"""
+    novel_data = {
+        'url': url,
+        'img': fields['img'],
+        'title': fields['title'],
+        'author': fields['author'],
+        'rating': fields['rating'],
+        'genre': fields['genre'],
+        'serial': fields['serial'],
+        'publisher': fields['publisher'],
+        'summary': fields['summary'],
+        'page_count': fields['page_count'],
+        'page_unit': fields['page_unit'],
+        'age': 19 if age == 19 else '전체',
+        'platform': 'naver'
+    }
+
+    # 필수 데이터 체크
+    required = ['title', 'rating', 'genre', 'serial', 'publisher', 'summary', 'page_count', 'page_unit']
+    if not all(fields[name] for name in required):
+        raise Exception('데이터 누락 발생')
+
+    return novel_data
 
 def get_data_with_session(url_age_tuple, session=None):
-    """세션을 사용한 단일 소설 데이터 추출 (19금용)"""
+    """세션을 사용한 단일 소설 데이터 추출 (동기 버전)"""
     url, age = url_age_tuple
-    
+
     if session is None:
         session = create_session()
         should_close = True
     else:
         should_close = False
-    
-    headers = get_headers()
-    
+
+    try:
+        response = session.get(url, headers=get_headers(), timeout=30)
+        response.raise_for_status()
+        return parse_novel_data(response.content, url, age)
+    except Exception as e:
+        return {}
+    finally:
+        if should_close:
+            session.close()
+
+# 19금 상세 페이지가 로그인/성인인증 페이지로 넘어갔는지 확인
+def is_logged_in(response):
+    return 'nid.naver.com' not in response.url and 'adultAuth' not in response.url
+
+
+async def get_data(fetcher, url_age_tuple, stream=False, broker=None):
+    """단일 소설 데이터 추출 (공유 fetcher 사용). 지난 수집 이후 바뀌지 않았으면 None
+
+    stream=True면 필요한 필드가 다 나오는 순간 본문 수신을 멈춘다.
+    broker(SessionBroker)를 넘기면 로그인이 풀렸을 때 다시 로그인하고 재시도한다 (19금 작품).
+    """
+    url, age = url_age_tuple
+
     max_retries = 3
     retry_count = 0
-    
+
     try:
         while retry_count < max_retries:
-            response = session.get(url, headers=headers, timeout=30)
-            
+            generation = broker.generation if broker is not None else None
+            response = await fetcher.get_if_changed(url, consume=naver_stream if stream else None)
+            if response is None:
+                return None
+            if broker is not None and not is_logged_in(response):
+                retry_count += 1
+                await broker.refresh(fetcher, generation)
+                continue
+
             if response.status_code != 200:
                 retry_count += 1
                 if retry_count < max_retries:
                     print(f"HTTP {response.status_code} 오류. 재시도 {retry_count}/{max_retries}")
-                    time.sleep(random.uniform(1, 3))
                     continue
                 else:
                     raise Exception(f'HTTP {response.status_code} 오류가 {max_retries}번 반복됨')
             break
-        
-        tree = html.fromstring(response.content)
-        
-        # 데이터 추출
-        img = get_img(tree)
-        title = get_title(tree)
-        rating = get_rating(tree)
-        genre = get_genre(tree)
-        serial = get_serial(tree)
-        publisher, author = get_publisher_author(tree)
-        summary = get_summary(tree)
-        page_count = get_page_count(tree)
-        page_unit = get_page_unit(tree)
-        
-        novel_data = {
-            'url': url,
-            'img': img,
-            'title': title,
-            'author': author,
-            'rating': rating,
-            'genre': genre,
-            'serial': serial,
-            'publisher': publisher,
-            'summary': summary,
-            'page_count': page_count,
-            'page_unit': page_unit,
-            'age': 19 if age == 19 else '전체',
-            'platform': 'naver'
-        }
-        
-        # 필수 데이터 체크
-        if not all([title, rating, genre, serial, publisher, summary, page_count, page_unit]):
-        #     print(f"데이터 누락: {url}")
-            # print(novel_data)
-            raise Exception('데이터 누락 발생')
-        
-        # 딜레이 추가 (서버 부하 방지)
-        time.sleep(random.uniform(0.5, 1.5))
+
+        if stream:
+            novel_data = build_novel_data(response.extracted, url, age)
+        else:
+            novel_data = parse_novel_data(response.content, url, age)
+        fetcher.remember(url, response)
         return novel_data
-        
+
     except Exception as e:
         # print(f"데이터 추출 에러 {url}: {e}")
         return {}
-    finally:
-        if should_close:
-            session.close()
-
-def get_data(url_age_tuple):
-    """단일 소설 데이터 추출 (전체 이용가용)"""
-    return get_data_with_session(url_age_tuple, session=None)
 
 def flatten(lst):
     """중첩 리스트 평탄화"""
@@ -695,134 +529,255 @@ def save_files(path, data):
     with open(path, 'wb') as f:
         pickle.dump(data, f)
 
-def main():
-    print("🚀 네이버 소설 크롤링 시작!")
-    
-    # 데이터 디렉토리 생성
-    os.makedirs('data', exist_ok=True)
-    
-    novel_data_path = 'data/naver_novel_data.data'
-    novel_page_path = 'data/naver_page_links.link'
-    
-    # URL 수집
-    if os.path.exists(novel_page_path):
-        all_urls = open_files(novel_page_path)
-        # print(f"기존 URL 데이터 로드: {len(all_urls)}개")
-    else:
-        print("URL 수집 시작...")
-        all_urls = []
-        
+async def collect_links(concurrency=4):
+    """목록 페이지 전체를 공유 fetcher로 수집"""
+    cache = ResponseCache()
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache) as fetcher:
         # 최대 페이지 수 가져오기
-        max_page_num = get_last_page()
+        max_page_num = await get_last_page(fetcher)
         print(f"최대 페이지 수: {max_page_num}")
-        
+
         # 모든 페이지 URL 생성
         page_urls = []
         for i in range(1, int(max_page_num.replace(',', '')) + 1):
             page_urls.append(f'https://series.naver.com/novel/categoryProductList.series?categoryTypeCode=all&page={i}')
-        
-        # parmap으로 병렬 처리하여 링크 수집
+
         print("페이지별 링크 수집 중...")
-        all_links = parmap.map(get_links, page_urls, pm_pbar=True, pm_processes=4)
-        
-        # 결과 평탄화
-        all_urls = flatten(all_links)
-        
-        # 저장
-        save_files(novel_page_path, all_urls)
-    
-    # all_urls = all_urls[:50]
-    print(f"총 수집된 URL: {len(all_urls)}개")
+        results = await fetcher.map(get_links, page_urls, desc="목록 페이지")
+    cache.close()
+    return results
+
+# 파이프라인 파싱 단계 (작업자 프로세스에서 실행)
+def parse_payload(payload):
+    url, age, content = payload
+    return parse_novel_data(content, url, age)
+
+async def collect_data_pipeline(url_age_tuples, concurrency=5, parse_processes=4, journal=None):
+    """수집(스레드)과 파싱(프로세스 풀)을 나눈 파이프라인으로 상세 페이지 수집. (결과, 실패한 URL) 반환"""
+    cache = ResponseCache()
+    validators = ValidatorStore()
+    results = []
+    # 파싱이 끝날 때까지 응답을 들고 있다가 성공한 것만 검증 정보로 기록
+    responses = {}
+
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache,
+                            validators=validators) as fetcher:
+        async def fetch(url_age_tuple):
+            url, age = url_age_tuple
+            response = await fetcher.get_if_changed(url)
+            if response is None:
+                return None
+            response.raise_for_status()
+            responses[url] = response
+            return url, age, response.content
+
+        def write(url_age_tuple, novel_data):
+            url = url_age_tuple[0]
+            results.append(novel_data)
+            if journal is not None:
+                journal.append(novel_data)
+            fetcher.remember(url, responses.pop(url))
+
+        # 파싱/저장에 실패한 URL의 응답은 바로 버린다
+        def discard(url_age_tuple):
+            responses.pop(url_age_tuple[0], None)
+
+        pipeline = CrawlPipeline(fetch, parse_payload, write, fetch_concurrency=concurrency,
+                                 parse_processes=parse_processes, on_failed=discard)
+        failed = await pipeline.run(url_age_tuples, desc="상세 페이지 (파이프라인)")
+        pipeline.print_metrics()
+
+    validators.close()
+    cache.close()
+    return results, [url for url, _ in failed]
+
+async def collect_data(url_age_tuples, concurrency=5, stream=False, journal=None, parse_processes=0):
+    """상세 페이지 전체를 공유 fetcher로 수집. (결과, 실패한 URL) 반환. 바뀌지 않은 페이지는 결과에서 빠진다
+
+    journal을 넘기면 수집한 작품을 바로바로 저널에 기록한다.
+    parse_processes를 넘기면 파싱을 별도 프로세스로 나눈 파이프라인을 쓴다 (stream과 함께 쓰지 않음).
+    """
+    if parse_processes and not stream:
+        return await collect_data_pipeline(url_age_tuples, concurrency, parse_processes, journal)
+
+    cache = ResponseCache()
+    validators = ValidatorStore()
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache,
+                            validators=validators) as fetcher:
+        results = await fetcher.map(
+            journaled(partial(get_data, stream=stream), journal), url_age_tuples, desc="상세 페이지"
+        )
+    validators.close()
+    cache.close()
+    naver_extractor.print_stats()
+
+    # None은 지난 수집 이후 바뀌지 않은 작품, 빈 dict는 추출 실패
+    failed = [url for (url, _), result in zip(url_age_tuples, results) if result == {}]
+    return [result for result in results if result], failed
+
+def create_broker():
+    return SessionBroker(
+        'naver', login=login_playwright, required=LOGIN_COOKIES,
+        start_url='https://series.naver.com/novel/home.series'
+    )
 
-    while True:
+async def collect_adult_data(nineteen_links, concurrency=4, stream=False, journal=None, broker=None):
+    """19금 작품을 로그인 쿠키를 넘겨받은 공유 fetcher로 수집 (브라우저는 로그인할 때만 사용)"""
+    broker = broker or create_broker()
+    cookies = await broker.ensure()
+
+    cache = ResponseCache()
+    validators = ValidatorStore()
+    url_age_tuples = [(url, 19) for url in nineteen_links]
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache,
+                            validators=validators, cookies=cookies) as fetcher:
+        results = await fetcher.map(
+            journaled(partial(get_data, stream=stream, broker=broker), journal), url_age_tuples,
+            desc="19금 상세 페이지"
+        )
+        # 수집 중 서버가 연장해 준 세션 쿠키까지 저장
+        broker.save(fetcher.cookies)
+    validators.close()
+    cache.close()
+    print(f"로그인 횟수: {broker.logins}")
+
+    # None은 지난 수집 이후 바뀌지 않은 작품, 빈 dict는 추출 실패
+    failed = [url for url, result in zip(nineteen_links, results) if result == {}]
+    return [result for result in results if result], failed
+
+async def refresh(journal, stream=False, budget=None, parse_processes=0):
+    """수집한 전체 이용가 작품 중 다시 볼 때가 된 작품을 조건부 GET으로 확인하고 바뀐 것만 교체
+
+    다시 볼 작품과 순서는 RecrawlScheduler가 작품별 변경 빈도로 정한다 (budget: 이번에 확인할 최대 작품 수).
+    바뀐 작품은 journal에 추가하고, 합치고 내보내는 것은 호출한 쪽에서 한다.
+    """
+    scheduler = RecrawlScheduler()
+    scheduler.register('naver', [data for data in journal.load() if data['age'] != 19])
+    print(f"재방문 계획: {scheduler.stats('naver')}")
+
+    changed = {}
+    checked = 0
+    for urls in scheduler.batches('naver', budget=budget):
+        # 바뀐 작품은 저널에 새 레코드로 추가되고, 내보낼 때 이전 레코드를 덮어쓴다
+        results, failed = await collect_data(
+            [(url, 0) for url in urls], stream=stream, journal=journal, parse_processes=parse_processes
+        )
+        batch_changed = {data['url']: data for data in results}
+        failed = set(failed)
+        scheduler.observe_many('naver', [(url, batch_changed.get(url)) for url in urls if url not in failed])
+        changed.update(batch_changed)
+        checked += len(urls)
+    print(f"변경된 작품: {len(changed)}개 / 확인한 작품: {checked}개")
+    scheduler.close()
+    return changed
+
+def reextract_from_cache(novel_page_path='data/naver_page_links.link'):
+    """네트워크 없이 캐시에 저장된 상세 페이지 본문으로 다시 추출"""
+    ages = {}
+    if os.path.exists(novel_page_path):
+        ages = {link['url']: link['age'] for link in open_files(novel_page_path)}
+
+    cache = ResponseCache()
+    results = []
+    failed = 0
+    for url, body in tqdm(cache.iter_latest('https://series.naver.com/novel/detail%'), desc="캐시 재추출"):
         try:
-            # 기존 데이터와 비교하여 새로운 URL만 필터링
-            if os.path.exists(novel_data_path):
-                old_data = open_files(novel_data_path)
-                cache_urls = [data['url'] for data in old_data if data]
-                filtered_urls = [url for url in all_urls if url['url'] not in cache_urls]
-                print(f"새로 크롤링할 URL: {len(filtered_urls)}개")
-            else:
-                filtered_urls = all_urls
-                old_data = []
-            
-            if not filtered_urls:
-                print("크롤링할 새로운 URL이 없습니다.")
-                break
-            
-            # 나이별로 분류
-            not_nineteen_links = [link['url'] for link in filtered_urls if link['age'] == 0]
-            nineteen_links = [link['url'] for link in filtered_urls if link['age'] == 19]
-            
-            all_results = []
-            
-            # not_nineteen_links = not_nineteen_links[:1000]
-            print(f'전체 이용가: {len(not_nineteen_links)}개')
-            print(f'19금: {len(nineteen_links)}개')
-            
-            # 1. 전체 이용가 소설 크롤링 (병렬 처리)
-            # if not_nineteen_links:
-            #     print("전체 이용가 소설 크롤링 시작...")
-            #     not_nineteen_tuples = [(url, 0) for url in not_nineteen_links]
-                
-            #     # 배치 단위로 나누어서 처리
-            #     batches = split_data(not_nineteen_tuples, 20)  # 20개씩 배치 처리
-                
-            #     for batch in tqdm(batches, desc="전체 이용가 배치 처리"):
-            #         batch_results = parmap.map(
-            #             get_data,
-            #             batch,
-            #             pm_pbar=False,  # 배치별로는 진행률 표시 안함
-            #             pm_processes=5
-            #         )
-                    
-            #         # None 값 제거하고 결과 추가
-            #         valid_batch_results = [result for result in batch_results if result is not None]
-            #         all_results.extend(valid_batch_results)
-                    
-            #         # 배치 간 딜레이
-            #         time.sleep(random.uniform(1, 4))
-                
-            #     print(f"전체 이용가 크롤링 완료: {len([r for r in all_results if r['url'] == '전체'])}개")
-            
-            # 2. 19금 소설 크롤링 (Playwright 사용)
-            if nineteen_links:
-                print("19금 소설 크롤링 시작...")
-                print("Playwright를 사용하여 19금 콘텐츠를 크롤링합니다.")
-                
-                # 비동기 함수 호출
-                nineteen_results = asyncio.run(get_19(nineteen_links))
-                all_results.extend(nineteen_results)
-                
-                print(f"19금 크롤링 완료: {len(nineteen_results)}개")
-            
-            print(f"총 수집된 데이터: {len(all_results)}개")
-            
-            # 기존 데이터와 합치기
-            all_data = old_data + all_results
-            
-            # 저장
-            save_files(novel_data_path, all_data)
-            print(f"총 {len(all_data)}개 데이터 저장 완료")
-            break
-            
-        except Exception as e:
-            print(f'데이터 추출 오류: {e}')
-            print('현재까지의 데이터를 저장합니다.')
-            
-            # 부분 결과라도 저장
-            if 'all_results' in locals() and all_results:
-                if os.path.exists(novel_data_path):
-                    existing_data = open_files(novel_data_path)
-                    existing_data.extend(all_results)
-                    save_files(novel_data_path, existing_data)
-                else:
-                    save_files(novel_data_path, all_results)
-            break
+            results.append(parse_novel_data(body, url, ages.get(url, 0)))
+        except Exception:
+            failed += 1
+    cache.close()
+    print(f"재추출 완료: {len(results)}개 성공, {failed}개 실패")
+    return results
+
+class NaverPlugin(PlatformPlugin):
+    """네이버 시리즈: 목록/전체 이용가는 HTTP, 19금은 로그인 쿠키를 넘겨받은 HTTP로 수집하고 실패한 작품만 브라우저로
+
+    worker=True로 여러 프로세스/머신에서 같은 data/frontier.sqlite를 열고 동시에 실행할 수 있다.
+    """
+
+    name = 'naver'
+    data_path = 'data/naver_novel_data.data'
+    page_path = 'data/naver_page_links.link'
+    # 전체 이용가 작업('naver')은 지금은 수집하지 않는다 (큐를 추가하면 같이 수집)
+    queues = ('naver_19',)
+    lease_seconds = 30 * 60
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.broker = create_broker()
+
+    async def auth(self):
+        await self.broker.ensure()
+
+    async def listing(self, frontier, seen):
+        # URL 수집
+        if os.path.exists(self.page_path):
+            all_urls = open_files(self.page_path)
+        else:
+            print("URL 수집 시작...")
+            all_urls = flatten(await collect_links(self.listing_concurrency))
+            save_files(self.page_path, all_urls)
+        print(f"총 수집된 URL: {len(all_urls)}개")
+
+        # 기존 데이터에 없는 URL만 작업 목록에 추가 (이미 목록에 있는 URL은 무시됨)
+        filtered_urls = seen.filter_new(all_urls, key=lambda link: link['url'])
+        frontier.add('naver', [link['url'] for link in filtered_urls if link['age'] == 0])
+        frontier.add('naver_19', [link['url'] for link in filtered_urls if link['age'] == 19])
+        return filtered_urls
+
+    async def detail(self, queue, batch, journal):
+        urls = [url for url, _ in batch]
+        if queue == 'naver':
+            return await collect_data(
+                [(url, 0) for url in urls], concurrency=self.concurrency, stream=self.stream,
+                journal=journal, parse_processes=self.parse_processes
+            )
+
+        # 로그인 쿠키를 넘겨받아 HTTP로 수집하고, 실패한 작품만 브라우저로 다시 시도
+        results, failed = await collect_adult_data(
+            urls, concurrency=self.concurrency, stream=self.stream, journal=journal, broker=self.broker
+        )
+        if failed:
+            print(f"HTTP 수집 실패 {len(failed)}개는 Playwright로 재시도합니다.")
+            self.frontier.extend_lease(failed)
+            browser_results = await get_19(failed, num_browsers=1, journal=journal)
+            results.extend(browser_results)
+            recovered = {result['url'] for result in browser_results}
+            failed = [url for url in failed if url not in recovered]
+        return results, failed
+
+    async def refresh(self):
+        journal = open_journal(self.name, seed_path=self.data_path)
+        changed = await refresh(journal, stream=self.stream, budget=self.budget,
+                                parse_processes=self.parse_processes)
+        self.export(journal)
+        return changed
+
+    async def from_cache(self):
+        journal = open_journal(self.name, seed_path=self.data_path)
+        journal.extend(reextract_from_cache(self.page_path))
+        return self.export(journal)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='네이버 시리즈 소설 크롤러')
+    parser.add_argument('--from-cache', action='store_true', help='캐시된 페이지에서 다시 추출 (네트워크 사용 안 함)')
+    parser.add_argument('--refresh', action='store_true', help='수집한 작품을 조건부 GET으로 재확인')
+    parser.add_argument('--stream', action='store_true', help='필요한 필드를 다 읽으면 본문 수신을 중단')
+    parser.add_argument('--worker', action='store_true', help='작업 목록의 URL만 수집 (추가 작업자 프로세스용)')
+    parser.add_argument('--budget', type=int, default=None, help='--refresh에서 다시 확인할 최대 작품 수')
+    parser.add_argument('--parse-processes', type=int, default=0, help='파싱을 N개 프로세스로 나눈 파이프라인 사용')
+    args = parser.parse_args()
+
+    plugin = NaverPlugin(stream=args.stream, worker=args.worker, budget=args.budget,
+                         parse_processes=args.parse_processes)
     try:
-        main()
+        print("🚀 네이버 소설 크롤링 시작!")
+        if args.from_cache:
+            asyncio.run(plugin.from_cache())
+        elif args.refresh:
+            asyncio.run(plugin.refresh())
+        else:
+            asyncio.run(plugin.run())
         print("\n🎊 모든 작업이 완료되었습니다!")
     except KeyboardInterrupt:
         print("\n⏹️ 사용자에 의해 중단되었습니다.")
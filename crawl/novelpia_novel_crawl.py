@@ -1,66 +1,28 @@
-
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-import requests
 from lxml import html
 from fake_useragent import UserAgent
-import parmap
 import pickle
 import re
-import time
-import random
 import os
 import asyncio
 from playwright.async_api import async_playwright
 from tqdm import tqdm
 from itertools import chain
-
-# 세션 설정 (재사용 및 재시도 설정)
-def create_session():
-    session = requests.Session()
-    
-    # 재시도 설정
-    retry_strategy = Retry(
-        total=3,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"],  # method_whitelist -> allowed_methods
-        backoff_factor=1
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    return session
-
-# 헤더 생성
-def get_headers():
-    ua = UserAgent(platforms='desktop')
-    return {
-        'User-Agent': ua.random,
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3',
-        'Accept-Encoding': 'gzip, deflate',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
-    }
-
-# 페이지 링크들 수집
-async def get_links(page, url):
-    await page.goto(url)
-    
-    links = []
-    elements = await page.locator('xpath=/html/body/div[8]/div[3]/div[6]/div/table/tbody/tr[1]/td[1]').all()
-    
-    for element in elements:
-        onclick_value = await element.get_attribute('onclick')
-        if onclick_value:
-            # url 추출
-            if "location='" in onclick_value:
-                url_part = onclick_value.split("location='")[1].split("'")[0]
-                full_url = f"https://novelpia.com{url_part}"
-                links.append(full_url)
-    
-    return links
+import argparse
+from functools import partial
+from fetcher import AsyncFetcher, create_session, get_headers
+from rate_limiter import shared_limiter
+from response_cache import ResponseCache
+from revalidation import ValidatorStore
+from extraction import Extractor, Field
+from resource_policy import RoutingPolicy, wait_for_fields
+from journal import open_journal, journaled
+from recrawl import RecrawlScheduler
+from session_broker import SessionBroker, wait_for_login
+from browser_pool import BrowserPool
+from listing_harvester import ListingHarvester, http_source, browser_source
+from extraction_pool import ExtractionPool
+from pipeline import CrawlPipeline
+from plugin import PlatformPlugin
 
 # 데이터 평탄화
 def flatten_results(results):
@@ -85,190 +47,225 @@ def save_files(file, data):
     with open(file, 'wb') as f:
         pickle.dump(data, f)
 
-def extract_element(tree, xpaths, type='text'):
-    for xpath in xpaths:
-        if xpath.startswith('xpath='):
-            xpath = xpath[6:]
-        element = tree.xpath(xpath)
-        if len(element) > 0:
-            if type == 'text':
-                return element[0].text_content().strip()
-            elif type == 'img':
-                return element[0].get('src').strip()
-
-# 이미지 가져오기
-def get_img(tree):
-    img_xpaths = [
+# 키워드 문자열에서 장르 판단
+GENRE_KEYWORDS = ['로맨스', '무협', '라이트노벨', '공포', 'SF', '스포츠', '대체역사', '현대판타지', '현대', '판타지']
+
+def get_genre(keywords):
+    for genre in GENRE_KEYWORDS:
+        if keywords and genre in keywords:
+            return genre
+    return '기타'
+
+# 완결, 연재 여부 확인, 나이 제한 확인 (in-badge 텍스트 기준)
+def get_serial(badge):
+    if badge is None:
+        return '연재중', '전체'  # 기본값
+    serial = '완결' if '완결' in badge else '연재중'
+    age = '19' if '19' in badge else '전체'
+    return serial, age
+
+# 상세 페이지 추출 명세 (필드 → 순서대로 시도할 XPath)
+NOVELPIA_FIELDS = {
+    'img': Field([
         'xpath=/html/body/div[6]/div[1]/div[1]/a/img',
         'xpath=/html/body/div[6]/div[1]/div[1]/img',
         '//*[@class="conver_img"]',
-    ]
-    img = extract_element(tree, img_xpaths, 'img')
-
-    return img
-
-# 제목 가져오기
-def get_title(tree):
-    title_xpaths = [
+    ], attr='src', skip_empty=False, default=None),
+    'title': Field([
         '//*[@class="epnew-novel-title"]',
         'xpath=/html/body/div[6]/div[1]/div[2]/div[2]'
-    ]
-    title = extract_element(tree, title_xpaths)
-
-    return title
-
-# 작가 가져오기
-def get_author(tree):
-    author_xpaths = [
+    ], skip_empty=False, default=None),
+    'author': Field([
         'xpath=/html/body/div[6]/div[1]/div[2]/div[3]/p[1]/a',
         '//*[@class="writer-name"]'
-    ]
-    author = extract_element(tree, author_xpaths)
-
-    return author
-
-# 추천 수 가져오기
-def get_recommend(tree):
-    recommend_xpaths = [
+    ], skip_empty=False, default=None),
+    'recommend': Field([
         'xpath=/html/body/div[6]/div[1]/div[2]/div[4]/div[1]/p[2]/span[2]',
         'xpath=/html/body/div[6]/div[1]/div[2]/div[5]/div[1]/p[2]/span[2]'
-    ]
-    # 추천 수
-    recommend = extract_element(tree, recommend_xpaths)
-
-    return recommend
-
-# 키워드, 태그, 장르 가져오기
-def get_keywords(tree):
-    keywords_xpaths = [
+    ], skip_empty=False, default=None),
+    'keywords': Field([
         'xpath=/html/body/div[6]/div[1]/div[2]/div[6]/div[1]/p[1]',
         'xpath=/html/body/div[6]/div[1]/div[2]/div[5]/div[1]/p[1]',
         '//*[contains(@class, "writer-tag") and position()=2]'
-    ]
-    keywords = extract_element(tree, keywords_xpaths)
-    keywords_items = {
-        '로맨스': '로맨스',
-        '무협': '무협',
-        '라이트노벨':'라이트노벨',
-        '공포':'공포',
-        'SF':'SF',
-        '스포츠':'스포츠',
-        '대체역사':'대체역사',
-        '현대판타지':'현대판타지',
-        '현대':'현대',
-        '판타지':'판타지'
+    ], skip_empty=False, default=None),
+    'badge': Field(['//*[@class="in-badge"]'], skip_empty=False, strip=False, default=None),
+    # 작가명과 같은 클래스의 마지막 요소가 연재 화수
+    # (마지막 요소는 문서를 끝까지 읽어야 알 수 있으므로 노벨피아는 스트리밍 추출을 쓰지 않는다)
+    'page_count': Field(['//*[@class="writer-name"]'], index=-1, skip_empty=False, strip=False, default=None),
+    'viewers': Field([
+        '//div[contains(@class, "counter-line-a")]//p[1]//span[last()]'
+    ], skip_empty=False, strip=False, default=None),
+    'summary': Field(['//*[@class="synopsis"]'], skip_empty=False, strip=False, default=None),
+}
+
+novelpia_extractor = Extractor(NOVELPIA_FIELDS)
+
+# 상세 페이지 HTML에서 소설 데이터 추출
+def parse_novel_data(content, url):
+    return build_novel_data(novelpia_extractor.extract(html.fromstring(content)), url)
+
+# 추출된 필드로 소설 데이터 구성
+def build_novel_data(fields, url):
+    serial, age = get_serial(fields['badge'])
+
+    novel_data = {
+        'url': url,
+        'img': fields['img'],
+        'title': fields['title'],
+        'author': fields['author'],
+        'recommend': fields['recommend'],
+        'genre': get_genre(fields['keywords']),
+        'serial': serial,
+        'publisher': '',
+        'summary': fields['summary'],
+        'page_count': fields['page_count'],
+        'page_unit': '화',
+        'age': age,
+        'platform': 'novelpia',
+        'keywords': fields['keywords'],
+        'viewers': fields['viewers']
     }
 
-    genre = '기타'
-    for key, value in keywords_items.items():
-        if key in keywords:
-            genre = value
-            break
+    if any(value is None for value in novel_data.values()):
+        raise Exception(f'데이터 추출 실패: {url}')
 
-    return keywords, genre
-    
-# 완결, 연재 여부 확인, 나이 제한 확인
-def get_serial(tree):
-    serial_elements = tree.xpath('//*[@class="in-badge"]')
-    if serial_elements:
-        serial_element = serial_elements[0].text_content()
-        serial = '완결' if '완결' in serial_element else '연재중'
-        age = '19' if '19' in serial_element else '전체'
-    else:
-        serial, age = '연재중', '전체'  # 기본값
-    return serial, age
+    return novel_data
 
-# 출판사 가져오기
-def get_publisher(tree):
-    publisher = ''
-
-    return publisher
-
-# 연재 화수 확인
-def get_page_count(tree):
-    page_count_xpaths = [
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[6]/div[2]/div[1]/p[3]/span[2]',
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[5]/div[2]/div[1]/p[3]/span[2]',
-    ]
-    page_counts = tree.xpath('//*[@class="writer-name"]')
-    page_count = page_counts[-1].text_content()
-    page_unit = '화'
-    
-    return page_count, page_unit
-
-# 조회수 확인
-def get_viewers(tree):
-    viewers_xpaths = [
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[4]/div[1]/p[1]/span[2]',
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[5]/div[1]/p[1]/span[2]'
-    ]
-    viewers = tree.xpath('//div[contains(@class, "counter-line-a")]//p[1]//span[last()]')
-    viewer = viewers[0].text_content()
-
-    return viewer
-
-# 소설 소개 추출
-def get_summary(tree):
-    summary_xpaths = [
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[5]/div[2]/div[2]',
-        'xpath=/html/body/div[6]/div[1]/div[2]/div[6]/div[2]/div[2]'
-    ]
-    summarys = tree.xpath('//*[@class="synopsis"]')
-    summary = summarys[0].text_content()
-
-    return summary
-
-# 소설 데이터 가져오기
-def get_novel_data(url):
+# 소설 데이터 가져오기 (지난 수집 이후 바뀌지 않았으면 None)
+# pool(ExtractionPool)을 넘기면 수집은 여기서 하고 본문 파싱만 상주 프로세스에 맡긴다
+async def get_novel_data(fetcher, url, pool=None):
     try:
-        session = create_session()
-        headers = get_headers()
-        
-        response = session.get(url, headers=headers, timeout=30)
+        response = await fetcher.get_if_changed(url)
+        if response is None:
+            return None
         response.raise_for_status()
-        
-        tree = html.fromstring(response.content)
-        
-        img = get_img(tree)
-        title = get_title(tree)
-        author = get_author(tree)
-        recommend = get_recommend(tree)
-        keywords, genre = get_keywords(tree)
-        serial, age = get_serial(tree)
-        publisher = get_publisher(tree)
-        page_count, page_unit = get_page_count(tree)
-        viewers = get_viewers(tree)
-        summary = get_summary(tree)
-        
-        novel_data = {
-            'url': url,
-            'img': img,
-            'title': title,
-            'author': author,
-            'recommend': recommend,
-            'genre': genre,
-            'serial': serial,
-            'publisher': publisher,
-            'summary': summary,
-            'page_count': page_count,
-            'page_unit': page_unit,
-            'age': age,
-            'platform': 'novelpia',
-            'keywords': keywords,
-            'viewers': viewers
-        }
-
-        # print(novel_data)
-
-        if any(value is None for value in novel_data.values()):
-            # print(novel_data)
-            raise Exception(f'데이터 추출 실패: ', url=url)
-        
+
+        if pool is not None:
+            novel_data = await pool.run((url, response.content))
+        else:
+            novel_data = parse_novel_data(response.content, url)
+        fetcher.remember(url, response)
         return novel_data
     except Exception as e:
         print(e, url)
         return {}
 
+# 파이프라인 파싱 단계 (작업자 프로세스에서 실행)
+def parse_payload(payload):
+    url, content = payload
+    return parse_novel_data(content, url)
+
+async def collect_novel_data_pipeline(urls, concurrency=5, parse_processes=4, journal=None):
+    """수집(스레드)과 파싱(프로세스 풀)을 나눈 파이프라인으로 상세 페이지 수집. (결과, 실패한 URL) 반환"""
+    cache = ResponseCache()
+    validators = ValidatorStore()
+    results = []
+    # 파싱이 끝날 때까지 응답을 들고 있다가 성공한 것만 검증 정보로 기록
+    responses = {}
+
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache,
+                            validators=validators) as fetcher:
+        async def fetch(url):
+            response = await fetcher.get_if_changed(url)
+            if response is None:
+                return None
+            response.raise_for_status()
+            responses[url] = response
+            return url, response.content
+
+        def write(url, novel_data):
+            results.append(novel_data)
+            if journal is not None:
+                journal.append(novel_data)
+            fetcher.remember(url, responses.pop(url))
+
+        # 파싱/저장에 실패한 URL의 응답은 바로 버린다
+        def discard(url):
+            responses.pop(url, None)
+
+        pipeline = CrawlPipeline(fetch, parse_payload, write, fetch_concurrency=concurrency,
+                                 parse_processes=parse_processes, on_failed=discard)
+        failed = await pipeline.run(urls, desc="상세 페이지 (파이프라인)")
+        pipeline.print_metrics()
+
+    validators.close()
+    cache.close()
+    return results, failed
+
+async def collect_novel_data(urls, concurrency=5, journal=None, parse_processes=0, pool=None):
+    """상세 페이지들을 공유 fetcher로 수집. (결과, 실패한 URL) 반환. 바뀌지 않은 페이지는 결과에서 빠진다
+
+    journal을 넘기면 수집한 작품을 바로바로 저널에 기록한다.
+    parse_processes를 넘기면 파싱을 별도 프로세스로 나눈 파이프라인을 쓴다.
+    pool(상주 추출 풀)을 넘기면 그 풀에서 파싱한다. 어느 경우든 캐시와 조건부 GET은 같은 fetcher를 거친다.
+    """
+    if parse_processes and pool is None:
+        return await collect_novel_data_pipeline(urls, concurrency, parse_processes, journal)
+
+    cache = ResponseCache()
+    validators = ValidatorStore()
+    async with AsyncFetcher(concurrency=concurrency, limiter=shared_limiter(), cache=cache,
+                            validators=validators) as fetcher:
+        results = await fetcher.map(
+            journaled(partial(get_novel_data, pool=pool), journal), urls, desc="상세 페이지"
+        )
+    validators.close()
+    cache.close()
+    novelpia_extractor.print_stats()
+    # None은 지난 수집 이후 바뀌지 않은 작품, 빈 dict는 추출 실패
+    failed = [url for url, result in zip(urls, results) if result == {}]
+    return [result for result in results if result], failed
+
+# 추출 풀 작업자 초기화 (프로세스마다 한 번). 추출기는 모듈을 import할 때 컴파일된다
+def init_pool_worker():
+    return {}
+
+# 추출 풀 작업자에서 상세 페이지 본문 1건 파싱
+def parse_in_pool_worker(state, payload):
+    url, content = payload
+    return parse_novel_data(content, url)
+
+def create_extraction_pool(processes=5):
+    """추출기를 들고 계속 살아 있는 파싱 작업자 프로세스 풀 (요청은 부모의 fetcher가 보낸다)"""
+    return ExtractionPool(init_pool_worker, parse_in_pool_worker, processes=processes)
+
+# 이미 수집한 작품 중 다시 볼 때가 된 작품을 조건부 GET으로 확인하고 바뀐 것만 journal에 추가
+# 다시 볼 작품과 순서는 작품별 변경 빈도로 정한다 (budget: 이번에 확인할 최대 작품 수)
+async def refresh(journal, budget=None, parse_processes=0):
+    scheduler = RecrawlScheduler()
+    scheduler.register('novelpia', journal.load())
+    print(f"재방문 계획: {scheduler.stats('novelpia')}")
+
+    changed = {}
+    checked = 0
+    for urls in scheduler.batches('novelpia', budget=budget):
+        # 바뀐 작품은 저널에 새 레코드로 추가되고, 내보낼 때 이전 레코드를 덮어쓴다
+        results, failed = await collect_novel_data(
+            urls, journal=journal, parse_processes=parse_processes
+        )
+        batch_changed = {data['url']: data for data in results}
+        failed = set(failed)
+        scheduler.observe_many('novelpia', [(url, batch_changed.get(url)) for url in urls if url not in failed])
+        changed.update(batch_changed)
+        checked += len(urls)
+    print(f"변경된 작품: {len(changed)}개 / 확인한 작품: {checked}개")
+    scheduler.close()
+    return changed
+
+# 캐시에 저장된 본문으로 다시 추출 (네트워크 사용 안 함)
+def reextract_from_cache():
+    cache = ResponseCache()
+    results = []
+    failed = 0
+    for url, body in tqdm(cache.iter_latest('https://novelpia.com/novel/%'), desc="캐시 재추출"):
+        try:
+            results.append(parse_novel_data(body, url))
+        except Exception:
+            failed += 1
+    cache.close()
+    print(f"재추출 완료: {len(results)}개 성공, {failed}개 실패")
+    return results
+
 # 데이터 나누기
 def split_data(data, split_num):
     """리스트와 딕셔너리 모두 처리하는 범용 분할 함수"""
@@ -305,8 +302,9 @@ def get_last_page_num():
     return max_num
 
 # 각 소설 링크들 가져오기
-async def get_links(page, url):
-    await page.goto(url)
+async def get_links(page, url, limiter):
+    await limiter.goto(page, url, wait_until='domcontentloaded')
+    await wait_for_fields(page, [['/html/body/div[8]/div[3]/div[6]/div/table/tbody/tr[1]/td[1]']])
     
     links = []
     elements = await page.locator('xpath=/html/body/div[8]/div[3]/div[6]/div/table/tbody/tr[1]/td[1]').all()
@@ -332,8 +330,7 @@ async def login(page):
     await page.locator('xpath=//*[@id="pc-sidemenu"]/div[2]/div[1]/div[2]/div[1]').click()
     await page.locator('xpath=//*[@id="member_login_modal"]/div/div/div[2]/div[2]/div[2]/a[1]').click()
     
-    print("로그인을 완료한 후 Enter를 눌러주세요...")
-    input()  # 사용자가 수동으로 로그인 완료할 때까지 대기
+    await wait_for_login(page)  # 사용자가 수동으로 로그인 완료할 때까지 대기
 
 # 최대 페이지 가져오기
 async def get_last_page(page, url):
@@ -391,99 +388,141 @@ async def create_page(playwright, user_agent, headless=True):
     
     return page, browser
 
-async def start_get_links():
-    # 최종 페이지 가져오기
+LISTING_URL = 'https://novelpia.com/plus/all/date/{page}/?main_genre=&is_please_write='
+
+# 목록 페이지 HTML에서 작품 링크 추출 (onclick="location='/novel/25974';")
+def parse_listing_links(content):
+    tree = html.fromstring(content)
+    links = []
+    for onclick_value in tree.xpath('//td[contains(@onclick, "location=\'/novel/")]/@onclick'):
+        url_part = onclick_value.split("location='")[1].split("'")[0]
+        links.append(f"https://novelpia.com{url_part}")
+    return links
+
+async def start_get_links(frontier, seen=None, concurrency=4, use_browser=False, broker=None):
+    """목록 페이지를 동시에 돌면서 새 작품 링크를 작업 목록에 추가. 새로 찾은 링크 반환
+
+    목록은 JS 없이 렌더링되므로 기본은 로그인 쿠키를 넘겨받은 HTTP로 받고,
+    use_browser=True면 같은 쿠키를 넣은 브라우저 풀로 받는다.
+    """
+    broker = broker or SessionBroker('novelpia', login=login)
+    cookies = await broker.ensure()
+    limiter = shared_limiter()
+
+    if not use_browser:
+        async with AsyncFetcher(concurrency=concurrency, limiter=limiter, cookies=cookies) as fetcher:
+            harvester = ListingHarvester(
+                http_source(fetcher, LISTING_URL, parse_listing_links),
+                frontier, 'novelpia', seen, concurrency=concurrency
+            )
+            return await harvester.run()
+
+    policy = RoutingPolicy('novelpia')
+    ua = UserAgent(platforms='desktop')
+
+    async def prepare_context(context):
+        await context.add_cookies(broker.playwright_cookies())
+        await policy.apply(context)
+
     async with async_playwright() as playwright:
-        ua = UserAgent(platforms='desktop')
-        page, browser = await create_page(playwright, ua.random, headless=False)
-        # 로그인하기
-        await login(page)
-        print('마지막 번호 가져오기')
-        last_page_num = await get_last_page(page, 'https://novelpia.com/plus/all/date/1/?main_genre=&is_please_write=')
-    
-        # URL 생성
-        urls = [f"https://novelpia.com/plus/all/date/{i}/?main_genre=&is_please_write=" for i in range(1, last_page_num)]
-        # urls = urls[:1]
-        # 각 페이지에서 순차적으로 링크 수집
-        all_links = []
-
-            # tqdm 프로그레스 바 생성 
-        with tqdm(urls, desc=f"현재 수집된 링크 수: {len(all_links)}", total=len(urls)) as pbar:
-            for url in pbar:
-                # 링크 수집
-                links = await get_links(page, url)
-                all_links.extend(links)
-                
-                # tqdm 설명 동적 업데이트
-                pbar.set_description(f"현재 수집된 링크 수: {len(all_links)}")
-                
-                await asyncio.sleep(random.uniform(4, 10))
-        await browser.close()
-    return all_links
+        async with BrowserPool(
+            playwright,
+            browsers=1,
+            contexts_per_browser=concurrency,
+            context_options=lambda: {'user_agent': ua.random},
+            on_context=prepare_context
+        ) as pool:
+            harvester = ListingHarvester(
+                browser_source(pool, LISTING_URL, get_links, limiter),
+                frontier, 'novelpia', seen, concurrency=concurrency
+            )
+            return await harvester.run()
+
+class NovelpiaPlugin(PlatformPlugin):
+    """노벨피아: 로그인 쿠키를 넘겨받은 HTTP로 목록과 상세 페이지를 수집
+
+    processes를 넘기면 상세 페이지 파싱을 상주 프로세스 풀에서 하고 (수집은 캐시/조건부 GET을 쓰는 fetcher),
+    browser_listing=True면 목록 페이지를 브라우저 풀로 받는다.
+    연재 화수(page_count)가 문서 마지막 요소라 일찍 멈출 수 없으므로 stream 옵션은 쓰지 않는다.
+    """
+
+    name = 'novelpia'
+    data_path = 'data/novelpia_novel_data.data'
+    page_path = 'data/novelpia_page_links.link'
+    queues = ('novelpia',)
+    batch_size = 1000
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.broker = SessionBroker('novelpia', login=login)
+        self.pool = None
+
+    async def auth(self):
+        await self.broker.ensure()
+
+    async def listing(self, frontier, seen):
+        if os.path.exists(self.page_path):
+            # 예전에 모아 둔 링크 파일도 작업 목록으로 옮김 (이미 있는 URL은 무시됨)
+            frontier.add('novelpia', seen.filter_new(open_files(self.page_path)))
+        # 아는 링크만 나오는 페이지에 닿으면 멈춤
+        return await start_get_links(
+            frontier, seen, concurrency=self.listing_concurrency,
+            use_browser=self.options.get('browser_listing', False), broker=self.broker
+        )
+
+    async def detail(self, queue, batch, journal):
+        urls = [url for url, _ in batch]
+        return await collect_novel_data(
+            urls, concurrency=self.concurrency, journal=journal,
+            parse_processes=self.parse_processes, pool=self.pool
+        )
+
+    async def run(self):
+        # 프로세스 풀은 실행 내내 한 번만 띄워서 모든 배치에 재사용
+        processes = self.options.get('processes', 0)
+        self.pool = create_extraction_pool(processes) if processes else None
+        try:
+            return await super().run()
+        finally:
+            if self.pool is not None:
+                self.pool.close()
+                self.pool = None
+
+    async def refresh(self):
+        journal = open_journal(self.name, seed_path=self.data_path)
+        changed = await refresh(journal, budget=self.budget, parse_processes=self.parse_processes)
+        self.export(journal)
+        return changed
+
+    async def from_cache(self):
+        journal = open_journal(self.name, seed_path=self.data_path)
+        journal.extend(reextract_from_cache())
+        return self.export(journal)
 
 if __name__ == '__main__':
-    page_path = 'data/novelpia_page_links.link'
-    data_path = 'data/novelpia_novel_data.data'
-    
-    os.makedirs('data', exist_ok=True)
+    parser = argparse.ArgumentParser(description='노벨피아 소설 크롤러')
+    parser.add_argument('--from-cache', action='store_true', help='캐시된 페이지에서 다시 추출 (네트워크 사용 안 함)')
+    parser.add_argument('--refresh', action='store_true', help='수집한 작품을 조건부 GET으로 재확인')
+    parser.add_argument('--worker', action='store_true', help='작업 목록의 URL만 수집 (추가 작업자 프로세스용)')
+    parser.add_argument('--budget', type=int, default=None, help='--refresh에서 다시 확인할 최대 작품 수')
+    parser.add_argument('--browser-listing', action='store_true', help='목록 페이지를 HTTP 대신 브라우저로 수집')
+    parser.add_argument('--listing-concurrency', type=int, default=4, help='동시에 받을 목록 페이지 수')
+    parser.add_argument('--processes', type=int, default=0, help='상세 페이지 파싱을 N개 상주 프로세스에서 (수집은 비동기 fetcher)')
+    parser.add_argument('--parse-processes', type=int, default=0, help='비동기 수집 + N개 프로세스 파싱 파이프라인 사용')
+    args = parser.parse_args()
+
+    plugin = NovelpiaPlugin(
+        worker=args.worker, budget=args.budget, parse_processes=args.parse_processes,
+        listing_concurrency=args.listing_concurrency, browser_listing=args.browser_listing,
+        processes=args.processes
+    )
     try:
-        if os.path.exists(page_path):
-            print('데이터가 존재합니다. 기존의 데이터를 가져옵니다.')
-            urls = open_files(page_path)
-
-            cahce_urls = open_files(data_path)
-            cache_urls = [url['url'] for url in cahce_urls]
-            urls = [url for url in urls if url not in cache_urls]
-
+        if args.from_cache:
+            asyncio.run(plugin.from_cache())
+        elif args.refresh:
+            asyncio.run(plugin.refresh())
         else:
-            # 소설 링크들 가져오기
-            urls = asyncio.run(start_get_links())
-            # save_files(page_path, urls)
-        print(f'가져온 총 URL 개수: {len(urls)}')
-        # print()
-        all_results = []
-        
-        all_urls = split_data(urls, 1000)
-        print(f'크롤링할 URL 개수: {len(urls)}')
-        for page_cnt, urls in enumerate(all_urls):
-            print(f'작업 횟수: {page_cnt+1}/{len(all_urls)}')
-            try:                
-                urls = split_data(urls, 20)
-                # print(len(urls))
-                print('링크 수집 중...')
-                for url in urls:
-                    results = parmap.map(
-                        get_novel_data,
-                        url,
-                        pm_pbar = True,
-                        pm_processes = 5,
-                        pm_chunksize=1
-                    )
-                    # print(results)
-                    time.sleep(random.uniform(2, 8))
-
-                    all_results.extend(results)
-                
-                print('크롤링 종료 데이터 저장 시작')
-                if os.path.exists(data_path):
-                    old_urls = open_files(data_path)
-                    old_urls.extend(all_results)
-                    save_files(data_path, old_urls)
-                else:
-                    save_files(data_path, all_results)
-                print('데이터 저장 완료')
-
-                time.sleep(10)
-            except Exception as e:
-                print('크롤링 중 오류 발생', e)
-                print('현재 상황을 저장합니다.')
-                
-                if os.path.exists(data_path):
-                    old_urls = open_files(data_path)
-                    old_urls.extend(all_results)
-                    save_files(data_path, old_urls)
-                else:
-                    save_files(data_path, all_results)
-                print('저장 완료')
-    except:
-        pass
\ No newline at end of file
+            asyncio.run(plugin.run())
+        print('데이터 저장 완료')
+    except Exception as e:
+        print('크롤링 중 오류 발생', e)
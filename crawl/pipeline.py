@@ -0,0 +1,196 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from tqdm import tqdm
+
+
+_DONE = object()
+
+
+class StageMetrics:
+    """단계별 처리 수와 큐 깊이 기록"""
+
+    def __init__(self, name):
+        self.name = name
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.depth_samples = 0
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def sample(self, depth):
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def summary(self):
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'busy_seconds': round(self.busy_seconds, 1),
+            'queue_avg': round(self.depth_total / max(self.depth_samples, 1), 1),
+            'queue_max': self.depth_max,
+        }
+
+
+class CrawlPipeline:
+    """수집(비동기 I/O) → 파싱(프로세스 풀) → 저장 단계를 크기가 정해진 큐로 잇는 파이프라인
+
+    fetch(item) -> payload: 비동기 함수. None을 돌려주면 (바뀌지 않은 페이지 등) 건너뛴다.
+    parse(payload) -> record: 작업자 프로세스에서 실행되는 pickle 가능한 최상위 함수.
+    write(item, record): 이벤트 루프에서 실행되는 저장 함수 (저널 기록 등).
+    on_failed(item): 실패한 item마다 이벤트 루프에서 호출 (fetch에서 잡아 둔 응답 정리 등, 선택).
+
+    네트워크 대기와 lxml 파싱이 서로를 막지 않으므로, 연결 수를 늘리지 않고도 파싱을 여러 코어로 나눌 수 있다.
+    큐가 가득 차면 앞 단계가 기다리므로(배압) 메모리에 쌓이는 본문 수는 queue_size로 제한된다.
+    metrics()로 단계별 처리 수와 큐 깊이(어느 단계가 병목인지)를 볼 수 있다.
+
+    사용 예:
+        pipeline = CrawlPipeline(fetch, parse_payload, write, fetch_concurrency=8, parse_processes=4)
+        failed = await pipeline.run(urls)
+    """
+
+    def __init__(self, fetch, parse, write, fetch_concurrency=8, parse_processes=4, queue_size=64,
+                 sample_seconds=1.0, on_failed=None):
+        self.fetch = fetch
+        self.parse = parse
+        self.write = write
+        self.on_failed = on_failed
+        self.fetch_concurrency = fetch_concurrency
+        self.parse_processes = parse_processes
+        self.queue_size = queue_size
+        self.sample_seconds = sample_seconds
+
+        self.stages = {name: StageMetrics(name) for name in ('fetch', 'parse', 'write')}
+        self.failed = []
+        self._pbar = None
+
+    def _fail(self, item):
+        self.failed.append(item)
+        if self.on_failed is not None:
+            self.on_failed(item)
+
+    async def _fetch_worker(self, items, raw_queue):
+        metrics = self.stages['fetch']
+        while True:
+            try:
+                item = items.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.monotonic()
+            try:
+                payload = await self.fetch(item)
+            except Exception as e:
+                print(f"수집 실패 {item}: {e}")
+                payload = None
+                metrics.failed += 1
+                self._fail(item)
+            metrics.busy_seconds += time.monotonic() - started
+            metrics.processed += 1
+            if payload is not None:
+                await raw_queue.put((item, payload))
+            else:
+                self._pbar.update(1)
+
+    async def _parse_worker(self, executor, raw_queue, parsed_queue):
+        metrics = self.stages['parse']
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await raw_queue.get()
+            if entry is _DONE:
+                return
+            item, payload = entry
+            started = time.monotonic()
+            try:
+                record = await loop.run_in_executor(executor, self.parse, payload)
+            except Exception as e:
+                print(f"파싱 실패 {item}: {e}")
+                record = None
+            metrics.busy_seconds += time.monotonic() - started
+            metrics.processed += 1
+            if record:
+                await parsed_queue.put((item, record))
+            else:
+                metrics.failed += 1
+                self._fail(item)
+                self._pbar.update(1)
+
+    async def _write_worker(self, parsed_queue):
+        metrics = self.stages['write']
+        while True:
+            entry = await parsed_queue.get()
+            if entry is _DONE:
+                return
+            item, record = entry
+            started = time.monotonic()
+            try:
+                self.write(item, record)
+            except Exception as e:
+                print(f"저장 실패 {item}: {e}")
+                metrics.failed += 1
+                self._fail(item)
+            metrics.busy_seconds += time.monotonic() - started
+            metrics.processed += 1
+            self._pbar.update(1)
+
+    async def _sample(self, items, raw_queue, parsed_queue, pbar):
+        while True:
+            self.stages['fetch'].sample(items.qsize())
+            self.stages['parse'].sample(raw_queue.qsize())
+            self.stages['write'].sample(parsed_queue.qsize())
+            pbar.set_postfix_str(
+                f"수집 대기 {items.qsize()} | 파싱 대기 {raw_queue.qsize()}/{self.queue_size} | "
+                f"저장 대기 {parsed_queue.qsize()}/{self.queue_size}"
+            )
+            await asyncio.sleep(self.sample_seconds)
+
+    async def run(self, items, desc='파이프라인'):
+        """모든 item을 처리하고 실패한 item 목록 반환"""
+        items = list(items)
+        item_queue = asyncio.Queue()
+        for item in items:
+            item_queue.put_nowait(item)
+        raw_queue = asyncio.Queue(self.queue_size)
+        parsed_queue = asyncio.Queue(self.queue_size)
+
+        # 작업자마다 파싱 1건 + 대기 1건이 있도록 프로세스 수의 두 배만큼 파싱 작업을 띄운다
+        parse_tasks_count = self.parse_processes * 2
+        executor = ProcessPoolExecutor(self.parse_processes, mp_context=multiprocessing.get_context('spawn'))
+        background = []
+        try:
+            with tqdm(total=len(items), desc=desc) as pbar:
+                self._pbar = pbar
+                sampler = asyncio.create_task(self._sample(item_queue, raw_queue, parsed_queue, pbar))
+                writer = asyncio.create_task(self._write_worker(parsed_queue))
+                parsers = [
+                    asyncio.create_task(self._parse_worker(executor, raw_queue, parsed_queue))
+                    for _ in range(parse_tasks_count)
+                ]
+                background = [sampler, writer, *parsers]
+                await asyncio.gather(*(
+                    self._fetch_worker(item_queue, raw_queue) for _ in range(self.fetch_concurrency)
+                ))
+
+                # 앞 단계가 끝나면 다음 단계에 종료 신호를 보낸다
+                for _ in parsers:
+                    await raw_queue.put(_DONE)
+                await asyncio.gather(*parsers)
+                await parsed_queue.put(_DONE)
+                await writer
+        finally:
+            # 중간에 예외가 나도 표본 수집/파싱/저장 작업이 진행률 표시와 큐를 붙잡고 남지 않게 한다
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            executor.shutdown()
+        return self.failed
+
+    def metrics(self):
+        return {name: stage.summary() for name, stage in self.stages.items()}
+
+    def print_metrics(self):
+        for name, summary in self.metrics().items():
+            print(f"[{name}] {summary}")
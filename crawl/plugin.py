@@ -0,0 +1,167 @@
+import os
+import pickle
+import sys
+
+from frontier import Frontier
+from journal import open_journal
+from seen_set import open_seen
+from session_broker import LoginRequired
+
+# 데이터셋 형식은 전처리(process/dataset.py)와 같이 쓴다
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'process'))
+from dataset import write_dataset
+
+# 플랫폼별 파티션으로 쌓는 컬럼 데이터셋 (전처리 입력)
+DATASET_ROOT = 'data/dataset'
+
+
+# 모든 플랫폼 레코드가 갖는 필드의 기본값 (플랫폼에 없는 필드는 이 값으로 채워서 내보낸다)
+RECORD_DEFAULTS = {
+    'img': '',
+    'author': '',
+    'rating': '',
+    'recommend': '0',
+    'genre': '',
+    'serial': '',
+    'publisher': '',
+    'summary': '',
+    'page_count': '',
+    'page_unit': '화',
+    'age': '전체',
+    'keywords': '',
+    'viewers': '0',
+}
+
+
+class PlatformPlugin:
+    """플랫폼 하나의 수집 단계를 묶는 플러그인 (cli.py와 각 크롤러의 __main__에서 사용)
+
+    auth(): 로그인이 필요한 플랫폼이면 쿠키를 준비한다
+    listing(frontier, seen): 새 작품 링크를 작업 목록(queues)에 추가하고 새로 찾은 링크 반환
+    detail(queue, batch, journal): 작업 목록에서 빌린 [(url, meta)]를 수집해서 (결과, 실패한 URL) 반환
+    normalize(record): 플랫폼 레코드를 공통 필드 형식으로 맞춘다
+
+    run()은 위 단계를 작업 목록/저널/SeenSet으로 이어서 한 번의 수집을 끝까지 실행한다.
+    모든 단계가 비동기라서 여러 플랫폼의 run()을 한 이벤트 루프에서 동시에 돌릴 수 있다.
+
+    사용 예:
+        plugin = NaverPlugin(concurrency=8, stream=True)
+        await plugin.run()
+    """
+
+    name = None
+    # 전처리로 넘길 pickle 경로 (None이면 내보내지 않음)
+    data_path = None
+    # 상세 페이지를 수집할 작업 목록 큐 (순서대로 처리)
+    queues = ()
+    lease_seconds = 600
+    batch_size = 500
+
+    def __init__(self, concurrency=5, listing_concurrency=4, batch_size=None, worker=False, stream=False,
+                 parse_processes=0, budget=None, **options):
+        self.concurrency = concurrency
+        self.listing_concurrency = listing_concurrency
+        if batch_size:
+            self.batch_size = batch_size
+        # worker=True면 작업 목록의 URL만 수집하고 정리/내보내기는 하지 않는다
+        self.worker = worker
+        self.stream = stream
+        self.parse_processes = parse_processes
+        self.budget = budget
+        # 플랫폼별 추가 설정
+        self.options = options
+        self.frontier = None
+
+    async def auth(self):
+        pass
+
+    async def listing(self, frontier, seen):
+        return []
+
+    async def detail(self, queue, batch, journal):
+        raise NotImplementedError(f'{self.name}: 상세 페이지 수집을 지원하지 않습니다')
+
+    async def refresh(self):
+        raise NotImplementedError(f'{self.name}: 재확인을 지원하지 않습니다')
+
+    async def from_cache(self):
+        raise NotImplementedError(f'{self.name}: 캐시 재추출을 지원하지 않습니다')
+
+    def normalize(self, record):
+        record = dict(record)
+        for field, default in RECORD_DEFAULTS.items():
+            if record.get(field) is None:
+                record[field] = default
+        record['age'] = str(record['age'])
+        record['platform'] = self.name
+        return record
+
+    def export(self, journal):
+        """저널을 합치고 공통 필드 형식으로 내보내기 (전처리 입력용)
+
+        컬럼 데이터셋(data/dataset)의 이 플랫폼 파티션만 바꿔 넣고, data_path가 있으면 예전 pickle도 쓴다.
+        """
+        journal.compact()
+        dataset = [self.normalize(record) for record in journal.load()]
+        if dataset:
+            write_dataset(DATASET_ROOT, dataset, mode='partitions')
+        if self.data_path is None:
+            return dataset
+        tmp_path = self.data_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(dataset, f)
+        os.replace(tmp_path, self.data_path)
+        return dataset
+
+    async def _collect(self, queue, journal):
+        frontier = self.frontier
+        print(f"[{queue}] 작업 상태: {frontier.counts(queue)}")
+        while batch := frontier.claim(queue, self.batch_size):
+            urls = [url for url, _ in batch]
+            try:
+                results, failed = await self.detail(queue, batch, journal)
+                # 배치마다 디스크에 확실히 기록
+                journal.sync()
+                # 바뀌지 않아 건너뛴 작품도 처리 완료로 본다
+                frontier.fail(failed, error='추출 실패')
+                frontier.complete(set(urls) - set(failed))
+                print(f"[{queue}] 수집 {len(results)}개, 작업 상태: {frontier.counts(queue)}")
+            except LoginRequired:
+                # 로그인 없이는 남은 배치도 모두 실패하므로 멈춘다
+                # 빌린 URL은 바로 돌려줘서 임대가 끝날 때까지 다른 작업자가 못 가져가는 일이 없게 한다
+                frontier.release(urls)
+                raise
+            except Exception as e:
+                # 수집한 작품은 이미 저널에 기록되어 있음
+                print(f"[{queue}] 수집 오류: {e}")
+                frontier.fail(urls, error=str(e))
+
+    async def run(self):
+        os.makedirs('data', exist_ok=True)
+        # 수집 결과는 레코드마다 저널에 추가 (기존 pickle은 처음 한 번만 저널로 옮김)
+        journal = open_journal(self.name, seed_path=self.data_path)
+        # URL 상태는 작업 목록에 저장 (여러 프로세스가 같은 목록에서 나눠 가져감)
+        self.frontier = Frontier(lease_seconds=self.lease_seconds)
+        seen = open_seen(self.name, journal)
+        try:
+            if not self.worker:
+                await self.auth()
+                seen.begin_run()
+                new_links = await self.listing(self.frontier, seen)
+                print(f"[{self.name}] 새로 찾은 링크: {len(new_links)}개")
+            for queue in self.queues:
+                await self._collect(queue, journal)
+        finally:
+            if self.worker:
+                self.frontier.close()
+                journal.close()
+            else:
+                # 다른 작업자들이 저널에 쓰기를 마친 뒤에 합쳐서 내보내기 (실행마다 한 번)
+                for queue in self.queues:
+                    await self.frontier.wait_idle_async(queue)
+                self.frontier.close()
+                all_data = self.export(journal)
+                seen.update(data['url'] for data in all_data)
+                seen.flush()
+                print(f"[{self.name}] 총 {len(all_data)}개 데이터, "
+                      f"이번 실행에서 새로 수집: {len(seen.new_since_last_run(data['url'] for data in all_data))}개")
@@ -0,0 +1,199 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+# 플랫폼별 요청 속도 설정 (rate 단위: 초당 요청 수)
+DEFAULT_RATE_CONFIG = {
+    'initial_rate': 1.0,     # 시작 속도
+    'min_rate': 0.1,         # 최저 속도
+    'max_rate': 4.0,         # 최고 속도
+    'burst': 1,              # 한 번에 몰아서 보낼 수 있는 요청 수
+    'increase': 0.05,        # 정상 응답마다 더하는 속도 (additive increase)
+    'decrease': 0.5,         # 실패/지연 시 곱하는 비율 (multiplicative decrease)
+    'slow_seconds': 10.0,    # 이보다 오래 걸린 응답은 서버 부하로 간주 (브라우저 렌더링 포함)
+    'backoff_seconds': 10.0, # 429/5xx 응답 후 해당 호스트 전체를 쉬는 시간
+}
+
+PLATFORM_RATE_CONFIG = {
+    'naver': {
+        'hosts': ['series.naver.com'],
+        'initial_rate': 1.0,
+        'max_rate': 4.0,
+        'burst': 2,
+    },
+    'novelpia': {
+        'hosts': ['novelpia.com'],
+        'initial_rate': 0.5,
+        'max_rate': 2.0,
+    },
+    'kakao': {
+        'hosts': ['page.kakao.com', 'bff-page.kakao.com'],
+        'initial_rate': 0.5,
+        'max_rate': 3.0,
+        'backoff_seconds': 30.0,
+    },
+    'munpia': {
+        'hosts': ['novel.munpia.com'],
+        'initial_rate': 0.3,
+        'max_rate': 1.0,
+    },
+}
+
+
+class HostRateLimiter:
+    """호스트 하나에 대한 토큰 버킷 + AIMD 속도 조절기
+
+    요청 시각을 미리 예약하는 방식(GCRA)이라 락 없이 이벤트 루프 안에서 동작한다.
+    정상 응답이 이어지면 속도를 조금씩 올리고, 429/5xx/느린 응답이 오면 절반으로 줄인다.
+    """
+
+    def __init__(self, host, initial_rate=1.0, min_rate=0.1, max_rate=4.0, burst=1,
+                 increase=0.05, decrease=0.5, slow_seconds=10.0, backoff_seconds=10.0):
+        self.host = host
+        self.rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_seconds = slow_seconds
+        self.backoff_seconds = backoff_seconds
+
+        self.next_slot = 0.0
+        self.backoff_until = 0.0
+        self.waiting = 0
+        self.requests = 0
+        self.backoff_events = 0
+
+    # 다음 요청 시각 예약 후 대기 시간 반환
+    def _reserve(self):
+        now = time.monotonic()
+        interval = 1 / self.rate
+        earliest = max(self.next_slot, now - (self.burst - 1) * interval)
+        start = max(earliest, self.backoff_until, now)
+        self.next_slot = start + interval
+        return start - now
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            while True:
+                await asyncio.sleep(self._reserve())
+                # 대기 중에 백오프가 걸렸으면 다시 예약
+                if time.monotonic() >= self.backoff_until:
+                    break
+        finally:
+            self.waiting -= 1
+
+    def acquire_sync(self):
+        self.waiting += 1
+        try:
+            while True:
+                time.sleep(self._reserve())
+                if time.monotonic() >= self.backoff_until:
+                    break
+        finally:
+            self.waiting -= 1
+
+    def feedback(self, status, latency):
+        """응답 결과 반영. status가 None이면 네트워크 오류로 취급"""
+        self.requests += 1
+        throttled = status is None or status == 429 or status >= 500
+
+        if throttled or latency > self.slow_seconds:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.backoff_events += 1
+            if throttled:
+                self.backoff_until = time.monotonic() + self.backoff_seconds
+        elif status < 400:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def stats(self):
+        return {
+            'host': self.host,
+            'rate': round(self.rate, 2),
+            'requests': self.requests,
+            'backoff_events': self.backoff_events,
+            'queue_depth': self.waiting,
+        }
+
+
+class RateLimiter:
+    """호스트별 HostRateLimiter 모음. 설정은 PLATFORM_RATE_CONFIG를 따른다."""
+
+    def __init__(self, platforms=None, overrides=None):
+        platforms = PLATFORM_RATE_CONFIG if platforms is None else platforms
+        self._configs = {}
+        for platform, config in platforms.items():
+            config = {**config, **(overrides or {}).get(platform, {})}
+            for host in config.pop('hosts'):
+                self._configs[host] = config
+        self._limiters = {}
+
+    # 호스트별 조절기 가져오기 (서브도메인은 상위 도메인 설정을 따름)
+    def for_url(self, url):
+        host = urlsplit(url).netloc or url
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            config = DEFAULT_RATE_CONFIG
+            for name, host_config in self._configs.items():
+                if host == name or host.endswith('.' + name):
+                    config = {**DEFAULT_RATE_CONFIG, **host_config}
+                    break
+            limiter = HostRateLimiter(host, **config)
+            self._limiters[host] = limiter
+        return limiter
+
+    async def acquire(self, url):
+        await self.for_url(url).acquire()
+
+    def acquire_sync(self, url):
+        self.for_url(url).acquire_sync()
+
+    def feedback(self, url, status, latency):
+        self.for_url(url).feedback(status, latency)
+
+    async def goto(self, page, url, **kwargs):
+        """Playwright page.goto를 속도 제한 아래에서 실행하고 응답 결과를 반영"""
+        await self.acquire(url)
+        started = time.monotonic()
+        status = None
+        try:
+            response = await page.goto(url, **kwargs)
+            status = response.status if response else 200
+            return response
+        finally:
+            self.feedback(url, status, time.monotonic() - started)
+
+    def stats(self):
+        return [limiter.stats() for limiter in self._limiters.values()]
+
+    def format_stats(self):
+        """tqdm 등에 표시할 한 줄 요약"""
+        return ' | '.join(
+            f"{s['host']} {s['rate']}/s 대기 {s['queue_depth']} 백오프 {s['backoff_events']}"
+            for s in self.stats()
+        )
+
+
+# 프로세스 안에서 같이 쓰는 조절기 (배치/플랫폼마다 새로 만들면 학습한 속도와 백오프가 사라진다)
+_shared_limiter = None
+
+
+def shared_limiter():
+    """이 프로세스의 공용 RateLimiter. 처음 부를 때 만든다"""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter()
+    return _shared_limiter
+
+
+def apply_rate_overrides(overrides):
+    """{platform: {설정: 값}}을 플랫폼 기본 설정에 덮어쓴다. 이후에 만드는 모든 RateLimiter에 적용된다"""
+    global _shared_limiter
+    for platform, config in overrides.items():
+        PLATFORM_RATE_CONFIG.setdefault(platform, {'hosts': []}).update(config)
+    # 공용 조절기는 바뀐 설정으로 다시 만든다
+    if overrides:
+        _shared_limiter = None
@@ -0,0 +1,164 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+
+DAY = 24 * 60 * 60
+
+# 자주 바뀌는 필드. 이 값들의 해시가 달라졌을 때만 '변경'으로 센다
+VOLATILE_FIELDS = ['title', 'serial', 'page_count', 'page_unit', 'rating', 'viewers', 'recommend', 'summary']
+
+# 관측 기록이 없을 때 가정하는 변경 주기 (초)
+PRIOR_INTERVALS = {
+    '연재중': 1 * DAY,
+    '완결': 30 * DAY,
+}
+DEFAULT_PRIOR_INTERVAL = 7 * DAY
+
+# 플랫폼별 한 번 실행에 다시 방문할 작품 수
+PLATFORM_BUDGETS = {
+    'naver': 20000,
+    'novelpia': 10000,
+    'kakao': 10000,
+    'munpia': 5000,
+}
+
+
+def fingerprint(record):
+    values = [record.get(field) for field in VOLATILE_FIELDS]
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+
+class RecrawlScheduler:
+    """작품별 변경 빈도를 학습해서 다시 방문할 작품과 순서를 정하는 스케줄러
+
+    방문할 때마다 변경 여부를 기록하고, 변경률은 (변경 횟수 + 1) / (관측 시간 + 사전 주기)로 추정한다.
+    사전 주기는 연재 상태로 정한다 (연재중 1일, 완결 30일). 다음 방문 시각은 1 / 변경률 뒤이며
+    [min_interval, max_interval] 범위로 자른다. plan()은 방문할 때가 된 작품을
+    '그동안 놓쳤을 변경 수'(변경률 × 마지막 방문 후 경과 시간) 순으로 예산만큼 고른다.
+
+    사용 예:
+        scheduler = RecrawlScheduler()
+        scheduler.register('naver', records)
+        urls = scheduler.plan('naver')
+        ...
+        scheduler.observe('naver', url, new_record)   # 바뀌지 않았으면 new_record=None
+    """
+
+    def __init__(self, path='data/recrawl.sqlite', budgets=None, min_interval=6 * 60 * 60,
+                 max_interval=90 * DAY):
+        self.budgets = {**PLATFORM_BUDGETS, **(budgets or {})}
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+        self._db = sqlite3.connect(path)
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS visits (
+                url TEXT PRIMARY KEY,
+                platform TEXT NOT NULL,
+                fingerprint TEXT,
+                prior_seconds REAL NOT NULL,
+                observed_seconds REAL NOT NULL DEFAULT 0,
+                changes INTEGER NOT NULL DEFAULT 0,
+                visits INTEGER NOT NULL DEFAULT 1,
+                last_visit REAL NOT NULL,
+                next_visit REAL NOT NULL
+            )
+        ''')
+        self._db.execute('CREATE INDEX IF NOT EXISTS visits_due ON visits (platform, next_visit)')
+        self._db.commit()
+
+    def _interval(self, changes, observed_seconds, prior_seconds):
+        rate = (changes + 1) / (observed_seconds + prior_seconds)
+        return min(max(1 / rate, self.min_interval), self.max_interval)
+
+    def register(self, platform, records, now=None):
+        """아직 모르는 작품을 등록 (수집 시각을 마지막 방문으로 본다). 새로 등록한 개수 반환"""
+        now = now or time.time()
+        rows = []
+        for record in records:
+            prior = PRIOR_INTERVALS.get(record.get('serial'), DEFAULT_PRIOR_INTERVAL)
+            rows.append((record['url'], platform, fingerprint(record), prior, now,
+                         now + self._interval(0, 0, prior)))
+        before = self._db.total_changes
+        self._db.executemany(
+            'INSERT OR IGNORE INTO visits (url, platform, fingerprint, prior_seconds, last_visit, next_visit) '
+            'VALUES (?, ?, ?, ?, ?, ?)', rows
+        )
+        self._db.commit()
+        return self._db.total_changes - before
+
+    def plan(self, platform, budget=None, now=None):
+        """방문할 때가 된 작품 URL을 우선순위 순으로 최대 budget개 반환"""
+        now = now or time.time()
+        budget = budget or self.budgets.get(platform, 10000)
+        rows = self._db.execute(
+            'SELECT url FROM visits WHERE platform = ? AND next_visit <= ? '
+            'ORDER BY (changes + 1.0) / (observed_seconds + prior_seconds) * (? - last_visit) DESC LIMIT ?',
+            (platform, now, now, budget)
+        ).fetchall()
+        return [url for url, in rows]
+
+    def batches(self, platform, batch_size=500, budget=None):
+        """plan() 결과를 우선순위 순서대로 batch_size개씩"""
+        urls = self.plan(platform, budget)
+        for i in range(0, len(urls), batch_size):
+            yield urls[i: i + batch_size]
+
+    def observe(self, platform, url, record=None, now=None):
+        """방문 결과 기록. record가 None이면 (304/같은 본문) 바뀌지 않은 것으로 본다"""
+        self.observe_many(platform, [(url, record)], now)
+
+    def observe_many(self, platform, outcomes, now=None):
+        """[(url, record 또는 None)] 방문 결과를 한 트랜잭션으로 기록"""
+        now = now or time.time()
+        new_records = []
+        for url, record in outcomes:
+            if not self._observe(url, record, now) and record is not None:
+                new_records.append(record)
+        self._db.commit()
+        if new_records:
+            self.register(platform, new_records, now)
+
+    def _observe(self, url, record, now):
+        row = self._db.execute(
+            'SELECT fingerprint, prior_seconds, observed_seconds, changes, visits, last_visit '
+            'FROM visits WHERE url = ?', (url,)
+        ).fetchone()
+        if row is None:
+            return False
+
+        old_fingerprint, prior, observed, changes, visits, last_visit = row
+        new_fingerprint = old_fingerprint
+        if record is not None:
+            new_fingerprint = fingerprint(record)
+            # 연재 상태가 바뀌면 (연재중 → 완결) 사전 주기도 바꾼다
+            prior = PRIOR_INTERVALS.get(record.get('serial'), prior)
+        if new_fingerprint != old_fingerprint:
+            changes += 1
+        observed += max(now - last_visit, 0)
+
+        self._db.execute(
+            'UPDATE visits SET fingerprint = ?, prior_seconds = ?, observed_seconds = ?, changes = ?, '
+            'visits = ?, last_visit = ?, next_visit = ? WHERE url = ?',
+            (new_fingerprint, prior, observed, changes, visits + 1, now,
+             now + self._interval(changes, observed, prior), url)
+        )
+        return True
+
+    def stats(self, platform, now=None):
+        now = now or time.time()
+        total, due, changes, visits = self._db.execute(
+            'SELECT COUNT(*), SUM(next_visit <= ?), SUM(changes), SUM(visits) FROM visits WHERE platform = ?',
+            (now, platform)
+        ).fetchone()
+        return {
+            'works': total,
+            'due': due or 0,
+            'budget': self.budgets.get(platform),
+            'change_ratio': round((changes or 0) / max(visits or 0, 1), 3),
+        }
+
+    def close(self):
+        self._db.close()
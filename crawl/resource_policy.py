@@ -0,0 +1,109 @@
+import asyncio
+from collections import Counter
+from urllib.parse import urlsplit
+
+
+# 어느 플랫폼에서나 필요 없는 광고/분석 도메인
+TRACKER_DOMAINS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'adservice.google.com',
+    'facebook.net',
+    'criteo.com',
+    'criteo.net',
+]
+
+# 플랫폼별 라우팅 규칙
+# block_types: 막을 리소스 타입 (Playwright request.resource_type 기준)
+# block_domains: 막을 도메인 (서브도메인 포함)
+# allow_domains: block_* 에 걸려도 통과시킬 도메인
+ROUTING_RULES = {
+    'default': {
+        'block_types': ['image', 'media', 'font'],
+        'block_domains': TRACKER_DOMAINS,
+        'allow_domains': [],
+    },
+    'naver': {
+        'block_types': ['image', 'media', 'font'],
+        'block_domains': TRACKER_DOMAINS + ['wcs.naver.net', 'lcs.naver.com', 'siape.veta.naver.com'],
+        # 로그인 페이지 스크립트는 막으면 안 됨
+        'allow_domains': ['nid.naver.com'],
+    },
+    'kakao': {
+        'block_types': ['image', 'media', 'font'],
+        'block_domains': TRACKER_DOMAINS + ['tiara.kakao.com', 'stat.tiara.kakao.com', 'display.ad.daum.net'],
+        'allow_domains': [],
+    },
+    'novelpia': {
+        'block_types': ['image', 'media', 'font'],
+        'block_domains': TRACKER_DOMAINS,
+        'allow_domains': [],
+    },
+    'munpia': {
+        'block_types': ['image', 'media', 'font'],
+        'block_domains': TRACKER_DOMAINS,
+        'allow_domains': [],
+    },
+}
+
+
+def _match_domain(host, domains):
+    return any(host == domain or host.endswith('.' + domain) for domain in domains)
+
+
+class RoutingPolicy:
+    """Playwright 페이지/컨텍스트에 걸어 무거운 리소스와 트래커 요청을 막는 규칙
+
+    이미지는 src 속성만 읽으면 되므로 내려받을 필요가 없다.
+    사용 예:
+        policy = RoutingPolicy('kakao')
+        await policy.apply(page)   # 또는 context
+    """
+
+    def __init__(self, platform='default'):
+        rules = ROUTING_RULES.get(platform, ROUTING_RULES['default'])
+        self.block_types = set(rules['block_types'])
+        self.block_domains = rules['block_domains']
+        self.allow_domains = rules['allow_domains']
+        self.counts = Counter()
+
+    def is_blocked(self, url, resource_type):
+        host = urlsplit(url).netloc
+        if _match_domain(host, self.allow_domains):
+            return False
+        return resource_type in self.block_types or _match_domain(host, self.block_domains)
+
+    async def _handle(self, route):
+        request = route.request
+        if self.is_blocked(request.url, request.resource_type):
+            self.counts['blocked'] += 1
+            await route.abort()
+        else:
+            self.counts['allowed'] += 1
+            await route.continue_()
+
+    async def apply(self, target):
+        """page 또는 browser context에 규칙 등록"""
+        await target.route('**/*', self._handle)
+
+    def stats(self):
+        return dict(self.counts)
+
+
+async def wait_for_fields(page, selector_groups, timeout=15000):
+    """networkidle 대신, 추출할 필드들이 DOM에 나타날 때까지만 기다린다
+
+    selector_groups: 필드마다 fallback XPath 목록. 그룹 안에서는 하나만 나타나면 된다.
+    시간 안에 나타나지 않아도 예외를 올리지 않고 False를 반환한다 (추출 단계에서 누락 처리).
+    """
+    async def wait_group(selectors):
+        union = ' | '.join(s[6:] if s.startswith('xpath=') else s for s in selectors)
+        await page.wait_for_selector(f'xpath={union}', state='attached', timeout=timeout)
+
+    try:
+        await asyncio.gather(*(wait_group(selectors) for selectors in selector_groups))
+        return True
+    except Exception:
+        return False
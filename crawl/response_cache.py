@@ -0,0 +1,134 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ResponseCache:
+    """압축된 내용 주소 기반(content-addressed) HTTP 응답 저장소
+
+    본문은 sha256 해시 이름으로 zlib 압축해 objects/ 아래에 한 번만 저장하고,
+    (url, 수집 시각) → 해시 인덱스는 SQLite에 기록한다. 같은 본문을 여러 번 받아도 디스크는 한 번만 쓴다.
+    ttl(초)이 지난 기록과 max_bytes를 넘는 오래된 기록은 evict()에서 정리된다.
+    """
+
+    def __init__(self, root='data/http_cache', ttl=30 * 24 * 3600, max_bytes=2 * 1024 ** 3):
+        self.root = root
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, 'objects'), exist_ok=True)
+
+        # fetcher의 스레드 풀에서 동시에 쓰므로 락으로 보호
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'), check_same_thread=False)
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS responses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                status INTEGER,
+                digest TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_url ON responses (url, fetched_at);
+            CREATE TABLE IF NOT EXISTS blobs (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        ''')
+
+    def _blob_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:])
+
+    def put(self, url, body, status=200, fetched_at=None):
+        """응답 본문 저장 후 해시 반환"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._blob_path(digest)
+        fetched_at = time.time() if fetched_at is None else fetched_at
+
+        with self._lock:
+            exists = self._db.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone()
+            if not exists:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                data = zlib.compress(body, 6)
+                tmp_path = path + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+                self._db.execute('INSERT INTO blobs (digest, size) VALUES (?, ?)', (digest, len(data)))
+            self._db.execute(
+                'INSERT INTO responses (url, fetched_at, status, digest) VALUES (?, ?, ?, ?)',
+                (url, fetched_at, status, digest)
+            )
+            self._db.commit()
+        return digest
+
+    def read_blob(self, digest):
+        with open(self._blob_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def latest(self, url, max_age=None):
+        """url의 가장 최근 본문. 없거나 max_age(초)보다 오래됐으면 None"""
+        with self._lock:
+            row = self._db.execute(
+                'SELECT digest, fetched_at FROM responses WHERE url = ? AND status = 200 '
+                'ORDER BY fetched_at DESC LIMIT 1', (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        digest, fetched_at = row
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return None
+        return self.read_blob(digest)
+
+    def iter_latest(self, url_pattern='%'):
+        """url_pattern(SQL LIKE)에 맞는 url마다 가장 최근 200 응답 본문을 (url, body)로 반환"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT url, digest, MAX(fetched_at) FROM responses '
+                'WHERE url LIKE ? AND status = 200 GROUP BY url', (url_pattern,)
+            ).fetchall()
+        for url, digest, _ in rows:
+            try:
+                yield url, self.read_blob(digest)
+            except FileNotFoundError:
+                continue
+
+    def total_bytes(self):
+        with self._lock:
+            return self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def evict(self):
+        """ttl이 지난 기록을 지우고, 용량이 max_bytes를 넘으면 오래된 기록부터 삭제"""
+        with self._lock:
+            self._db.execute('DELETE FROM responses WHERE fetched_at < ?', (time.time() - self.ttl,))
+
+            total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+            if total > self.max_bytes:
+                # 각 본문이 마지막으로 쓰인 시각 순서로 지운다
+                rows = self._db.execute(
+                    'SELECT b.digest, b.size FROM blobs b JOIN responses r ON r.digest = b.digest '
+                    'GROUP BY b.digest ORDER BY MAX(r.fetched_at)'
+                ).fetchall()
+                for digest, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self._db.execute('DELETE FROM responses WHERE digest = ?', (digest,))
+                    total -= size
+
+            # 참조가 없어진 본문 파일 정리
+            orphans = self._db.execute(
+                'SELECT digest FROM blobs WHERE digest NOT IN (SELECT DISTINCT digest FROM responses)'
+            ).fetchall()
+            for (digest,) in orphans:
+                try:
+                    os.remove(self._blob_path(digest))
+                except FileNotFoundError:
+                    pass
+                self._db.execute('DELETE FROM blobs WHERE digest = ?', (digest,))
+            self._db.commit()
+
+    def close(self):
+        self.evict()
+        self._db.close()
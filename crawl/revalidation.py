@@ -0,0 +1,80 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+
+class ValidatorStore:
+    """URL별 재검증 정보(ETag, Last-Modified, 본문 해시) 저장소
+
+    conditional_headers()로 조건부 GET 헤더를 만들고, is_unchanged()로
+    304 응답이나 지난번과 같은 본문인지 판단한다. 추출까지 성공한 응답만 remember()로 기록해서,
+    추출에 실패한 페이지가 '변경 없음'으로 영영 건너뛰어지는 일이 없게 한다.
+    """
+
+    def __init__(self, path='data/validators.sqlite'):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS validators (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT,
+                checked_at REAL
+            )
+        ''')
+        self._db.commit()
+
+    def get(self, url):
+        with self._lock:
+            return self._db.execute(
+                'SELECT etag, last_modified, body_hash FROM validators WHERE url = ?', (url,)
+            ).fetchone()
+
+    def conditional_headers(self, url):
+        row = self.get(url)
+        headers = {}
+        if row is None:
+            return headers
+        etag, last_modified, _ = row
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def is_unchanged(self, url, response):
+        """304이거나 본문 해시가 지난번과 같으면 True"""
+        row = self.get(url)
+        if row is None:
+            return False
+        if response.status_code == 304:
+            self._touch(url)
+            return True
+        # 스트리밍으로 중간에 끊은 본문은 해시를 비교할 수 없다 (ETag/Last-Modified만 사용)
+        if getattr(response, 'truncated', False):
+            return False
+        if response.status_code == 200 and row[2] and hashlib.sha256(response.content).hexdigest() == row[2]:
+            self._touch(url)
+            return True
+        return False
+
+    def _touch(self, url):
+        with self._lock:
+            self._db.execute('UPDATE validators SET checked_at = ? WHERE url = ?', (time.time(), url))
+            self._db.commit()
+
+    def remember(self, url, response):
+        """추출에 성공한 응답의 검증 정보 기록 (중간에 끊은 응답은 본문 해시 없이 ETag/Last-Modified만)"""
+        body_hash = None if getattr(response, 'truncated', False) else hashlib.sha256(response.content).hexdigest()
+        with self._lock:
+            self._db.execute(
+                'INSERT OR REPLACE INTO validators (url, etag, last_modified, body_hash, checked_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body_hash, time.time())
+            )
+            self._db.commit()
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import math
+import os
+import time
+from array import array
+
+
+def url_hash(url):
+    """URL의 64비트 해시"""
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class BloomFilter:
+    """고정 크기 비트 배열 Bloom 필터. 없는 URL을 있다고 할 확률이 error_rate 정도다"""
+
+    def __init__(self, capacity=1_000_000, error_rate=0.001, bits=None, num_hashes=None):
+        if bits is None:
+            size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+            bits = bytearray((size + 7) // 8)
+        self.bits = bits
+        self.size = len(bits) * 8
+        self.num_hashes = num_hashes or max(1, round(self.size / capacity * math.log(2)))
+
+    def _positions(self, url):
+        digest = hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.num_hashes)]
+
+    def add(self, url):
+        for position in self._positions(url):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, url):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(url))
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.num_hashes.to_bytes(4, 'little'))
+            f.write(self.bits)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            num_hashes = int.from_bytes(f.read(4), 'little')
+            bits = bytearray(f.read())
+        return cls(bits=bits, num_hashes=num_hashes)
+
+
+class SeenSet:
+    """플랫폼별로 이미 수집한 URL 집합 (data/seen/{platform}.idx 에 64비트 해시로 저장)
+
+    리스트에서 `url not in cache_urls`를 찾는 대신 해시 집합으로 O(1) 검사한다.
+    해시 파일은 추가만 하고, 실행을 시작할 때의 위치를 기록해 두어
+    new_since_last_run()으로 직전 실행에서 새로 수집한 URL을 골라낼 수 있다.
+    bloom=True면 정확한 집합 대신 Bloom 필터를 메모리에 올린다 (아주 큰 목록용, 드물게 오탐).
+
+    사용 예:
+        seen = SeenSet('naver')
+        new_urls = seen.filter_new(urls)
+        ...
+        seen.update(collected_urls)
+        seen.flush()
+    """
+
+    def __init__(self, platform, root='data/seen', bloom=False, capacity=1_000_000, error_rate=0.001):
+        os.makedirs(root, exist_ok=True)
+        self.platform = platform
+        self.path = os.path.join(root, f'{platform}.idx')
+        self.runs_path = os.path.join(root, f'{platform}.runs.json')
+        self.bloom_path = os.path.join(root, f'{platform}.bloom')
+        self.use_bloom = bloom
+
+        self._hashes = array('Q')
+        if os.path.exists(self.path):
+            with open(self.path, 'rb') as f:
+                self._hashes.frombytes(f.read())
+
+        if bloom:
+            if os.path.exists(self.bloom_path):
+                self._bloom = BloomFilter.load(self.bloom_path)
+            else:
+                self._bloom = BloomFilter(max(capacity, len(self._hashes) * 2), error_rate)
+                # 해시만 저장되어 있으므로 해시 문자열로 필터를 채운다
+                for value in self._hashes:
+                    self._bloom.add(str(value))
+            self._set = None
+        else:
+            self._set = set(self._hashes)
+
+        self._pending = array('Q')
+        self._runs = []
+        if os.path.exists(self.runs_path):
+            with open(self.runs_path, 'r', encoding='utf-8') as f:
+                self._runs = json.load(f)
+
+    def __len__(self):
+        return len(self._hashes) + len(self._pending)
+
+    def _has(self, value):
+        if self._set is not None:
+            return value in self._set
+        return str(value) in self._bloom
+
+    def __contains__(self, url):
+        return self._has(url_hash(url))
+
+    def add(self, url):
+        """새 URL이면 추가하고 True 반환"""
+        value = url_hash(url)
+        if self._has(value):
+            return False
+        if self._set is not None:
+            self._set.add(value)
+        else:
+            self._bloom.add(str(value))
+        self._pending.append(value)
+        return True
+
+    def update(self, urls):
+        """여러 URL 추가. 새로 추가된 개수 반환"""
+        return sum(self.add(url) for url in urls)
+
+    def filter_new(self, urls, key=None):
+        """아직 수집하지 않은 것만 골라낸다. key: dict 목록이면 URL을 꺼낼 함수"""
+        if key is None:
+            return [url for url in urls if url not in self]
+        return [item for item in urls if key(item) not in self]
+
+    def begin_run(self):
+        """이번 실행의 시작 위치 기록 (new_since_last_run의 기준)"""
+        self.flush()
+        self._runs.append({'started_at': time.time(), 'offset': len(self._hashes)})
+        self._runs = self._runs[-20:]
+        with open(self.runs_path, 'w', encoding='utf-8') as f:
+            json.dump(self._runs, f)
+
+    def new_since_last_run(self, urls):
+        """urls 중 가장 최근 실행에서 새로 추가된 URL"""
+        if not self._runs:
+            return list(urls)
+        added = set(self._hashes[self._runs[-1]['offset']:]) | set(self._pending)
+        return [url for url in urls if url_hash(url) in added]
+
+    def flush(self):
+        """새로 추가된 해시를 파일 끝에 덧붙인다"""
+        if not self._pending:
+            return
+        with open(self.path, 'ab') as f:
+            self._pending.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        self._hashes.extend(self._pending)
+        self._pending = array('Q')
+        if self.use_bloom:
+            self._bloom.save(self.bloom_path)
+
+
+def open_seen(platform, journal=None, **kwargs):
+    """플랫폼의 SeenSet을 연다. 처음이면 저널에 있는 URL로 한 번 채운다"""
+    seen = SeenSet(platform, **kwargs)
+    if not len(seen) and journal is not None:
+        seen.update(journal.keys())
+        seen.flush()
+    return seen
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import os
+import time
+
+from fake_useragent import UserAgent
+from playwright.async_api import async_playwright
+from requests.cookies import RequestsCookieJar
+
+from browser_pool import LAUNCH_ARGS, DEFAULT_CONTEXT_OPTIONS
+
+
+# False면 로그인 중에 사용자 입력을 기다리지 않는다 (예약 실행 등 무인 실행용)
+_interactive = True
+
+
+def set_interactive(interactive):
+    global _interactive
+    _interactive = interactive
+
+
+def is_interactive():
+    return _interactive
+
+
+class LoginRequired(Exception):
+    """무인 실행 중에 사람이 로그인해야 하는 상황"""
+
+
+async def wait_for_login(page, required=(), timeout=300):
+    """브라우저에서 로그인이 끝날 때까지 대기
+
+    required 쿠키가 있으면 그 쿠키가 생길 때까지 기다린다 (자동 입력한 로그인이 그대로 통과하면 바로 끝남).
+    확인할 쿠키가 없으면 사용자가 Enter를 누를 때까지 기다리고, 무인 실행이면 LoginRequired를 던진다.
+    """
+    if required:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            names = {cookie['name'] for cookie in await page.context.cookies()}
+            if all(name in names for name in required):
+                return
+            await asyncio.sleep(1)
+        raise LoginRequired(f"{timeout}초 안에 로그인이 끝나지 않았습니다 (쿠키 {list(required)} 없음)")
+
+    if not _interactive:
+        raise LoginRequired("로그인 쿠키가 없거나 만료되었습니다. 대화형으로 한 번 로그인한 뒤 다시 실행하세요")
+    print("브라우저에서 로그인을 완료한 후 Enter를 눌러주세요...")
+    # 이벤트 루프를 막지 않고 대기
+    await asyncio.to_thread(input)
+
+
+class SessionBroker:
+    """브라우저로 한 번만 로그인하고, 그 쿠키를 파일로 저장해 HTTP 수집기에 넘겨주는 중개자
+
+    쿠키는 data/{platform}_cookies.json 에 저장하고, 저장한 지 max_age초가 지났거나
+    required 쿠키가 만료됐으면 다시 로그인한다. 수집 도중 로그인이 풀리면 refresh()로
+    한 번만 재로그인하고 (동시에 여러 요청이 감지해도) fetcher의 쿠키를 바꿔 끼운다.
+
+    사용 예:
+        broker = SessionBroker('naver', login=login_playwright, required=['NID_AUT', 'NID_SES'])
+        cookies = await broker.ensure()
+        async with AsyncFetcher(cookies=cookies) as fetcher:
+            ...
+            broker.save(fetcher.cookies)
+    """
+
+    def __init__(self, platform, login, path=None, max_age=12 * 60 * 60, required=(),
+                 start_url=None):
+        self.platform = platform
+        # login(page): 페이지에서 로그인을 끝내는 비동기 함수
+        self.login = login
+        self.path = path or f'data/{platform}_cookies.json'
+        self.max_age = max_age
+        self.required = required
+        # 로그인 후 쿠키를 꺼내기 전에 들를 페이지 (서비스 도메인 쿠키까지 받기 위해)
+        self.start_url = start_url
+
+        self._cookies = None
+        self._saved_at = 0
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self.logins = 0
+
+    def load(self):
+        """저장된 쿠키 불러오기. 없으면 None"""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._cookies = data['cookies']
+        self._saved_at = data['saved_at']
+        return self._cookies
+
+    def _write(self, cookies, saved_at):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': saved_at, 'cookies': cookies}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+        self._cookies = cookies
+        self._saved_at = saved_at
+
+    def is_fresh(self):
+        if not self._cookies:
+            return False
+        if time.time() - self._saved_at > self.max_age:
+            return False
+        now = time.time()
+        alive = {
+            cookie['name'] for cookie in self._cookies
+            if not cookie.get('expires') or cookie['expires'] < 0 or cookie['expires'] > now
+        }
+        return all(name in alive for name in self.required)
+
+    async def _login_and_export(self):
+        async with async_playwright() as playwright:
+            # 무인 실행이면 화면 없이 띄운다 (자동 입력으로 끝나는 로그인만 가능)
+            browser = await playwright.chromium.launch(headless=not _interactive, args=LAUNCH_ARGS)
+            try:
+                context = await browser.new_context(
+                    user_agent=UserAgent(platforms='desktop').random, **DEFAULT_CONTEXT_OPTIONS
+                )
+                page = await context.new_page()
+                await self.login(page)
+                if self.start_url:
+                    await page.goto(self.start_url)
+                cookies = await context.cookies()
+            finally:
+                await browser.close()
+
+        self._write(cookies, time.time())
+        self.logins += 1
+        print(f"[{self.platform}] 로그인 쿠키 {len(cookies)}개 저장: {self.path}")
+
+    def cookie_jar(self):
+        """Playwright 형식 쿠키를 requests 쿠키 저장소로 변환"""
+        jar = RequestsCookieJar()
+        for cookie in self._cookies or []:
+            expires = cookie.get('expires')
+            jar.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False),
+                expires=int(expires) if expires and expires > 0 else None,
+            )
+        return jar
+
+    def playwright_cookies(self):
+        """Playwright context.add_cookies()에 그대로 넘길 수 있는 쿠키 목록"""
+        return list(self._cookies or [])
+
+    async def ensure(self):
+        """유효한 쿠키가 없으면 로그인해서 만들고, 쿠키 저장소 반환"""
+        async with self._lock:
+            if self._cookies is None:
+                self.load()
+            if not self.is_fresh():
+                await self._login_and_export()
+                self._generation += 1
+        return self.cookie_jar()
+
+    async def refresh(self, fetcher, generation=None):
+        """로그인이 풀렸을 때 호출. 다른 요청이 이미 재로그인했으면 그 쿠키를 쓴다
+
+        generation: 요청을 보낼 때의 broker.generation 값
+        """
+        async with self._lock:
+            if generation is None or generation == self._generation:
+                await self._login_and_export()
+                self._generation += 1
+                fetcher.set_cookies(self.cookie_jar())
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def save(self, jar):
+        """수집 중 서버가 갱신해 준 쿠키까지 포함해서 다시 저장"""
+        cookies = [
+            {
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'secure': cookie.secure,
+                'expires': cookie.expires if cookie.expires is not None else -1,
+            }
+            for cookie in jar
+        ]
+        # 쿠키가 갱신됐을 뿐 로그인한 시각은 그대로
+        self._write(cookies, self._saved_at)
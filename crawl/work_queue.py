@@ -0,0 +1,146 @@
+import asyncio
+import time
+
+
+class WorkQueue:
+    """여러 워커가 하나의 asyncio 큐에서 작업을 가져가는 스케줄러 (work stealing)
+
+    고정 청크를 나눠 주는 대신 빈 워커가 다음 작업을 가져가므로, 느린 워커가 전체를 붙잡지 않는다.
+    handler(resource, item)이 None/빈 값을 돌려주거나 예외를 올리면 max_retries번까지 다시 큐에 넣는다.
+    워커는 실행 중에도 add_worker/remove_worker로 늘리고 줄일 수 있다.
+
+    사용 예:
+        queue = WorkQueue(handler)
+        queue.put_many(urls)
+        queue.add_worker(page1)
+        results = await queue.join()
+    """
+
+    def __init__(self, handler, max_retries=2, on_result=None):
+        self.handler = handler
+        self.max_retries = max_retries
+        # 작업 하나가 끝날 때마다 on_result(worker_name, item, result, final) 호출 (진행률 표시용)
+        # final: 재시도로 다시 큐에 들어가지 않고 끝난 작업이면 True
+        self.on_result = on_result
+
+        self.queue = asyncio.Queue()
+        self.results = []
+        self.failed = []
+        self._workers = {}
+        # 살아 있는 워커 수. 0이 되면 이벤트를 켜서 join()이 남은 작업을 무한정 기다리지 않게 한다
+        self._live = 0
+        self._no_workers = asyncio.Event()
+        self._no_workers.set()
+
+    def put_many(self, items):
+        for item in items:
+            self.queue.put_nowait((item, 0))
+
+    def add_worker(self, resource, name=None):
+        """resource(예: 로그인된 page)를 쓰는 워커 추가. 워커 이름 반환"""
+        name = name or f'worker-{len(self._workers) + 1}'
+        state = {
+            'stop': False,
+            'idle': True,
+            'done': 0,
+            'failed': 0,
+            'retried': 0,
+            'busy_seconds': 0.0,
+            'started': time.monotonic(),
+        }
+        self._workers[name] = state
+        state['task'] = asyncio.create_task(self._run_worker(name, resource, state))
+        self._live += 1
+        self._no_workers.clear()
+        state['task'].add_done_callback(self._worker_exited)
+        return name
+
+    def _worker_exited(self, task):
+        self._live -= 1
+        if self._live == 0:
+            self._no_workers.set()
+
+    def remove_worker(self, name):
+        """하던 작업은 마치고 멈추게 한다. 대기 중이면 바로 멈춘다"""
+        state = self._workers[name]
+        state['stop'] = True
+        if state['idle']:
+            state['task'].cancel()
+
+    async def _run_worker(self, name, resource, state):
+        while not state['stop']:
+            state['idle'] = True
+            item, attempt = await self.queue.get()
+            state['idle'] = False
+
+            started = time.monotonic()
+            try:
+                result = await self.handler(resource, item)
+            except Exception as e:
+                print(f"\n{name} 오류: {e}")
+                result = None
+            state['busy_seconds'] += time.monotonic() - started
+
+            final = True
+            if result:
+                self.results.append(result)
+                state['done'] += 1
+            elif attempt < self.max_retries:
+                self.queue.put_nowait((item, attempt + 1))
+                state['retried'] += 1
+                final = False
+            else:
+                self.failed.append(item)
+                state['failed'] += 1
+
+            self.queue.task_done()
+            if self.on_result is not None:
+                self.on_result(name, item, result, final)
+
+    async def join(self):
+        """큐가 빌 때까지 기다린 뒤 워커를 멈추고 결과 반환
+
+        워커가 하나도 없거나 모두 멈춰서 남은 작업을 처리할 수 없으면, 남은 작업을 failed로 옮기고 바로 반환한다.
+        """
+        finished = asyncio.ensure_future(self.queue.join())
+        no_workers = asyncio.ensure_future(self._no_workers.wait())
+        await asyncio.wait([finished, no_workers], return_when=asyncio.FIRST_COMPLETED)
+        no_workers.cancel()
+        if not finished.done():
+            finished.cancel()
+            self._fail_pending()
+
+        for state in self._workers.values():
+            state['stop'] = True
+            state['task'].cancel()
+        await asyncio.gather(*(state['task'] for state in self._workers.values()), return_exceptions=True)
+        return self.results
+
+    def _fail_pending(self):
+        """처리할 워커가 없어 큐에 남은 작업을 실패로 기록"""
+        count = 0
+        while not self.queue.empty():
+            item, _ = self.queue.get_nowait()
+            self.failed.append(item)
+            self.queue.task_done()
+            count += 1
+        if count:
+            print(f"\n남은 워커가 없어 {count}개 작업을 실패로 처리")
+
+    def stats(self):
+        """워커별 처리량 (건/분)"""
+        now = time.monotonic()
+        return {
+            name: {
+                'done': state['done'],
+                'failed': state['failed'],
+                'retried': state['retried'],
+                'busy_seconds': round(state['busy_seconds'], 1),
+                'per_minute': round(state['done'] / max(now - state['started'], 1e-9) * 60, 2),
+                'active': not state['stop'],
+            }
+            for name, state in self._workers.items()
+        }
+
+    def pending(self):
+        return self.queue.qsize()
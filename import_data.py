@@ -8,7 +8,9 @@ import pickle
 import mysql.connector
 import os
 from tqdm import tqdm
-import re
+from process.dataset import Dataset
+from process.manifest import DELTA_PATH, load_delta
+from process.numeric import normalize_columns
 
 def create_connection():
     """MySQL 연결 생성"""
@@ -28,9 +30,13 @@ def create_connection():
         return None
 
 def load_data(file_path):
-    """데이터 파일 로드 (pickle 또는 json)"""
+    """데이터 파일 로드 (컬럼 데이터셋 디렉터리, pickle 또는 json)"""
     try:
-        if file_path.endswith('.data'):
+        if os.path.isdir(file_path):
+            data = list(Dataset(file_path).records())
+            print(f"✓ 데이터셋 로드 성공: {len(data)}개 항목")
+            return data
+        elif file_path.endswith('.data'):
             with open(file_path, 'rb') as f:
                 data = pickle.load(f)
                 print(f"✓ Pickle 파일 로드 성공: {len(data)}개 항목")
@@ -47,26 +53,17 @@ def load_data(file_path):
         print(f"✗ 파일 로드 실패 {file_path}: {e}")
         return []
 
-def clean_number(value, default=0):
-    """숫자 데이터 정리"""
-    if value is None:
-        return default
-    try:
-        # 숫자가 아닌 문자 제거
-        cleaned = re.sub(r'[^0-9]', '', str(value))
-        return int(cleaned) if cleaned else default
-    except:
-        return default
-
 def clean_data(data):
     """데이터 정리 및 검증"""
     cleaned_data = []
+    items = [item for item in data if item and isinstance(item, dict)]
+
+    # 숫자 필드는 전체 목록을 한 번에 정리 ("1.2만" → 12000, 못 읽은 값은 0)
+    counts = {name: [item.get(name) for item in items] for name in ('recommend', 'page_count', 'viewers')}
+    normalize_columns(counts, list(counts), default=0)
     
     print("데이터 정리 중...")
-    for item in tqdm(data):
-        if not item or not isinstance(item, dict):
-            continue
-            
+    for i, item in enumerate(tqdm(items)):
         # 필수 필드 확인
         title = item.get('title', '').strip()
         author = item.get('author', '').strip()
@@ -75,9 +72,9 @@ def clean_data(data):
             continue
         
         # 숫자 필드 정리
-        recommend = clean_number(item.get('recommend'), 0)
-        page_count = clean_number(item.get('page_count'), 0)
-        viewers = clean_number(item.get('viewers'), 0)
+        recommend = counts['recommend'][i]
+        page_count = counts['page_count'][i]
+        viewers = counts['viewers'][i]
         
         # 키워드 정리
         keywords = item.get('keywords', '')
@@ -122,30 +119,43 @@ def clean_data(data):
     print(f"✓ 데이터 정리 완료: {len(cleaned_data)}개 유효 항목")
     return cleaned_data
 
-def insert_data_to_mysql(connection, data, table_name):
-    """MySQL에 데이터 삽입"""
-    cursor = connection.cursor()
-    
-    # 기존 데이터 삭제 (선택사항)
-    print(f"기존 {table_name} 데이터 삭제...")
-    cursor.execute(f"DELETE FROM {table_name}")
-    
-    # 삽입 쿼리
+def insert_query(table_name):
+    """테이블별 삽입 쿼리 (지원하지 않는 테이블이면 None)"""
     if table_name == 'novels':
-        query = """
+        return """
         INSERT INTO novels (
             url, img, title, author, recommend, genre, serial, publisher,
             summary, page_count, page_unit, age, platform, keywords, viewers
         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
     elif table_name == 'webtoons':
-        query = """
+        return """
         INSERT INTO webtoons (
             url, img, title, author, recommend, genre, serial, publisher,
             summary, page_count, page_unit, age, platform, keywords, viewers
         ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
         """
-    else:
+    return None
+
+def to_values(item):
+    return (
+        item['url'], item['img'], item['title'], item['author'],
+        item['recommend'], item['genre'], item['serial'], item['publisher'],
+        item['summary'], item['page_count'], item['page_unit'],
+        item['age'], item['platform'], item['keywords'], item['viewers']
+    )
+
+def insert_data_to_mysql(connection, data, table_name):
+    """MySQL에 데이터 삽입"""
+    cursor = connection.cursor()
+    
+    # 기존 데이터 삭제 (선택사항)
+    print(f"기존 {table_name} 데이터 삭제...")
+    cursor.execute(f"DELETE FROM {table_name}")
+    
+    # 삽입 쿼리
+    query = insert_query(table_name)
+    if query is None:
         print(f"✗ 지원하지 않는 테이블: {table_name}")
         return
     
@@ -154,16 +164,7 @@ def insert_data_to_mysql(connection, data, table_name):
     batch_size = 100
     for i in tqdm(range(0, len(data), batch_size)):
         batch = data[i:i+batch_size]
-        batch_values = []
-        
-        for item in batch:
-            values = (
-                item['url'], item['img'], item['title'], item['author'],
-                item['recommend'], item['genre'], item['serial'], item['publisher'],
-                item['summary'], item['page_count'], item['page_unit'],
-                item['age'], item['platform'], item['keywords'], item['viewers']
-            )
-            batch_values.append(values)
+        batch_values = [to_values(item) for item in batch]
         
         try:
             cursor.executemany(query, batch_values)
@@ -175,6 +176,40 @@ def insert_data_to_mysql(connection, data, table_name):
     print(f"✓ {table_name}에 {len(data)}개 데이터 삽입 완료!")
     cursor.close()
 
+def apply_delta_to_mysql(connection, table_name, delta_path):
+    """증분 전처리 변경분 반영 (삭제/변경 작품은 url로 지우고 추가/변경 작품을 다시 삽입)
+
+    삭제와 삽입을 한 트랜잭션으로 처리한다. 실패하면 되돌리고 예외를 올리며, 변경분 파일은 커밋이 끝난 뒤에만 지운다.
+    """
+    query = insert_query(table_name)
+    if query is None:
+        raise ValueError(f"지원하지 않는 테이블: {table_name}")
+
+    delta = load_delta(delta_path)
+    upserts = clean_data(delta['upserts'])
+    urls = delta['deletes'] + [item['url'] for item in delta['upserts']]
+
+    cursor = connection.cursor()
+    try:
+        print(f"{table_name}에서 변경/삭제된 {len(urls)}개 작품 삭제...")
+        for i in range(0, len(urls), 500):
+            chunk = urls[i:i+500]
+            cursor.execute(f"DELETE FROM {table_name} WHERE url IN ({', '.join(['%s'] * len(chunk))})", chunk)
+
+        print(f"{table_name}에 추가/변경된 {len(upserts)}개 작품 삽입 중...")
+        batch_size = 100
+        for i in tqdm(range(0, len(upserts), batch_size)):
+            cursor.executemany(query, [to_values(item) for item in upserts[i:i+batch_size]])
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    os.remove(delta_path)
+    print(f"✓ 변경분 적용 완료: 추가/변경 {len(upserts)}개, 삭제 {len(delta['deletes'])}개")
+
 def main():
     print("=== 크롤링 데이터를 MySQL에 삽입 ===")
     
@@ -190,7 +225,7 @@ def main():
     data_files = {
         'novelpia': 'novelpia_novel_data.data',
         'naver': 'naver_novel_data.data',
-        'all_data': 'all_data.json'
+        'all_data': 'all_data'
     }
     
     print("\\n사용 가능한 데이터 파일:")
@@ -204,9 +239,10 @@ def main():
     print("\\n어떤 데이터를 사용하시겠습니까?")
     print("1. novelpia_novel_data.data (노벨피아 소설)")
     print("2. naver_novel_data.data (네이버 소설)")
-    print("3. all_data.json (전체 데이터)")
+    print("3. all_data (전처리된 전체 데이터셋)")
+    print("4. all_data.delta (증분 전처리 변경분만 반영)")
     
-    choice = input("선택하세요 (1-3): ").strip()
+    choice = input("선택하세요 (1-4): ").strip()
     
     if choice == '1':
         filename = 'novelpia_novel_data.data'
@@ -215,8 +251,21 @@ def main():
         filename = 'naver_novel_data.data'
         table_name = 'novels'
     elif choice == '3':
-        filename = 'all_data.json'
+        filename = 'all_data'
         table_name = 'novels'  # 기본적으로 소설 테이블에 삽입
+    elif choice == '4':
+        delta_path = os.path.join(data_dir, os.path.basename(DELTA_PATH))
+        if not os.path.exists(delta_path):
+            print(f"✗ 적용할 변경분이 없습니다: {delta_path}")
+            return
+        try:
+            apply_delta_to_mysql(connection, 'novels', delta_path)
+        except mysql.connector.Error as err:
+            # 되돌린 상태이므로 변경분 파일은 남아 있고, 다시 실행하면 처음부터 적용된다
+            print(f"✗ 변경분 적용 오류: {err}")
+        finally:
+            connection.close()
+        return
     else:
         print("✗ 잘못된 선택입니다.")
         return
@@ -0,0 +1,332 @@
+import json
+import math
+import os
+import shutil
+import sys
+import zlib
+from array import array
+from glob import glob
+from itertools import accumulate
+
+
+MAGIC = b'NCOL1\n'
+
+# 소설 데이터 공통 스키마 (컬럼 → 타입: str, int, float, json)
+# 크롤러가 모은 수치 필드(추천수, 조회수, 회차 수)는 원본 문자열 그대로 둔다
+NOVEL_SCHEMA = {
+    'url': 'str',
+    'img': 'str',
+    'title': 'str',
+    'author': 'str',
+    'rating': 'str',
+    'recommend': 'str',
+    'genre': 'str',
+    'serial': 'str',
+    'publisher': 'str',
+    'summary': 'str',
+    'page_count': 'str',
+    'page_unit': 'str',
+    'age': 'str',
+    'platform': 'str',
+    'keywords': 'json',
+    'viewers': 'str',
+}
+
+_ARRAY_TYPES = {'int': 'q', 'float': 'd'}
+_PYTHON_TYPES = {'str': str, 'int': int, 'float': float}
+
+
+def _little_endian(values):
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _coerce(value, kind):
+    """스키마 타입으로 변환 (pandas의 NaN은 None으로)"""
+    if _is_missing(value):
+        return None
+    if kind == 'str':
+        return value if isinstance(value, str) else str(value)
+    if kind == 'int':
+        return int(value)
+    if kind == 'float':
+        return float(value)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _coerce_column(values, kind):
+    # 대부분 이미 맞는 타입이므로 그대로 두고 나머지만 변환
+    exact = _PYTHON_TYPES.get(kind)
+    return [value if value is None or type(value) is exact else _coerce(value, kind) for value in values]
+
+
+def _encode_column(values, kind, level):
+    """컬럼 하나를 [null 표시][본문] 형태로 압축. (블록, null 유무) 반환"""
+    nulls = bytearray(value is None for value in values)
+    has_nulls = any(nulls)
+    if kind in _ARRAY_TYPES:
+        body = _little_endian(array(_ARRAY_TYPES[kind], (0 if value is None else value for value in values))).tobytes()
+    else:
+        # 문자열은 (행 수 + 1)개의 글자 단위 오프셋 뒤에 전체를 이어 붙인 UTF-8 본문을 둔다
+        # (읽을 때 본문을 한 번에 디코딩하고 글자 단위로 잘라낸다)
+        values = ['' if value is None else value for value in values]
+        offsets = _little_endian(array('Q', accumulate(map(len, values), initial=0)))
+        body = offsets.tobytes() + ''.join(values).encode('utf-8')
+    return zlib.compress((bytes(nulls) if has_nulls else b'') + body, level), has_nulls
+
+
+def _decode_column(block, kind, rows, has_nulls):
+    raw = memoryview(zlib.decompress(block))
+    nulls = None
+    if has_nulls:
+        nulls = raw[:rows]
+        raw = raw[rows:]
+
+    if kind in _ARRAY_TYPES:
+        values = _little_endian(array(_ARRAY_TYPES[kind], raw.tobytes())).tolist()
+    else:
+        offsets = _little_endian(array('Q', raw[:8 * (rows + 1)].tobytes())).tolist()
+        text = str(raw[8 * (rows + 1):], 'utf-8')
+        values = [text[start:end] for start, end in zip(offsets, offsets[1:])]
+        if kind == 'json':
+            values = [json.loads(value) if value else None for value in values]
+
+    if nulls is not None:
+        values = [None if null else value for value, null in zip(values, nulls)]
+    return values
+
+
+def write_chunk(path, columns, schema, level=6):
+    """{컬럼: 값 목록}을 청크 파일 하나로 쓴다 (헤더에 컬럼별 위치를 적어서 필요한 컬럼만 읽을 수 있게)"""
+    rows = len(next(iter(columns.values()))) if columns else 0
+    blocks = []
+    header = {'rows': rows, 'columns': {}}
+    offset = 0
+    for name, kind in schema.items():
+        block, has_nulls = _encode_column(columns[name], kind, level)
+        header['columns'][name] = {'type': kind, 'offset': offset, 'length': len(block), 'nulls': has_nulls}
+        blocks.append(block)
+        offset += len(block)
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header_bytes).to_bytes(4, 'little'))
+        f.write(header_bytes)
+        for block in blocks:
+            f.write(block)
+    os.replace(tmp_path, path)
+
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f'컬럼 청크 파일이 아닙니다: {f.name}')
+    size = int.from_bytes(f.read(4), 'little')
+    header = json.loads(f.read(size))
+    header['data_start'] = len(MAGIC) + 4 + size
+    return header
+
+
+def read_chunk(path, columns=None):
+    """청크 파일에서 columns만 읽어 {컬럼: 값 목록} 반환 (다른 컬럼 블록은 건너뛴다)"""
+    with open(path, 'rb') as f:
+        header = read_header(f)
+        result = {}
+        for name in columns or header['columns']:
+            info = header['columns'].get(name)
+            if info is None:
+                # 스키마에 나중에 추가된 컬럼은 예전 청크에서 None
+                result[name] = [None] * header['rows']
+                continue
+            f.seek(header['data_start'] + info['offset'])
+            result[name] = _decode_column(f.read(info['length']), info['type'], header['rows'], info['nulls'])
+    return result
+
+
+class DatasetWriter:
+    """레코드를 chunk_rows개씩 모아 파티션별 컬럼 청크 파일로 쓰는 작성기
+
+    root/{partition_by}={값}/part-00000.col 형태로 저장하고, 모두 쓴 뒤 close()에서 파티션 단위로 바꿔 넣는다.
+    mode='overwrite'면 이번에 쓰지 않은 파티션은 지우고, mode='partitions'면 쓴 파티션만 교체한다
+    (예: 크롤러가 자기 플랫폼 파티션만 갱신). 메모리에는 파티션마다 한 청크만 쌓인다.
+
+    사용 예:
+        with DatasetWriter('data/dataset') as writer:
+            writer.write_many(records)
+    """
+
+    def __init__(self, root, schema=None, partition_by='platform', chunk_rows=20000, mode='overwrite',
+                 compress_level=6):
+        self.root = root
+        self.schema = schema or NOVEL_SCHEMA
+        self.partition_by = partition_by
+        self.chunk_rows = chunk_rows
+        self.mode = mode
+        self.compress_level = compress_level
+
+        self._staging = root + '.tmp'
+        shutil.rmtree(self._staging, ignore_errors=True)
+        os.makedirs(self._staging)
+        self._buffers = {}
+        self._chunk_counts = {}
+        self._cleared = set()
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _partition_dir(self, root, value):
+        return os.path.join(root, f'{self.partition_by}={value}')
+
+    def _flush(self, value):
+        records = self._buffers.pop(value)
+        columns = {
+            name: _coerce_column([record.get(name) for record in records], kind)
+            for name, kind in self.schema.items()
+        }
+        number = self._chunk_counts.get(value, 0)
+        self._chunk_counts[value] = number + 1
+        path = os.path.join(self._partition_dir(self._staging, value), f'part-{number:05d}.col')
+        write_chunk(path, columns, self.schema, self.compress_level)
+
+    def write(self, record):
+        value = record.get(self.partition_by) or 'unknown'
+        records = self._buffers.get(value)
+        if records is None:
+            records = self._buffers[value] = []
+            os.makedirs(self._partition_dir(self._staging, value), exist_ok=True)
+        # 청크가 찰 때까지 레코드만 모아 두고, 컬럼 변환은 청크를 쓸 때 컬럼 단위로 한다
+        records.append(record)
+        self.rows += 1
+        if len(records) >= self.chunk_rows:
+            self._flush(value)
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def write_columns(self, columns):
+        """{컬럼: 값 목록} (예: DataFrame.to_dict('list'))을 그대로 쓴다"""
+        names = list(columns)
+        for values in zip(*(columns[name] for name in names)):
+            self.write(dict(zip(names, values)))
+
+    def clear_partition(self, value):
+        """close()에서 이 파티션을 지운다 (그 전에 쓴 레코드가 있으면 새 내용으로 바꿔 넣는다)"""
+        self._cleared.add(value)
+
+    def close(self):
+        for value in list(self._buffers):
+            self._flush(value)
+        os.makedirs(self.root, exist_ok=True)
+
+        written = set(os.listdir(self._staging))
+        if self.mode == 'overwrite':
+            for name in os.listdir(self.root):
+                if name.startswith(self.partition_by + '=') and name not in written:
+                    shutil.rmtree(os.path.join(self.root, name))
+        # 파티션마다 이전 디렉터리를 치우고 새 디렉터리로 바꿔 넣는다
+        for name in written:
+            target = os.path.join(self.root, name)
+            old = target + '.old'
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(target):
+                os.replace(target, old)
+            os.replace(os.path.join(self._staging, name), target)
+            shutil.rmtree(old, ignore_errors=True)
+        for value in self._cleared:
+            target = self._partition_dir(self.root, value)
+            if os.path.basename(target) not in written:
+                shutil.rmtree(target, ignore_errors=True)
+        os.rmdir(self._staging)
+
+    def abort(self):
+        self._buffers = {}
+        shutil.rmtree(self._staging, ignore_errors=True)
+
+
+def write_dataset(root, records, **kwargs):
+    """레코드 목록을 데이터셋으로 쓰고 행 수 반환"""
+    with DatasetWriter(root, **kwargs) as writer:
+        writer.write_many(records)
+    return writer.rows
+
+
+class Dataset:
+    """DatasetWriter로 쓴 데이터셋 읽기. 필요한 컬럼과 파티션만 읽는다
+
+    사용 예:
+        dataset = Dataset('data/dataset')
+        columns = dataset.read(['url', 'title', 'summary'], partitions=['naver'])
+        for chunk in dataset.chunks(['url', 'title']):
+            ...
+    """
+
+    def __init__(self, root, partition_by='platform'):
+        self.root = root
+        self.partition_by = partition_by
+
+    def exists(self):
+        return bool(self.partitions())
+
+    def partitions(self):
+        prefix = self.partition_by + '='
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name[len(prefix):] for name in os.listdir(self.root)
+            if name.startswith(prefix) and not name.endswith('.old')
+        )
+
+    def files(self, partitions=None):
+        paths = []
+        for value in partitions or self.partitions():
+            paths.extend(sorted(glob(os.path.join(self.root, f'{self.partition_by}={value}', 'part-*.col'))))
+        return paths
+
+    def schema(self):
+        for path in self.files():
+            with open(path, 'rb') as f:
+                return {name: info['type'] for name, info in read_header(f)['columns'].items()}
+        return {}
+
+    def __len__(self):
+        total = 0
+        for path in self.files():
+            with open(path, 'rb') as f:
+                total += read_header(f)['rows']
+        return total
+
+    def chunks(self, columns=None, partitions=None):
+        """청크 파일마다 {컬럼: 값 목록}을 하나씩 (메모리에는 한 청크만 올라간다)"""
+        for path in self.files(partitions):
+            yield read_chunk(path, columns)
+
+    def records(self, columns=None, partitions=None):
+        for chunk in self.chunks(columns, partitions):
+            names = list(chunk)
+            for values in zip(*(chunk[name] for name in names)):
+                yield dict(zip(names, values))
+
+    def read(self, columns=None, partitions=None):
+        """모든 청크를 이어 붙여 {컬럼: 값 목록} 반환 (pd.DataFrame에 바로 넘길 수 있음)"""
+        result = None
+        for chunk in self.chunks(columns, partitions):
+            if result is None:
+                result = chunk
+            else:
+                for name, values in chunk.items():
+                    result[name].extend(values)
+        return result or {name: [] for name in (columns or [])}
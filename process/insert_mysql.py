@@ -1,8 +1,60 @@
+import argparse
+import os
 import pymysql
 import pickle
 from glob import glob
+from dataset import Dataset
+from manifest import DELTA_PATH, load_delta
+from numeric import normalize_columns
+
+# DB에 넣는 컬럼 (전처리 결과 데이터셋에서 이 컬럼만 읽는다)
+COLUMNS = ['url', 'img', 'title', 'author', 'recommend', 'genre', 'serial', 'publisher', 'summary',
+           'page_count', 'page_unit', 'age', 'platform', 'keywords', 'viewers']
+
+# 정수 컬럼 (청크마다 한 번에 변환)
+COUNT_COLUMNS = ['recommend', 'page_count', 'viewers']
+
+def to_columns(records):
+    return {name: [data.get(name) for data in records] for name in COLUMNS}
+
+def load_chunks():
+    """전처리 결과를 {컬럼: 값 목록} 청크로 읽는다 (컬럼 데이터셋이 없으면 예전 pickle 전체를 한 청크로)"""
+    dataset = Dataset('data/all_data')
+    if dataset.exists():
+        yield from dataset.chunks(COLUMNS)
+        return
+    with open('data/all_data.data', 'rb') as f:
+        yield to_columns(pickle.load(f))
+
+def to_rows(columns):
+    """청크 → insert_sql 파라미터 목록 (추천수/회차 수/조회수는 공통 규칙으로 정수 변환, 실패하면 0)"""
+    normalize_columns(columns, COUNT_COLUMNS, default=0)
+    return list(zip(*(columns[name] for name in COLUMNS)))
+
+def apply_delta(db, cursor, insert_sql):
+    """증분 전처리 변경분(data/all_data.delta)을 테이블에 반영하고 파일을 지운다
+
+    삭제/변경된 작품은 url로 지우고 추가/변경된 작품을 다시 넣는다. 실패하면 되돌리고 파일은 남긴다.
+    """
+    delta = load_delta()
+    urls = delta['deletes'] + [data['url'] for data in delta['upserts']]
+    try:
+        for i in range(0, len(urls), 500):
+            chunk = urls[i: i + 500]
+            cursor.execute(f"DELETE FROM novels WHERE url IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        cursor.executemany(insert_sql, to_rows(to_columns(delta['upserts'])))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if os.path.exists(DELTA_PATH):
+        os.remove(DELTA_PATH)
+    print(f"변경분 적용 완료: 추가/변경 {len(delta['upserts'])}개, 삭제 {len(delta['deletes'])}개")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='전처리 결과를 MySQL에 적재')
+    parser.add_argument('--delta', action='store_true', help='테이블을 다시 만들지 않고 증분 전처리 변경분만 반영')
+    args = parser.parse_args()
 
     db = pymysql.connect(
         host='localhost',
@@ -15,6 +67,15 @@ if __name__ == '__main__':
 
     cursor = db.cursor()
 
+    insert_sql = """
+    INSERT INTO novels (url, img, title, author, recommend, genre, serial, publisher, summary, page_count, page_unit, age, platform, keywords, viewers) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """
+
+    if args.delta:
+        apply_delta(db, cursor, insert_sql)
+        db.close()
+        raise SystemExit
+
     # 테이블 초기화
     table_name = "novels"
     cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
@@ -42,51 +103,11 @@ if __name__ == '__main__':
     """
     cursor.execute(create_table_sql)
 
-    insert_sql = """
-    INSERT INTO novels (url, img, title, author, recommend, genre, serial, publisher, summary, page_count, page_unit, age, platform, keywords, viewers) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-    """
-
-    with open('data/all_data.data', 'rb') as f:
-        datas = pickle.load(f)
-
-    for data in datas:
+    for columns in load_chunks():
         try:
-            url = data['url']
-            img = data['img']
-            title = data['title']
-            author = data['author']
-            recommend = int(data['recommend'].replace(',', ''))
-            genre = data['genre']
-            serial = data['serial']
-            publisher = data['publisher']
-            summary = data['summary']
-            page_unit = data['page_unit']
-            page_count = data['page_count']
-            age = data['age']
-            platform = data['platform']
-            keywords = data['keywords']
-            viewers = int(data['viewers'].replace(',', ''))
-
-            cursor.execute(insert_sql, (
-                url,
-                img,
-                title,
-                author,
-                recommend,
-                genre,
-                serial,
-                publisher,
-                summary,
-                page_count,
-                page_unit,
-                age,
-                platform,
-                keywords,
-                viewers
-            ))
+            cursor.executemany(insert_sql, to_rows(columns))
         except Exception as e:
             import traceback
-            print(data)
             print(e)
             traceback.print_exc()
             break
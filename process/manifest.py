@@ -0,0 +1,100 @@
+import os
+import pickle
+import sqlite3
+
+
+# 증분 전처리가 만든 변경분 (DB 적재 스크립트가 적용한 뒤 지운다)
+DELTA_PATH = 'data/all_data.delta'
+
+
+class Manifest:
+    """증분 전처리 상태를 저장하는 SQLite 파일
+
+    records: 결과에 들어간 작품마다 원본 레코드의 내용 해시, 파티션(platform), 원본 청크 파일
+    files: 입력 청크 파일마다 (크기:수정 시각) 서명. 서명이 같은 파일은 다시 읽지 않는다
+
+    사용 예:
+        manifest = Manifest()
+        known = manifest.records()
+        ...
+        manifest.commit(upserts, deletes, signatures)
+    """
+
+    def __init__(self, path='data/preprocess_manifest.sqlite'):
+        self.path = path
+        self._db = sqlite3.connect(path, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS records (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                source TEXT NOT NULL
+            )
+        ''')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                signature TEXT NOT NULL
+            )
+        ''')
+
+    def __len__(self):
+        return self._db.execute('SELECT COUNT(*) FROM records').fetchone()[0]
+
+    def records(self):
+        """{url: (hash, platform, source)}"""
+        return {url: (h, platform, source) for url, h, platform, source in
+                self._db.execute('SELECT url, hash, platform, source FROM records')}
+
+    def file_signatures(self):
+        return dict(self._db.execute('SELECT path, signature FROM files'))
+
+    def clear(self):
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.execute('DELETE FROM records')
+        self._db.execute('DELETE FROM files')
+        self._db.execute('COMMIT')
+
+    def commit(self, upserts, deletes, signatures):
+        """한 트랜잭션으로 반영. upserts: [(url, hash, platform, source)], signatures: 이번 입력 파일 전체"""
+        self._db.execute('BEGIN IMMEDIATE')
+        self._db.executemany('INSERT OR REPLACE INTO records (url, hash, platform, source) VALUES (?, ?, ?, ?)', upserts)
+        self._db.executemany('DELETE FROM records WHERE url = ?', [(url,) for url in deletes])
+        self._db.execute('DELETE FROM files')
+        self._db.executemany('INSERT INTO files (path, signature) VALUES (?, ?)', signatures.items())
+        self._db.execute('COMMIT')
+
+    def close(self):
+        self._db.close()
+
+
+def load_delta(path=DELTA_PATH):
+    """아직 적용하지 않은 변경분 {'upserts': [레코드], 'deletes': [url]} (없으면 빈 변경분)"""
+    if not os.path.exists(path):
+        return {'upserts': [], 'deletes': []}
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def save_delta(upserts, deletes, path=DELTA_PATH):
+    """변경분을 기존 미적용 변경분에 합쳐서 저장 (적재 전에 전처리를 여러 번 돌려도 잃지 않게)
+
+    같은 url은 나중 변경이 이긴다: 다시 추가되면 삭제에서 빠지고, 삭제되면 추가에서 빠진다.
+    """
+    pending = load_delta(path)
+    merged = {record['url']: record for record in pending['upserts']}
+    deleted = dict.fromkeys(pending['deletes'])
+    for url in deletes:
+        merged.pop(url, None)
+        deleted[url] = None
+    for record in upserts:
+        deleted.pop(record['url'], None)
+        merged[record['url']] = record
+
+    delta = {'upserts': list(merged.values()), 'deletes': list(deleted)}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(delta, f)
+    os.replace(tmp_path, path)
+    return delta
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+# 한국어 단위 → 배수 ("2천만"처럼 이어 붙인 단위는 곱한다)
+UNITS = {'천': 10 ** 3, '만': 10 ** 4, '억': 10 ** 8, '조': 10 ** 12}
+
+_NUMBER = r'\d[\d,]*(?:\.\d+)?'
+_UNIT = '[천만억조]'
+# 숫자 하나: "3,456", "1.2만", "1억 2,345만" (단위가 붙은 조각만 이어 붙인다)
+_TOKEN = rf'(?:{_NUMBER}\s*{_UNIT}+\s*)+|{_NUMBER}'
+# 범위: "10~20화", "1.2만-1.5만" (음수는 없다고 본다)
+_RANGE_SEPARATOR = '[~∼\\-–]'
+_RANGE = rf'({_TOKEN})\s*{_RANGE_SEPARATOR}\s*({_TOKEN})'
+_SEGMENT = rf'(?P<number>{_NUMBER})\s*(?P<unit>{_UNIT}*)'
+
+RANGE_MODES = ('max', 'min', 'mean')
+
+
+def _to_float(text):
+    """쉼표가 있을 수 있는 순수 숫자만 float로 (나머지는 NaN)"""
+    values = pd.Series(np.nan, index=text.index)
+    plain = text.str.fullmatch(r'[\d,]*\d[\d,]*(?:\.\d+)?').fillna(False).to_numpy(bool)
+    values[plain] = text[plain].str.replace(',', '', regex=False).astype('float64')
+    return values
+
+
+def _token_values(tokens):
+    """숫자 토큰 Series → float Series (토큰이 없으면 NaN)"""
+    values = _to_float(tokens)
+    rest = tokens[values.isna() & tokens.notna()]
+    if rest.empty:
+        return values
+
+    # 조각이 하나인 토큰("1.2만", "2천만")은 숫자 × 단위 배수
+    single = rest.str.extract(rf'^({_NUMBER})\s*({_UNIT}+)\s*$')
+    matched = single[0].notna()
+    multipliers = {unit: math.prod(UNITS[c] for c in unit) for unit in single.loc[matched, 1].unique()}
+    values.loc[single.index[matched]] = (
+        _to_float(single.loc[matched, 0]) * single.loc[matched, 1].map(multipliers).astype('float64')
+    )
+
+    # 여러 조각("1억 2,345만")은 조각마다 곱해서 더한다
+    compound = rest[~matched.to_numpy()]
+    if not compound.empty:
+        segments = compound.str.extractall(_SEGMENT)
+        multipliers = {unit: math.prod(UNITS[c] for c in unit) for unit in segments['unit'].unique()}
+        amounts = _to_float(segments['number']) * segments['unit'].map(multipliers).astype('float64')
+        totals = amounts.groupby(level=0).sum()
+        values.loc[totals.index] = totals
+    return values
+
+
+def _parse_unique(text, range_mode):
+    """서로 다른 문자열들만 변환 (parse_counts가 중복을 없앤 뒤 호출)"""
+    result = _to_float(text)
+    rest = text[result.isna().to_numpy() & (text != '').to_numpy()]
+    if rest.empty:
+        return result
+
+    result.loc[rest.index] = _token_values(rest.str.extract(f'({_TOKEN})', expand=False))
+    # 범위 구분자가 있는 행만 범위로 다시 읽는다
+    ranged = rest[rest.str.contains(_RANGE_SEPARATOR).to_numpy()]
+    if not ranged.empty:
+        bounds = ranged.str.extract(_RANGE).dropna()
+        low = _token_values(bounds[0])
+        high = _token_values(bounds[1])
+        if range_mode == 'max':
+            result.loc[bounds.index] = np.fmax(low, high)
+        elif range_mode == 'min':
+            result.loc[bounds.index] = np.fmin(low, high)
+        else:
+            result.loc[bounds.index] = (low + high) / 2
+    return result
+
+
+def parse_counts(values, range_mode='max'):
+    """플랫폼마다 다른 수치 문자열 컬럼을 한 번에 정수로 바꾼다. (정수 Series(Int64), 실패 여부 Series) 반환
+
+    "3,456" → 3456, "1.2만" → 12000, "12억" → 1200000000, "총 52화" → 52,
+    "10~20화" → range_mode에 따라 20(max)/10(min)/15(mean).
+    None/빈 문자열은 실패가 아닌 결측(NA)이고, 값이 있는데 숫자를 찾지 못한 행만 실패로 표시한다.
+    같은 값이 많으므로 서로 다른 값만 골라 변환한 뒤 행으로 펼친다.
+    """
+    if range_mode not in RANGE_MODES:
+        raise ValueError(f'range_mode는 {RANGE_MODES} 중 하나여야 합니다: {range_mode}')
+    series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+
+    codes, uniques = pd.factorize(series.to_numpy(dtype=object))
+    text = pd.Series(uniques, dtype=object).astype('string').str.strip()
+    parsed = _parse_unique(text, range_mode).to_numpy()
+    present = (text != '').to_numpy(bool)
+
+    # factorize는 결측을 -1로 준다
+    missing = codes < 0
+    codes = np.where(missing, 0, codes)
+    result = np.where(missing, np.nan, parsed[codes] if len(parsed) else np.nan)
+    counts = pd.Series(result, index=series.index).round().astype('Int64')
+    failed = ~missing & (present[codes] if len(present) else False) & counts.isna().to_numpy()
+    return counts, pd.Series(failed, index=series.index)
+
+
+def report_unparsed(name, values, failed, limit=5):
+    """숫자로 바꾸지 못한 행 수와 예시 출력. 실패한 행 수 반환"""
+    count = int(failed.sum())
+    if count:
+        series = values if isinstance(values, pd.Series) else pd.Series(list(values), dtype=object)
+        samples = series[failed.to_numpy()].head(limit).tolist()
+        print(f"[{name}] 숫자로 바꾸지 못한 값 {count}개 (예: {samples})")
+    return count
+
+
+def normalize_columns(columns, names, default=None, range_mode='max', report=True):
+    """{컬럼: 값 목록} 또는 DataFrame의 수치 컬럼들을 정수 목록으로 바꿔 넣는다
+
+    default가 None이면 결측/실패는 None으로, 아니면 default로 채운다. 컬럼별 실패 행 수 반환
+    """
+    failures = {}
+    for name in names:
+        counts, failed = parse_counts(columns[name], range_mode)
+        if report:
+            report_unparsed(name, columns[name], failed)
+        failures[name] = int(failed.sum())
+        if default is None:
+            columns[name] = counts.astype(object).where(counts.notna(), None).tolist()
+        else:
+            columns[name] = counts.fillna(default).astype('int64').tolist()
+    return failures
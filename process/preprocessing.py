@@ -3,37 +3,102 @@ import pickle
 from glob import glob
 import json
 import os
+import argparse
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataset import Dataset, DatasetWriter, NOVEL_SCHEMA, read_chunk
+from manifest import Manifest, save_delta
+from numeric import parse_counts, report_unparsed
+
+# 크롤러가 플랫폼별 파티션으로 쌓는 입력 데이터셋과 전처리 결과 데이터셋
+INPUT_DATASET = 'data/dataset'
+OUTPUT_DATASET = 'data/all_data'
 
 def save_data(datas):
-    if isinstance(datas, pd.DataFrame):
-        datas.to_json('data/all_data.json', orient='records')
+    """전처리 결과를 컬럼 데이터셋(data/all_data)으로 저장 (DataFrame 또는 list[dict])"""
+    with DatasetWriter(OUTPUT_DATASET) as writer:
+        if isinstance(datas, pd.DataFrame):
+            writer.write_columns(datas.to_dict('list'))
+        elif isinstance(datas, list):
+            writer.write_many(datas)
 
-        with open('data/all_data.json', 'r') as f:
-            data = json.load(f)
-            
-        with open('data/all_data.data', 'wb') as f:
-            pickle.dump(data, f)
 
-        os.remove('data/all_data.json')
+def load_data(columns=None):
+    """입력 데이터를 {컬럼: 값 목록}으로 읽는다. columns를 주면 그 컬럼만 읽는다
 
-    elif isinstance(datas, list):
-        with open('data/all_data.data', 'wb') as f:
-            pickle.dump(datas, f)
+    컬럼 데이터셋이 있으면 그것을 읽고, 없으면 예전처럼 data/*.data pickle을 모두 읽는다.
+    """
+    dataset = Dataset(INPUT_DATASET)
+    if dataset.exists():
+        return dataset.read(columns)
 
+    all_data = []
+    for file in sorted(glob('data/*.data')):
+        with open(file, 'rb') as f:
+            # 링크 목록 등 작품 레코드가 아닌 파일은 건너뛴다
+            all_data.extend(data for data in pickle.load(f) if isinstance(data, dict))
 
-def load_data():
-    files = glob('data/*.data')
+    columns = columns or list(NOVEL_SCHEMA)
+    return {name: [data.get(name) for data in all_data] for name in columns}
 
-    all_data = []
-    for file in files:
+def _slices(columns, chunk_rows):
+    rows = len(next(iter(columns.values()))) if columns else 0
+    for start in range(0, rows, chunk_rows):
+        yield {name: values[start:start + chunk_rows] for name, values in columns.items()}
+
+def iter_chunks(columns=None, chunk_rows=20000):
+    """입력을 최대 chunk_rows행씩 {컬럼: 값 목록}으로 읽는다 (한 번에 한 청크만 메모리에 올림)
+
+    pickle 입력은 파일 단위로만 읽을 수 있으므로 그때의 최대 메모리는 가장 큰 파일 크기다.
+    """
+    columns = columns or list(NOVEL_SCHEMA)
+    dataset = Dataset(INPUT_DATASET)
+    if dataset.exists():
+        for chunk in dataset.chunks(columns):
+            yield from _slices(chunk, chunk_rows)
+        return
+
+    for file in sorted(glob('data/*.data')):
         with open(file, 'rb') as f:
-            data = pickle.load(f)
-            all_data.extend(data)
+            records = [data for data in pickle.load(f) if isinstance(data, dict)]
+        for start in range(0, len(records), chunk_rows):
+            batch = records[start:start + chunk_rows]
+            yield {name: [data.get(name) for data in batch] for name in columns}
+
+def _key(value):
+    # 값 대신 64비트 해시만 기억한다 (None/NaN끼리는 같은 값으로 본다, drop_duplicates와 같게)
+    if value is None or value != value:
+        return 0
+    return int.from_bytes(hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'little')
+
+class DedupIndex:
+    """청크를 넘나드는 중복 제거 상태. url과 title의 해시 집합만 들고 있다
+
+    drop_dupl(url 기준으로 먼저, 남은 것 중 title 기준)과 같은 결과가 나오도록
+    url이 처음인 행만 title을 검사하고, 살아남은 행의 title만 기록한다.
+    """
 
-    save_data(all_data)
-    # os.remove('data/all_data.json')
+    def __init__(self):
+        self.urls = set()
+        self.titles = set()
 
-    return all_data
+    def keep(self, urls, titles):
+        """청크의 각 행을 남길지 여부 (입력 순서대로 앞에 나온 행이 남는다)"""
+        mask = []
+        for url, title in zip(urls, titles):
+            url_key = _key(url)
+            if url_key in self.urls:
+                mask.append(False)
+                continue
+            self.urls.add(url_key)
+            title_key = _key(title)
+            if title_key in self.titles:
+                mask.append(False)
+                continue
+            self.titles.add(title_key)
+            mask.append(True)
+        return mask
 
 def drop_dupl(df:pd.DataFrame):
     new_df = df.drop_duplicates(['url'])
@@ -48,7 +113,7 @@ def process_keywords(keywords):
         return "#" + " #".join(keywords.split())
     return ""  # 다른 데이터 타입은 빈 문자열로 처리
 
-def str_preprocessing(df:pd.DataFrame):
+def clean_frame(df:pd.DataFrame):
     df = df[df.notnull()]
     df['title'] = df['title'].str.strip()
     df['summary'] = df['summary'].str.replace(r'[\r, \n, \t]',' ', regex = True).replace(r'\s{2,}', ' ', regex=True).str.strip()
@@ -57,25 +122,192 @@ def str_preprocessing(df:pd.DataFrame):
 
     # df['keywords'] = df['keywords'].apply(lambda x: str(x) if isinstance(x, list) else x)
 
-    df.loc[df['page_unit'] == '권', 'page_unit'] = '회차'
-    df.loc[df['page_unit'] == '화', 'page_count'] *= 25
-
-
+    # 회차 수를 숫자로 바꾼 뒤 권 단위는 회차로 환산 (1권 ≈ 25화)
+    counts, failed = parse_counts(df['page_count'])
+    report_unparsed('page_count', df['page_count'], failed)
+    volumes = (df['page_unit'] == '권').to_numpy()
+    counts = counts.where(~volumes, counts * 25)
+    df['page_count'] = counts.astype(object).where(counts.notna(), None)
+    df.loc[volumes, 'page_unit'] = '회차'
+    return df
 
+def str_preprocessing(df:pd.DataFrame):
+    df = clean_frame(df)
     save_data(df)
     return df
+
+def preprocess_stream(chunk_rows=20000):
+    """청크 단위 전처리. 최대 메모리가 전체 데이터가 아니라 chunk_rows로 정해진다
+
+    중복 제거 상태는 DedupIndex(해시 집합)로 청크 사이에 넘기고, 정리한 청크는 바로 결과 데이터셋에 쓴다.
+    결과는 전체를 한 번에 처리했을 때(drop_dupl → str_preprocessing)와 같다.
+    """
+    index = DedupIndex()
+    read = kept = 0
+    with DatasetWriter(OUTPUT_DATASET, chunk_rows=chunk_rows) as writer:
+        for columns in iter_chunks(list(NOVEL_SCHEMA), chunk_rows):
+            df = pd.DataFrame(columns)
+            read += len(df)
+            df = df[index.keep(columns['url'], columns['title'])]
+            if df.empty:
+                continue
+            df = clean_frame(df)
+            kept += len(df)
+            writer.write_columns(df.to_dict('list'))
+    print(f"전처리 완료: {read}개 중 {kept}개 저장 (중복 {read - kept}개 제거)")
+    return kept
+
+def _clean_shard(df:pd.DataFrame):
+    # 같은 url은 모두 같은 조각에 있으므로 조각 안에서 url 중복을 지워도 전체와 같다
+    return clean_frame(df.drop_duplicates(['url']))
+
+def preprocess_parallel(df:pd.DataFrame, processes=4):
+    """url 해시로 행을 processes개 조각으로 나눠 여러 프로세스에서 정리 (drop_dupl → clean_frame과 같은 결과)
+
+    조각마다 url 중복 제거와 문자열 정리를 따로 하고, 원래 행 순서대로 합친 뒤
+    원본 title 기준 중복 제거를 한다. 행 순서와 값이 한 프로세스로 처리할 때와 같아서 저장 결과도 같다.
+    """
+    df = df.reset_index(drop=True)
+    df['_row'] = df.index
+    # title 중복은 정리 전 값으로 판단한다 (clean_frame이 title 공백을 지우므로)
+    df['_title'] = df['title']
+    shard_ids = [_key(url) % processes for url in df['url']]
+    shards = [shard for _, shard in df.groupby(shard_ids, sort=True)]
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+        cleaned = list(pool.map(_clean_shard, shards))
+
+    df = pd.concat(cleaned).sort_values('_row', kind='stable')
+    df = df.drop_duplicates(['_title'])
+    return df.drop(columns=['_row', '_title']).reset_index(drop=True)
+
+def _signature(path):
+    stat = os.stat(path)
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+def _content_hash(record):
+    # 전처리 전 원본 값의 해시 (스키마 순서로 직렬화)
+    body = json.dumps([record.get(name) for name in NOVEL_SCHEMA], ensure_ascii=False, default=str)
+    return hashlib.blake2b(body.encode('utf-8'), digest_size=16).hexdigest()
+
+def preprocess_incremental(rebuild=False):
+    """바뀐 작품만 전처리해서 결과 데이터셋에 반영하고 변경분(data/all_data.delta)을 남긴다
+
+    1. url/title 컬럼만 읽어 전체 실행과 같은 기준으로 중복 제거 (살아남는 행이 전체 실행과 같다)
+    2. 매니페스트의 파일 서명이 바뀐 청크 파일만 전체 컬럼을 읽어 내용 해시를 비교한다
+       (그대로인 파일은 새로 살아남은 행이 있을 때만 읽는다)
+    3. 추가/변경된 행만 clean_frame으로 정리하고, 바뀐 파티션만 다시 쓴다 (행 순서는 전체 실행과 같다)
+    4. 변경분을 저장한 뒤 매니페스트를 갱신한다 (도중에 죽으면 다음 실행이 같은 변경을 다시 만든다)
+
+    url이 없는 행은 작품을 구별할 수 없으므로 증분 전처리에서 제외한다.
+    """
+    dataset = Dataset(INPUT_DATASET)
+    if not dataset.exists():
+        print(f"증분 전처리는 컬럼 데이터셋({INPUT_DATASET})이 필요합니다. 전체 전처리를 실행하세요.")
+        return None
+
+    manifest = Manifest()
+    # 결과 데이터셋이 없으면 매니페스트와 맞출 수 없으므로 처음부터 다시 만든다
+    if rebuild or not Dataset(OUTPUT_DATASET).exists():
+        manifest.clear()
+    known = manifest.records()
+    old_signatures = manifest.file_signatures()
+
+    # 1. 중복 제거: 파일마다 살아남은 (행 번호, url)
+    index = DedupIndex()
+    files = dataset.files()
+    survivors = {}
+    order = []
+    for path in files:
+        chunk = read_chunk(path, ['url', 'title'])
+        rows = [(row, url) for row, (url, keep) in enumerate(zip(chunk['url'], index.keep(chunk['url'], chunk['title'])))
+                if keep and url is not None]
+        survivors[path] = rows
+        order.extend(url for _, url in rows)
+
+    # 2. 내용 해시 비교
+    signatures = {path: _signature(path) for path in files}
+    changed = []
+    entries = []
+    for path in files:
+        rows = survivors[path]
+        if signatures[path] == old_signatures.get(path):
+            rows = [(row, url) for row, url in rows if url not in known or known[url][2] != path]
+        if not rows:
+            continue
+        chunk = read_chunk(path, list(NOVEL_SCHEMA))
+        for row, url in rows:
+            record = {name: values[row] for name, values in chunk.items()}
+            content_hash = _content_hash(record)
+            platform = record.get('platform') or 'unknown'
+            entries.append((url, content_hash, platform, path))
+            if url not in known or known[url][0] != content_hash:
+                changed.append(record)
+
+    alive = set(order)
+    deletes = [url for url in known if url not in alive]
+
+    # 3. 바뀐 행만 정리하고 바뀐 파티션만 다시 쓴다
+    upserts = []
+    if changed:
+        upserts = clean_frame(pd.DataFrame(changed, columns=list(NOVEL_SCHEMA))).to_dict('records')
+    cleaned = {record['url']: record for record in upserts}
+    platforms = {url: platform for url, (_, platform, _) in known.items()}
+    touched = {platforms[url] for url in deletes}
+    for url, _, platform, _ in entries:
+        if url in cleaned:
+            touched.add(platform)
+            if url in platforms:
+                touched.add(platforms[url])
+        platforms[url] = platform
+
+    output = Dataset(OUTPUT_DATASET)
+    with DatasetWriter(OUTPUT_DATASET, mode='partitions') as writer:
+        for partition in sorted(touched):
+            current = {}
+            if partition in output.partitions():
+                current = {record['url']: record for record in output.records(partitions=[partition])}
+            current.update((url, record) for url, record in cleaned.items() if platforms[url] == partition)
+            urls = [url for url in order if platforms[url] == partition]
+            missing = [url for url in urls if url not in current]
+            if missing:
+                raise RuntimeError(f"결과 데이터셋에 없는 작품이 있습니다 ({partition}: {len(missing)}개). --rebuild로 다시 만드세요.")
+            writer.clear_partition(partition)
+            writer.write_many(current[url] for url in urls)
+
+    # 4. 변경분 → 매니페스트 순서로 저장
+    save_delta(upserts, deletes)
+    manifest.commit(entries, deletes, signatures)
+    manifest.close()
+    print(f"증분 전처리 완료: 추가/변경 {len(upserts)}개, 삭제 {len(deletes)}개, "
+          f"다시 쓴 파티션 {sorted(touched) or '없음'}")
+    return upserts, deletes
+
 if __name__ == '__main__':
-    datas = load_data()
-    df = pd.DataFrame(datas)
-    # print(df.head())
+    parser = argparse.ArgumentParser(description='수집 데이터 전처리')
+    parser.add_argument('--stream', action='store_true', help='청크 단위로 읽고 써서 메모리 사용량을 chunk-rows로 제한')
+    parser.add_argument('--chunk-rows', type=int, default=20000, help='--stream에서 한 번에 처리할 행 수')
+    parser.add_argument('--incremental', action='store_true', help='바뀐 작품만 전처리하고 변경분(data/all_data.delta)을 남김')
+    parser.add_argument('--rebuild', action='store_true', help='--incremental에서 매니페스트를 비우고 처음부터 다시 만듦')
+    parser.add_argument('--processes', type=int, default=0, help='url 해시로 나눠 N개 프로세스에서 정리 (결과는 단일 프로세스와 같음)')
+    args = parser.parse_args()
 
-    df = drop_dupl(df)
+    if args.incremental:
+        preprocess_incremental(args.rebuild)
+        raise SystemExit
 
-    df = str_preprocessing(df)
+    if args.stream:
+        preprocess_stream(args.chunk_rows)
+        raise SystemExit
 
-    # print(str(row['keywords']) if isinstance(row['keywords'], list) else row['keywords'])
+    datas = load_data(list(NOVEL_SCHEMA))
+    df = pd.DataFrame(datas)
+    # print(df.head())
 
-    for i, row in df.iterrows():
-        pass
+    if args.processes > 1:
+        df = preprocess_parallel(df, args.processes)
+        save_data(df)
+    else:
+        df = drop_dupl(df)
 
-    print(row['keywords'])
\ No newline at end of file
+        df = str_preprocessing(df)
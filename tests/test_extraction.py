@@ -0,0 +1,67 @@
+import os
+import sys
+
+from lxml import html
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'crawl'))
+from extraction import Extractor, Field
+
+
+# 노벨피아 상세 페이지처럼 작가명과 연재 화수가 같은 클래스(writer-name)를 쓰고, 화수가 문서 뒤쪽에 있는 페이지
+FILLER = ''.join(f'<div class="episode"><p>{i}화 본문 미리보기 {"가" * 200}</p></div>' for i in range(100))
+PAGE = (
+    '<html><head><meta charset="utf-8"><title>t</title></head><body>'
+    '<div class="epnew-novel-title">제목</div>'
+    '<p class="writer-name">AUTHOR</p>'
+    f'<div class="list">{FILLER}</div>'
+    '<p class="writer-name">SUB</p>'
+    f'<div class="list">{FILLER}</div>'
+    '<p class="writer-name">123</p>'
+    '<div class="footer">끝</div>'
+    '</body></html>'
+).encode('utf-8')
+
+
+def chunks(body, size=1024):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def test_negative_index_reads_whole_document():
+    fields = {
+        'title': Field(['//*[@class="epnew-novel-title"]']),
+        'author': Field(['//*[@class="writer-name"]']),
+        'page_count': Field(['//*[@class="writer-name"]'], index=-1),
+    }
+    extractor = Extractor(fields)
+
+    result, body, truncated = extractor.extract_stream(chunks(PAGE), encoding='utf-8')
+
+    assert result == extractor.extract(html.fromstring(PAGE))
+    assert result['page_count'] == '123'
+    assert body == PAGE
+    assert not truncated
+
+
+def test_fallback_selector_does_not_stop_early():
+    # 첫 번째 선택자(footer)는 문서 끝에 있으므로, 앞쪽에서 찾은 두 번째 선택자 값으로 멈추면 안 된다
+    fields = {'value': Field(['//*[@class="footer"]', '//*[@class="writer-name"]'])}
+    extractor = Extractor(fields)
+
+    result, _, truncated = extractor.extract_stream(chunks(PAGE), encoding='utf-8')
+
+    assert result == extractor.extract(html.fromstring(PAGE)) == {'value': '끝'}
+    assert not truncated
+
+
+def test_leading_fields_stop_early():
+    fields = {
+        'title': Field(['//*[@class="epnew-novel-title"]']),
+        'author': Field(['//*[@class="writer-name"]']),
+    }
+    extractor = Extractor(fields)
+
+    result, body, truncated = extractor.extract_stream(chunks(PAGE), encoding='utf-8')
+
+    assert result == extractor.extract(html.fromstring(PAGE))
+    assert truncated
+    assert len(body) < len(PAGE)